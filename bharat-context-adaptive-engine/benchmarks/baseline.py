@@ -0,0 +1,119 @@
+"""
+Baseline file shared by bench_inference.py and load_test.py
+
+baseline.json holds one section per suite ("micro", "load"), each mapping a
+benchmark name to its metrics, plus a "thresholds" section with the allowed
+slowdown ratios. Metrics ending in _us or _ms are lower-is-better; rps is
+higher-is-better. A result regresses when it is worse than the baseline by
+more than the threshold of its benchmark, of a dotted prefix of its name
+(e.g. "micro.condition"), of its suite, or "default".
+"""
+
+import os
+import sys
+import json
+import platform
+from datetime import datetime
+from typing import Dict, List, Any
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+DEFAULT_THRESHOLD = 1.25
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"thresholds": {"default": DEFAULT_THRESHOLD}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(suite: str, results: Dict[str, Dict[str, float]], path: str = BASELINE_PATH):
+    """Replace one suite's section of the baseline, keeping the rest"""
+    baseline = load_baseline(path)
+    baseline.setdefault("thresholds", {"default": DEFAULT_THRESHOLD})
+    baseline[suite] = results
+    baseline.setdefault("environment", {})[suite] = environment()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def environment() -> Dict[str, Any]:
+    """Where a result was measured (baselines only compare on like machines)"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "recorded_at": datetime.now().isoformat(timespec="seconds")
+    }
+
+
+def threshold(baseline: Dict[str, Any], suite: str, name: str) -> float:
+    """Most specific of suite.name, its dotted prefixes, the suite and "default" thresholds"""
+    thresholds = baseline.get("thresholds", {})
+    parts = f"{suite}.{name}".split(".")
+    for end in range(len(parts), 0, -1):
+        key = ".".join(parts[:end])
+        if key in thresholds:
+            return thresholds[key]
+    return thresholds.get("default", DEFAULT_THRESHOLD)
+
+
+def compare(suite: str, results: Dict[str, Dict[str, float]], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Compare results against the baseline
+    Returns:
+        One message per regressed metric (empty when within thresholds)
+    """
+    regressions = []
+    expected = baseline.get(suite, {})
+    for name, metrics in results.items():
+        limit = threshold(baseline, suite, name)
+        for metric, value in metrics.items():
+            reference = expected.get(name, {}).get(metric)
+            if not reference:
+                continue
+            if metric.endswith(("_us", "_ms")):
+                ratio = value / reference
+            elif metric == "rps":
+                ratio = reference / value if value else float("inf")
+            else:
+                continue
+            if ratio > limit:
+                regressions.append(
+                    f"{suite}.{name} {metric}: {value:.2f} vs baseline {reference:.2f} "
+                    f"({ratio:.2f}x, threshold {limit:.2f}x)"
+                )
+    return regressions
+
+
+def report(suite: str, results: Dict[str, Dict[str, float]], args) -> int:
+    """
+    Handle the --save/--check flags of a benchmark script
+    Returns:
+        Process exit code (1 if --check found regressions)
+    """
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"suite": suite, "environment": environment(), "results": results}, f, indent=2)
+    if args.save:
+        save_baseline(suite, results, args.baseline)
+        print(f"\nSaved {suite} baseline to {args.baseline}")
+    if args.check:
+        regressions = compare(suite, results, load_baseline(args.baseline))
+        if regressions:
+            print("\nRegressions:", file=sys.stderr)
+            for message in regressions:
+                print(f"  {message}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+def add_arguments(parser):
+    parser.add_argument("--save", action="store_true", help="record these results as the baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any result regresses past its threshold")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument("--output", help="also write these results to a JSON file")
@@ -0,0 +1,80 @@
+"""
+Benchmark: batch scoring throughput vs BatchPool worker count
+
+Scores the same batch with workers=0 (in-process thread) and increasing
+process counts, and prints rows/s and the speedup over one worker.
+
+Usage:
+    python benchmarks/bench_batch_pool.py [--rows N] [--chunk-size N] [--workers 1,2,4,8,16]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.batch_pool import BatchPool
+
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "examples", "small_vendor_signals.json")
+
+
+def _rows(count):
+    with open(EXAMPLE, "r", encoding="utf-8") as f:
+        signals = json.load(f)["signals"]
+    variants = [
+        signals,
+        {"time_of_day": "morning", "hour_of_day": 7, "system_language": "hi", "first_action": "voice"},
+        {"device_class": "low_end", "network_type": "3g", "data_saver_mode": "enabled"},
+        {},
+    ]
+    return [{"signals": variants[i % len(variants)]} for i in range(count)]
+
+
+async def _run(pool, rows):
+    async def chunks():
+        for offset in range(0, len(rows), pool.chunk_size):
+            yield rows[offset:offset + pool.chunk_size]
+
+    started = time.perf_counter()
+    total = 0
+    async for results in pool.map_chunks(chunks()):
+        total += len(results)
+    assert total == len(rows)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--workers", default=",".join(
+        str(n) for n in (1, 2, 4, 8, 16) if n <= (os.cpu_count() or 1)))
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    print(f"{args.rows} rows, chunk size {args.chunk_size}, {os.cpu_count()} cores\n")
+    print(f"{'workers':>8}{'seconds':>10}{'rows/s':>12}{'speedup':>10}")
+
+    baseline = None
+    for workers in [0] + [int(n) for n in args.workers.split(",")]:
+        pool = BatchPool(workers=workers, chunk_size=args.chunk_size)
+        try:
+            pool.start()
+            asyncio.run(_run(pool, rows[:args.chunk_size * max(workers, 1)]))  # warm up
+            seconds = asyncio.run(_run(pool, rows))
+        finally:
+            pool.shutdown()
+        if workers == 1:
+            baseline = seconds
+        speedup = f"{baseline / seconds:.2f}x" if baseline else "-"
+        print(f"{workers:>8}{seconds:>10.2f}{args.rows / seconds:>12.0f}{speedup:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark: inference hot-path microbenchmarks
+
+Times RuleCondition.evaluate per operator, InferenceRule.score,
+InferenceEngine.infer, the shared signal pattern match and
+EnhancedInferenceEngine.infer (with a local stub LLMService, so no network)
+on sparse and dense signals, and RawSignals validation. Results are microseconds per call (best of --repeat runs) and
+can be saved as, or checked against, benchmarks/baseline.json.
+
+Usage:
+    python benchmarks/bench_inference.py [--filter infer] [--repeat 5] [--save | --check]
+"""
+
+import io
+import os
+import sys
+import json
+import timeit
+import argparse
+import contextlib
+from typing import Dict, List, Any, Callable, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import llm_service
+from src.models import RawSignals
+from src.llm_service import LLMService
+from src.sparse_signals import SparseSignals
+from src.inference_engine import RuleCondition, InferenceEngine
+from src.signal_patterns import get_pattern_dag
+
+import baseline
+import fake_upstream
+
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "examples", "small_vendor_signals.json")
+
+SPARSE = {"time_of_day": "morning", "hour_of_day": 7, "system_language": "hi", "first_action": "voice"}
+
+
+class StubLLMService(LLMService):
+    """LLMService answering from fake_upstream's canned content, in-process"""
+
+    def __init__(self):
+        super().__init__()
+        self.openrouter_key = self.perplexity_key = "stub"
+        self.inference_cache = None
+
+    def infer_user_profile_with_reasoning(self, signals, rules_context=""):
+        return dict(fake_upstream.REASONING)
+
+    async def ainfer_user_profile_with_reasoning(self, signals, rules_context=""):
+        return dict(fake_upstream.REASONING)
+
+    def get_web_intelligence(self, query):
+        return fake_upstream.WEB_CONTEXT
+
+    async def aget_web_intelligence(self, query):
+        return fake_upstream.WEB_CONTEXT
+
+    def generate_feed_from_perplexity(self, user_need_state, language):
+        return [dict(item) for item in fake_upstream.FEED]
+
+    async def agenerate_feed_from_perplexity(self, user_need_state, language):
+        return [dict(item) for item in fake_upstream.FEED]
+
+
+def dense_payload() -> Dict[str, Any]:
+    """The example signals with every other RawSignals field filled in"""
+    with open(EXAMPLE, "r", encoding="utf-8") as f:
+        payload = json.load(f)["signals"]
+    for name, field in RawSignals.model_fields.items():
+        if name in payload or name == "timestamp":
+            continue
+        annotation = str(field.annotation)
+        if "datetime" in annotation:
+            payload[name] = "2024-01-15T19:30:00"
+        elif "int" in annotation:
+            payload[name] = 1
+        elif "List" in annotation:
+            payload[name] = ["home", "chat"]
+        elif annotation == "typing.Optional[str]":
+            payload[name] = "medium"
+    return payload
+
+
+CONDITIONS = {
+    "equals": ({"signal": "city_tier", "operator": "equals", "value": "tier3"}, "tier3"),
+    "not_equals": ({"signal": "city_tier", "operator": "not_equals", "value": "tier1"}, "tier3"),
+    "in": ({"signal": "carrier", "operator": "in", "value": ["jio", "airtel", "vi", "bsnl"]}, "bsnl"),
+    "not_in": ({"signal": "carrier", "operator": "not_in", "value": ["jio", "airtel", "vi"]}, "bsnl"),
+    "between": ({"signal": "hour_of_day", "operator": "between", "value": [18, 22]}, 19),
+    "greater_than": ({"signal": "session_count", "operator": "greater_than", "value": 3}, 5),
+    "less_than": ({"signal": "session_count", "operator": "less_than", "value": 3}, 5),
+    "contains": ({"signal": "business_apps", "operator": "contains", "value": ["vyapar", "khatabook"]},
+                 ["okcredit", "vyapar"]),
+}
+
+
+def benchmarks() -> List[Tuple[str, Callable[[], Any]]]:
+    """(name, zero-argument callable) pairs, in report order"""
+    sparse_payload, dense = SPARSE, dense_payload()
+    sparse_signals, dense_signals = RawSignals(**sparse_payload), RawSignals(**dense)
+
+    cases = []
+    for operator, (condition_dict, value) in CONDITIONS.items():
+        condition = RuleCondition(condition_dict)
+        cases.append((f"condition.{operator}", lambda c=condition, v=value: c.evaluate(v)))
+
+    engine = InferenceEngine()
+    rule = max(engine.rules, key=lambda r: len(r.conditions))
+    cases.append(("rule.score", lambda: rule.score(dense_signals)))
+    cases.append(("infer.sparse", lambda: engine.infer(sparse_signals)))
+    cases.append(("infer.dense", lambda: engine.infer(dense_signals)))
+
+    patterns = get_pattern_dag()
+    cases.append(("patterns.match.sparse", lambda: patterns.match(sparse_signals)))
+    cases.append(("patterns.match.dense", lambda: patterns.match(dense_signals)))
+
+    # Enhanced engine wired to the stub before it captures get_llm_service()
+    llm_service._llm_service = StubLLMService()
+    from src.inference_engine_enhanced import EnhancedInferenceEngine
+    enhanced = EnhancedInferenceEngine(use_web_context=True)
+    cases.append(("enhanced.infer.sparse", lambda: enhanced.infer(sparse_signals)))
+    cases.append(("enhanced.infer.dense", lambda: enhanced.infer(dense_signals)))
+
+    cases.append(("signals.validate.sparse", lambda: RawSignals.model_validate(sparse_payload)))
+    cases.append(("signals.validate.dense", lambda: RawSignals.model_validate(dense)))
+    cases.append(("signals.sparse_container.dense", lambda: SparseSignals.from_payload(dense)))
+    return cases
+
+
+def measure(func: Callable[[], Any], repeat: int, min_seconds: float) -> float:
+    """Best-of-repeat microseconds per call, each run lasting about min_seconds"""
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_seconds / 10:
+        number *= 10
+    number = max(1, int(number * min_seconds / max(timer.timeit(number), 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed run")
+    baseline.add_arguments(parser)
+    args = parser.parse_args()
+
+    previous = baseline.load_baseline(args.baseline).get("micro", {})
+    results = {}
+    print(f"{'benchmark':<34}{'µs/call':>12}{'baseline':>12}")
+    for name, func in benchmarks():
+        if args.filter not in name:
+            continue
+        # The engines print upstream fallbacks; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            per_call_us = measure(func, args.repeat, args.min_time)
+        results[name] = {"per_call_us": round(per_call_us, 3)}
+        reference = previous.get(name, {}).get("per_call_us")
+        print(f"{name:<34}{per_call_us:>12.2f}{reference if reference else '-':>12}")
+
+    sys.exit(baseline.report("micro", results, args))
+
+
+if __name__ == "__main__":
+    main()
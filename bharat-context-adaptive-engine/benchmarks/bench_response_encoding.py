@@ -0,0 +1,82 @@
+"""
+Benchmark: response encoding, FastAPI default path vs FastJSONResponse
+
+Encodes a feed-laden /v1/infer response and a /v1/infer/batch result list
+the way FastAPI does by default (response-model serialization,
+jsonable_encoder, json.dumps) and with FastJSONResponse, and prints the
+time per response.
+
+Usage:
+    python benchmarks/bench_response_encoding.py [--rows N] [--feed N] [--number N]
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.models import InferenceOutput, InferenceResponse, FeedItem, UIMode, LanguagePreference
+from src.responses import FastJSONResponse, ORJSON_AVAILABLE
+
+
+def _output(feed_items):
+    return InferenceOutput(
+        user_need_state="Evening Ledger / Khatabook Mode User",
+        confidence=8.5,
+        recommended_actions=["GST Calculation", "Invoice Generator", "Number to Words", "Profit Calculator"],
+        ui_mode=UIMode.STANDARD,
+        language_preference=LanguagePreference.HINDI,
+        explanation="Inferred based on 4 signals: hour_of_day, system_language, first_action",
+        feed=[FeedItem(id=str(i), type="insight", title="आज का Business Tip " * 2,
+                       summary="GST filing के लिए ChatGPT से मदद लें " * 4, tags=["gst", "business"])
+              for i in range(feed_items)],
+        matched_rule="evening_ledger",
+        matched_signals=["hour_of_day", "system_language", "first_action"],
+        signal_count=6
+    )
+
+
+def _default_path(content):
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def _measure(label, default, fast, number):
+    default_us = timeit.timeit(default, number=number) / number * 1e6
+    fast_us = timeit.timeit(fast, number=number) / number * 1e6
+    print(f"{label:<28}{default_us:>12.1f}{fast_us:>12.1f}{default_us / fast_us:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--feed", type=int, default=20)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    infer = InferenceResponse(success=True, data=_output(args.feed), processing_time_ms=12.5)
+    batch = {
+        "success": True,
+        "results": [{"success": True, "data": _output(0).model_dump(mode="json"), "error": None}
+                    for _ in range(args.rows)],
+        "total_processed": args.rows,
+        "processing_time_ms": 40.0
+    }
+    assert json.loads(FastJSONResponse(infer).body) == json.loads(_default_path(infer))
+    assert json.loads(FastJSONResponse(batch).body) == json.loads(_default_path(batch))
+
+    print(f"orjson: {'yes' if ORJSON_AVAILABLE else 'no (stdlib json fallback)'}\n")
+    print(f"{'payload':<28}{'default µs':>12}{'fast µs':>12}{'speedup':>9}")
+    _measure(f"/v1/infer ({args.feed} feed items)",
+             lambda: _default_path(infer), lambda: FastJSONResponse(infer).body, args.number * 20)
+    _measure(f"/v1/infer/batch ({args.rows} rows)",
+             lambda: _default_path(batch), lambda: FastJSONResponse(batch).body, args.number)
+
+
+if __name__ == "__main__":
+    main()
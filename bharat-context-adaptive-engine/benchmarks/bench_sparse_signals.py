@@ -0,0 +1,72 @@
+"""
+Benchmark: RawSignals vs SparseSignals construction
+
+Compares validation time and retained allocation per request for the
+pydantic model and the sparse container, on the example payload.
+
+Usage:
+    python benchmarks/bench_sparse_signals.py [--iterations N]
+"""
+
+import os
+import sys
+import json
+import argparse
+import timeit
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import RawSignals
+from src.sparse_signals import SparseSignals
+
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "examples", "small_vendor_signals.json")
+
+
+def _time_us(build, payload, iterations):
+    seconds = min(timeit.repeat(lambda: build(payload), number=iterations, repeat=5))
+    return seconds / iterations * 1e6
+
+
+def _retained_bytes(build, payload, count=1000):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [build(payload) for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del kept
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(EXAMPLE, "r", encoding="utf-8") as f:
+        payload = json.load(f)["signals"]
+
+    builders = {
+        "RawSignals": lambda p: RawSignals(**p),
+        "SparseSignals": SparseSignals.from_payload,
+    }
+    # Warm validator caches before measuring
+    for build in builders.values():
+        build(payload)
+
+    print(f"Payload: {len(payload)} signals present of {len(RawSignals.model_fields)} fields\n")
+    print(f"{'container':<15}{'validate (us)':>15}{'retained (B)':>15}")
+    results = {}
+    for name, build in builders.items():
+        results[name] = (_time_us(build, payload, args.iterations), _retained_bytes(build, payload))
+        print(f"{name:<15}{results[name][0]:>15.1f}{results[name][1]:>15.0f}")
+
+    raw, sparse = results["RawSignals"], results["SparseSignals"]
+    print(f"\nSpeedup {raw[0] / sparse[0]:.2f}x, memory {raw[1] / max(sparse[1], 1):.2f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
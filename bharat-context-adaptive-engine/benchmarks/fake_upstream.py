@@ -0,0 +1,130 @@
+"""
+Fake OpenRouter and Perplexity server for benchmarks and load tests
+
+Answers OpenAI-style chat completions (streamed when requested) with canned
+content after a fixed delay, so the service can be load tested without
+network access or API spend. Point the service at it with:
+
+    OPENROUTER_BASE_URL=http://127.0.0.1:PORT/api/v1
+    PERPLEXITY_URL=http://127.0.0.1:PORT/chat/completions
+
+Usage:
+    python benchmarks/fake_upstream.py [--port 8099] [--latency-ms 50]
+"""
+
+import json
+import time
+import asyncio
+import argparse
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+
+REASONING = {
+    "user_need_state": "Evening Ledger / Khatabook Mode User",
+    "confidence": 8.5,
+    "reasoning_summary": "Business apps, evening usage and Hindi locale",
+    "recommended_actions": ["GST Calculation", "Invoice Generator", "Number to Words", "Profit Calculator"],
+    "ui_mode": "standard",
+    "language_preference": "hindi"
+}
+
+FEED = [
+    {
+        "id": f"fake-{i}",
+        "type": "insight",
+        "title": f"GST filing tip {i}",
+        "summary": "Quarterly GST returns for small traders are due this month.",
+        "source": "FakeUpstream",
+        "time": "1h ago",
+        "tags": ["gst", "business"]
+    }
+    for i in range(3)
+]
+
+WEB_CONTEXT = "Small shop owners in tier-3 cities use khatabook-style apps for evening accounting."
+
+
+def completion(model: str, content: str) -> dict:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+async def stream_completion(model: str, content: str, latency_ms: float):
+    """OpenAI-style SSE chunks, one word per chunk; the first after latency_ms"""
+    words = content.split(" ")
+    for index, word in enumerate(words):
+        await asyncio.sleep(latency_ms / 1000 if index == 0 else latency_ms / 10000)
+        chunk = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": word if index == 0 else " " + word}, "finish_reason": None}]
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def reply(body: dict) -> str:
+    """Canned content for a chat completion request"""
+    if body.get("response_format", {}).get("type") == "json_object":
+        return json.dumps(REASONING)
+    prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+    if "JSON list" in prompt:
+        return f"```json\n{json.dumps(FEED)}\n```"
+    if body.get("model", "").startswith("sonar"):
+        return WEB_CONTEXT
+    return "नमस्ते! मैं आपकी दुकान के हिसाब-किताब में मदद कर सकता हूँ।"
+
+
+def create_app(latency_ms: float = 50.0) -> Starlette:
+    stats = {"requests": 0}
+
+    async def chat_completions(request: Request) -> JSONResponse:
+        body = await request.json()
+        stats["requests"] += 1
+        if body.get("stream"):
+            return StreamingResponse(stream_completion(body.get("model", "fake"), reply(body), latency_ms),
+                                     media_type="text/event-stream")
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return JSONResponse(completion(body.get("model", "fake"), reply(body)))
+
+    async def get_stats(request: Request) -> JSONResponse:
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/api/v1/chat/completions", chat_completions, methods=["POST"]),  # OpenRouter
+        Route("/chat/completions", chat_completions, methods=["POST"]),  # Perplexity
+        Route("/stats", get_stats)
+    ])
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.latency_ms), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Load test: HTTP load profile against the service with a fake upstream
+
+Starts benchmarks/fake_upstream.py and the FastAPI app (uvicorn) as
+subprocesses, with OpenRouter and Perplexity pointed at the fake, then
+drives a fixed-concurrency request mix for --duration seconds and reports
+throughput and latency percentiles per scenario. Results can be saved as,
+or checked against, the "load" section of benchmarks/baseline.json.
+
+Usage:
+    python benchmarks/load_test.py [--concurrency 32] [--duration 20] [--upstream-latency-ms 50] [--save | --check]
+    python benchmarks/load_test.py --url http://127.0.0.1:8000   # existing server
+"""
+
+import os
+import sys
+import time
+import json
+import random
+import socket
+import asyncio
+import argparse
+import subprocess
+from typing import Dict, List, Any, Optional, Tuple
+
+import httpx
+
+import baseline
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EXAMPLE = os.path.join(ROOT, "examples", "small_vendor_signals.json")
+
+
+def _signals() -> List[Dict[str, Any]]:
+    with open(EXAMPLE, "r", encoding="utf-8") as f:
+        example = json.load(f)["signals"]
+    return [
+        example,
+        {"time_of_day": "morning", "system_language": "hi", "first_action": "voice"},
+        {"device_class": "low_end", "network_type": "3g", "data_saver_mode": "enabled"},
+        {"city_tier": "tier2", "education_apps": ["byjus", "unacademy"], "time_of_day": "night"},
+    ]
+
+
+def scenarios() -> List[Tuple[str, float, Any]]:
+    """(name, weight, request factory) -- factories return (method, path, json)"""
+    variants = _signals()
+
+    def signals():
+        # hour_of_day spreads requests over distinct LLM cache keys
+        return {**random.choice(variants), "hour_of_day": random.randrange(24)}
+
+    return [
+        ("infer_enhanced", 0.4, lambda: ("POST", "/v1/infer", {"signals": signals()})),
+        ("infer_rules", 0.3, lambda: ("POST", "/v1/infer?enhanced=false", {"signals": signals()})),
+        ("recommendations_all_days", 0.2,
+         lambda: ("POST", "/v1/recommendations/all-days?enhanced=false", {"signals": signals()})),
+        ("infer_batch_100", 0.1, lambda: ("POST", "/v1/infer/batch", [{"signals": signals()} for _ in range(100)])),
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+
+def start_servers(upstream_latency_ms: float, workers: int) -> Tuple[str, List[subprocess.Popen]]:
+    """Fake upstream and the app, as subprocesses; returns the app URL"""
+    upstream_port, app_port = _free_port(), _free_port()
+    upstream = f"http://127.0.0.1:{upstream_port}"
+    env = {
+        **os.environ,
+        "OPENROUTER_API_KEY": "fake",
+        "PERPLEXITY_API_KEY": "fake",
+        "OPENROUTER_BASE_URL": f"{upstream}/api/v1",
+        "PERPLEXITY_URL": f"{upstream}/chat/completions",
+        "ENABLE_WEB_CONTEXT": os.environ.get("ENABLE_WEB_CONTEXT", "true"),
+        "RULES_WATCH_INTERVAL": "0",
+    }
+    processes = [
+        subprocess.Popen([sys.executable, os.path.join(ROOT, "benchmarks", "fake_upstream.py"),
+                          "--port", str(upstream_port), "--latency-ms", str(upstream_latency_ms)], env=env),
+        subprocess.Popen([sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(app_port),
+                          "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+                         cwd=ROOT, env=env),
+    ]
+    app = f"http://127.0.0.1:{app_port}"
+    try:
+        _wait_ready(f"{upstream}/stats")
+        _wait_ready(f"{app}/v1/health")
+    except Exception:
+        stop_servers(processes)
+        raise
+    return app, processes
+
+
+def stop_servers(processes: List[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def run_load(url: str, concurrency: int, duration: float, warmup: float) -> Dict[str, Dict[str, float]]:
+    """Closed-loop load: concurrency clients each send the next request when the last returns"""
+    mix = scenarios()
+    names = [name for name, _, _ in mix]
+    weights = [weight for _, weight, _ in mix]
+    factories = {name: factory for name, _, factory in mix}
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        started = time.monotonic()
+        measure_from = started + warmup
+        stop_at = measure_from + duration
+
+        async def worker():
+            while True:
+                now = time.monotonic()
+                if now >= stop_at:
+                    return
+                name = random.choices(names, weights)[0]
+                method, path, body = factories[name]()
+                sent = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    failed = response.status_code != 200 or not response.json().get("success", True)
+                except httpx.HTTPError:
+                    failed = True
+                elapsed_ms = (time.perf_counter() - sent) * 1000
+                if now >= measure_from:
+                    latencies[name].append(elapsed_ms)
+                    errors[name] += failed
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    results = {}
+    for name in names:
+        samples = sorted(latencies[name])
+        if not samples:
+            continue
+        results[name] = {
+            "requests": len(samples),
+            "errors": errors[name],
+            "rps": round(len(samples) / duration, 2),
+            "p50_ms": round(_percentile(samples, 50), 2),
+            "p95_ms": round(_percentile(samples, 95), 2),
+            "p99_ms": round(_percentile(samples, 99), 2),
+        }
+    return results
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    index = min(len(samples) - 1, max(0, int(round(percent / 100 * len(samples))) - 1))
+    return samples[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="test an already running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before that")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50.0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    baseline.add_arguments(parser)
+    args = parser.parse_args()
+
+    processes: Optional[List[subprocess.Popen]] = None
+    url = args.url
+    if url is None:
+        url, processes = start_servers(args.upstream_latency_ms, args.workers)
+    try:
+        results = asyncio.run(run_load(url, args.concurrency, args.duration, args.warmup))
+    finally:
+        if processes is not None:
+            stop_servers(processes)
+
+    print(f"\n{args.concurrency} clients, {args.duration:.0f}s, upstream latency {args.upstream_latency_ms:.0f}ms\n")
+    print(f"{'scenario':<28}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<28}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+
+    sys.exit(baseline.report("load", results, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Batch Pool for Bharat Context-Adaptive Engine
+Process-pool sharding of CPU-bound batch scoring
+"""
+
+import os
+import json
+import asyncio
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+
+from .inference_engine import InferenceEngine, RuleSet, get_inference_engine
+from .batch_scoring import BatchScorer, get_batch_scorer
+from .sparse_signals import SparseInferenceRequest
+
+
+class BatchRowsInvalid(ValueError):
+    """
+    Rows of a strictly validated chunk failed validation
+    errors are pydantic-style error dicts (JSON-safe, so they cross the
+    process boundary) whose loc starts with the row's index in the chunk.
+    """
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _row_errors(row_index: int, error: ValueError) -> List[Dict[str, Any]]:
+    if isinstance(error, ValidationError):
+        return [
+            {**detail, "loc": [row_index] + list(detail["loc"])}
+            for detail in json.loads(error.json(include_url=False))
+        ]
+    return [{"type": "value_error", "loc": [row_index], "msg": str(error)}]
+
+
+def score_request_rows(scorer: BatchScorer, rows: List[Any], strict: bool = False) -> List[Dict[str, Any]]:
+    """
+    Score batch request rows in one vectorized pass
+    Args:
+        scorer: BatchScorer to use
+        rows: SparseInferenceRequest objects or raw request dicts (validated here;
+            an invalid row yields a failed result instead of failing the batch)
+        strict: Raise BatchRowsInvalid if any row is invalid instead
+    Returns:
+        Result dict per row, in order
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+    valid_rows, signals, invalid = [], [], []
+    for row_index, row in enumerate(rows):
+        try:
+            if not isinstance(row, SparseInferenceRequest):
+                row = SparseInferenceRequest.model_validate(row)
+        except ValueError as e:
+            if strict:
+                invalid.extend(_row_errors(row_index, e))
+            results[row_index] = {"success": False, "data": None, "error": str(e)}
+            continue
+        valid_rows.append(row_index)
+        signals.append(row.signals)
+    if invalid:
+        raise BatchRowsInvalid(invalid)
+
+    batch = scorer.score(signals)
+    for batch_index, row_index in enumerate(valid_rows):
+        try:
+            inference_output = scorer.build_output(batch, batch_index)
+            results[row_index] = {
+                "success": True,
+                "data": inference_output.model_dump(mode="json"),
+                "error": None
+            }
+        except Exception as e:
+            results[row_index] = {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+    return results
+
+
+# Per-process state of pool workers (set by _init_worker)
+_worker_scorer: Optional[BatchScorer] = None
+
+
+def _init_worker(config: Dict[str, Any], version: str, rules_path: Optional[Path]):
+    """Compile the parent's rule set once per worker process"""
+    global _worker_scorer
+    ruleset = RuleSet(config, version, rules_path)
+    _worker_scorer = BatchScorer(InferenceEngine(rules_path, ruleset=ruleset))
+
+
+def _score_in_worker(rows: List[Any], strict: bool) -> List[Dict[str, Any]]:
+    return score_request_rows(_worker_scorer, rows, strict)
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+class BatchPool:
+    """
+    Shards batch scoring across worker processes
+
+    Each worker compiles the parent's current rule set (and its BatchScorer)
+    once at start-up, so chunks only carry request rows and result dicts
+    across the process boundary. Up to two chunks per worker are in flight
+    and results come back in input order. Rows are validated inside the
+    chunks too, so the event loop only parses the request body. When the
+    rules are reloaded the pool is replaced; chunks already submitted finish
+    on the old rules. The pool is opt-in: with workers=0 (the default),
+    chunks are scored on a thread of this process. Workers are spawned on
+    the first batch, not at start-up.
+    """
+
+    def __init__(self, workers: int = 0, chunk_size: int = 256, start_method: str = "spawn"):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+        self.chunks_scored = 0
+        self.restarts = 0
+
+    @classmethod
+    def from_env(cls) -> "BatchPool":
+        """
+        Configure from BATCH_WORKERS (0, the default, disables the pool;
+        "auto" shares the cores among the app's worker processes, see
+        auto_workers), BATCH_CHUNK_SIZE and BATCH_START_METHOD
+        """
+        workers = os.getenv("BATCH_WORKERS", "0")
+        return cls(
+            workers=cls.auto_workers() if workers == "auto" else int(workers),
+            chunk_size=int(os.getenv("BATCH_CHUNK_SIZE", "256")),
+            start_method=os.getenv("BATCH_START_METHOD", "spawn")
+        )
+
+    @staticmethod
+    def auto_workers() -> int:
+        """
+        Cores per app worker process: every uvicorn/gunicorn worker has its
+        own pool, so the cores are divided by WEB_CONCURRENCY (default 1)
+        """
+        app_workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+        return max(1, (os.cpu_count() or 1) // app_workers)
+
+    @property
+    def max_inflight(self) -> int:
+        return max(1, self.workers * 2)
+
+    def _ensure_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Process pool on the current rule set (None when disabled)"""
+        if self.workers <= 0:
+            return None
+
+        engine = get_inference_engine()
+        with self._lock:
+            if self._executor is None or self._version != engine.ruleset_version:
+                previous = self._executor
+                ruleset = engine.ruleset
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker,
+                    initargs=(ruleset.config, ruleset.version, engine.rules_path)
+                )
+                self._version = ruleset.version
+                if previous is not None:
+                    previous.shutdown(wait=False)
+                    self.restarts += 1
+            return self._executor
+
+    def start(self):
+        """Spawn and initialize the workers now instead of on the first batch"""
+        executor = self._ensure_executor()
+        if executor is not None:
+            for _ in range(self.workers):
+                executor.submit(_worker_ready)
+
+    async def map_chunks(self, chunks: AsyncIterable[List[Any]],
+                         strict: bool = False) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Score chunks of request rows (see score_request_rows)
+        Yields:
+            Result dicts per chunk, in input order
+        Raises:
+            BatchRowsInvalid: With strict, for the first chunk holding an invalid row
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._ensure_executor()
+        pending = deque()
+
+        try:
+            async for chunk in chunks:
+                if executor is None:
+                    future = loop.run_in_executor(None, score_request_rows, get_batch_scorer(), chunk, strict)
+                else:
+                    future = loop.run_in_executor(executor, _score_in_worker, chunk, strict)
+                pending.append(future)
+                if len(pending) >= self.max_inflight:
+                    yield await pending.popleft()
+                    self.chunks_scored += 1
+
+            while pending:
+                yield await pending.popleft()
+                self.chunks_scored += 1
+        finally:
+            # The consumer stopped early (invalid rows, client disconnect,
+            # closed generator): drop chunks that have not started yet; those
+            # already running finish and their results are discarded
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "chunk_size": self.chunk_size,
+            "ruleset_version": self._version,
+            "chunks_scored": self.chunks_scored,
+            "restarts": self.restarts
+        }
+
+
+# Singleton instance
+_batch_pool_instance: Optional[BatchPool] = None
+
+
+def get_batch_pool() -> BatchPool:
+    """Get or create the shared batch pool"""
+    global _batch_pool_instance
+
+    if _batch_pool_instance is None:
+        _batch_pool_instance = BatchPool.from_env()
+
+    return _batch_pool_instance
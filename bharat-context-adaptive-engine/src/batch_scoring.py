@@ -0,0 +1,349 @@
+"""
+Vectorized batch scoring for Bharat Context-Adaptive Engine
+Scores many signal rows against all rules with NumPy array operations
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Sequence
+from enum import Enum
+import numpy as np
+
+from .models import RawSignals, InferenceOutput
+from .inference_engine import InferenceEngine, InferenceRule, RuleCondition, get_inference_engine
+
+
+# Reserved categorical codes
+MISSING_CODE = 0  # signal is None / not sent
+OTHER_CODE = 1    # value not referenced by any rule (or unhashable)
+
+
+def _normalize(value: Any) -> Any:
+    """Map str enums to their value so they share codes with plain strings"""
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+class BatchScores:
+    """Result of scoring a batch: N x R score matrix plus the winning rule per row"""
+
+    def __init__(
+        self,
+        rows: Sequence[Any],
+        matches: np.ndarray,
+        scores: np.ndarray,
+        winners: np.ndarray,
+        confidence: np.ndarray
+    ):
+        self.rows = rows
+        self.matches = matches        # (N, C) bool, condition hits
+        self.scores = scores          # (N, R) float64, weighted sums
+        self.winners = winners        # (N,) int, rule index or -1 for default rule
+        self.confidence = confidence  # (N,) float64, capped at max_confidence
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class BatchScorer:
+    """
+    Vectorized rule scorer for batch inference
+
+    Signals are encoded into an N x K categorical code matrix (one column per
+    signal referenced by the rules) and an N x K numeric matrix for range
+    conditions. Equality and set membership become code comparisons, ranges
+    become masked comparisons, and rule scores come out as one N x R matrix.
+    Winner selection reproduces InferenceEngine.infer_need_state.
+    """
+
+    def __init__(self, engine: InferenceEngine):
+        self.engine = engine
+        self.plan = engine.plan
+        self.rules: List[InferenceRule] = list(engine.rules)
+
+        self.columns: List[str] = list(self.plan.signal_index.keys())
+        self.column_index: Dict[str, int] = {name: i for i, name in enumerate(self.columns)}
+
+        # Flattened conditions in rule order: (rule_index, condition)
+        self.conditions: List[Tuple[int, RuleCondition]] = [
+            (rule_index, condition)
+            for rule_index, rule in enumerate(self.rules)
+            for condition in rule.conditions
+        ]
+
+        self.vocabularies: List[Dict[Any, int]] = [dict() for _ in self.columns]
+        self.numeric_columns = set()
+        self._compiled: List[Tuple[str, int, Any]] = []
+        self._compile()
+
+        self.thresholds = np.array(
+            [rule.confidence_threshold for rule in self.rules], dtype=np.float64
+        )
+
+    def _code_for(self, column: int, value: Any) -> int:
+        """Get or assign the categorical code of a rule value"""
+        vocabulary = self.vocabularies[column]
+        value = _normalize(value)
+        if value not in vocabulary:
+            vocabulary[value] = len(vocabulary) + 2
+        return vocabulary[value]
+
+    def _compile(self):
+        """Compile each condition into a vectorizable (kind, column, argument) triple"""
+        for _, condition in self.conditions:
+            column = self.column_index[condition.signal]
+            operator = condition.operator
+            value = condition.value
+
+            try:
+                if operator in ("equals", "not_equals"):
+                    self._compiled.append((operator, column, self._code_for(column, value)))
+                    continue
+
+                if operator in ("in", "not_in"):
+                    values = value if isinstance(value, list) else [value]
+                    codes = np.array([self._code_for(column, v) for v in values], dtype=np.int32)
+                    self._compiled.append((operator, column, codes))
+                    continue
+            except TypeError:
+                # Unhashable rule value - evaluate row by row
+                self._compiled.append(("object", column, condition.predicate))
+                continue
+
+            if operator == "between" and isinstance(value, list) and len(value) == 2 \
+                    and all(_is_number(v) for v in value):
+                self.numeric_columns.add(column)
+                self._compiled.append((operator, column, (float(value[0]), float(value[1]))))
+            elif operator in ("greater_than", "less_than") and _is_number(value):
+                self.numeric_columns.add(column)
+                self._compiled.append((operator, column, float(value)))
+            else:
+                # contains, non-numeric ranges and unknown operators
+                self._compiled.append(("object", column, condition.predicate))
+
+    def encode(self, rows: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray, List[List[Any]]]:
+        """
+        Encode signal rows into feature matrices
+        Args:
+            rows: RawSignals objects (or any object exposing signals as attributes)
+        Returns:
+            (codes, numeric, raw) where codes is (N, K) int32, numeric is (N, K)
+            float64 with NaN for missing values, and raw holds the original values
+        """
+        n_rows = len(rows)
+        n_columns = len(self.columns)
+        codes = np.zeros((n_rows, n_columns), dtype=np.int32)
+        numeric = np.full((n_rows, n_columns), np.nan, dtype=np.float64)
+        raw: List[List[Any]] = [[None] * n_columns for _ in range(n_rows)]
+
+        column_index = self.column_index
+        vocabularies = self.vocabularies
+        numeric_columns = self.numeric_columns
+        present_signals = self.plan._present_signals
+
+        for row_index, row in enumerate(rows):
+            row_raw = raw[row_index]
+            for name in present_signals(row):
+                column = column_index.get(name)
+                if column is None:
+                    continue
+                value = getattr(row, name, None)
+                if value is None:
+                    continue
+                row_raw[column] = value
+                try:
+                    codes[row_index, column] = vocabularies[column].get(_normalize(value), OTHER_CODE)
+                except TypeError:
+                    codes[row_index, column] = OTHER_CODE
+                if column in numeric_columns and _is_number(value):
+                    numeric[row_index, column] = value
+
+        return codes, numeric, raw
+
+    def score(self, rows: Sequence[Any]) -> BatchScores:
+        """
+        Score a batch of signal rows against all rules
+        Returns:
+            BatchScores with condition hits, N x R scores and winning rules
+        """
+        codes, numeric, raw = self.encode(rows)
+        n_rows = len(rows)
+
+        matches = np.zeros((n_rows, len(self.conditions)), dtype=bool)
+        for condition_index, (kind, column, argument) in enumerate(self._compiled):
+            column_codes = codes[:, column]
+
+            if kind == "equals":
+                hit = column_codes == argument
+            elif kind == "not_equals":
+                hit = (column_codes != argument) & (column_codes != MISSING_CODE)
+            elif kind == "in":
+                hit = np.isin(column_codes, argument)
+            elif kind == "not_in":
+                hit = ~np.isin(column_codes, argument) & (column_codes != MISSING_CODE)
+            elif kind == "between":
+                column_values = numeric[:, column]
+                hit = (column_values >= argument[0]) & (column_values <= argument[1])
+            elif kind == "greater_than":
+                hit = numeric[:, column] > argument
+            elif kind == "less_than":
+                hit = numeric[:, column] < argument
+            else:
+                hit = np.fromiter(
+                    (self._safe_predicate(argument, row_raw[column]) for row_raw in raw),
+                    dtype=bool,
+                    count=n_rows
+                )
+            matches[:, condition_index] = hit
+
+        # Accumulate in condition order so sums equal the per-rule Python path
+        scores = np.zeros((n_rows, len(self.rules)), dtype=np.float64)
+        for condition_index, (rule_index, condition) in enumerate(self.conditions):
+            scores[:, rule_index] += matches[:, condition_index] * condition.weight
+
+        winners, confidence = self._select(scores)
+        return BatchScores(rows, matches, scores, winners, confidence)
+
+    @staticmethod
+    def _safe_predicate(predicate, value: Any) -> bool:
+        if value is None:
+            return False
+        try:
+            return bool(predicate(value))
+        except TypeError:
+            # Non-comparable values never match instead of failing the batch
+            return False
+
+    def _select(self, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Pick the winning rule per row with the engine's threshold logic"""
+        n_rows = scores.shape[0]
+        if scores.shape[1] == 0:
+            return np.full(n_rows, -1, dtype=np.int64), np.zeros(n_rows, dtype=np.float64)
+
+        scoring_config = self.engine.scoring_config
+        min_confidence = scoring_config.get("min_confidence", 3.0)
+        max_confidence = scoring_config.get("max_confidence", 10.0)
+        rows = np.arange(n_rows)
+
+        # argmax returns the first maximum, matching the stable descending sort
+        top = np.argmax(scores, axis=1)
+        top_ok = scores[rows, top] >= self.thresholds[top]
+
+        eligible = (scores >= self.thresholds) & (scores >= min_confidence)
+        fallback = np.argmax(np.where(eligible, scores, -np.inf), axis=1)
+        has_fallback = eligible.any(axis=1)
+
+        winners = np.where(top_ok, top, np.where(has_fallback, fallback, -1))
+        confidence = np.where(
+            winners >= 0,
+            np.minimum(scores[rows, np.maximum(winners, 0)], max_confidence),
+            0.0
+        )
+        return winners, confidence
+
+    def matched_signals(self, batch: BatchScores, row_index: int) -> Tuple[List[str], List[str]]:
+        """
+        Get matched conditions and top signals of the winning rule for one row
+        Returns: (matched_conditions, top_signals)
+        """
+        rule_index = int(batch.winners[row_index])
+        if rule_index < 0:
+            return ([], [])
+
+        row = batch.rows[row_index]
+        matched_conditions = []
+        top_signals = []
+        for condition_index, (owner, condition) in enumerate(self.conditions):
+            if owner == rule_index and batch.matches[row_index, condition_index]:
+                matched_conditions.append(condition.signal)
+                top_signals.append(f"{condition.signal}={getattr(row, condition.signal, None)}")
+        return (matched_conditions, top_signals[:5])
+
+    def need_state(self, batch: BatchScores, row_index: int) -> Tuple[str, float, str, List[str], List[str]]:
+        """
+        Same tuple as InferenceEngine.infer_need_state for one row
+        Returns:
+            (user_need_state, confidence, matched_rule_name, matched_conditions, top_signals)
+        """
+        default_state = self.engine.default_rule.get("user_need_state", "First-time AI Explorer")
+        rule_index = int(batch.winners[row_index])
+        if rule_index < 0:
+            return (default_state, 0.0, "default", [], [])
+
+        rule = self.rules[rule_index]
+        matched_conditions, top_signals = self.matched_signals(batch, row_index)
+        if batch.scores[row_index, rule_index] >= rule.confidence_threshold \
+                and rule_index == int(np.argmax(batch.scores[row_index])):
+            user_need_state = rule.output.get("user_need_state", self.engine.default_rule.get("user_need_state"))
+        else:
+            user_need_state = rule.output.get("user_need_state", default_state)
+        return (
+            user_need_state,
+            float(batch.confidence[row_index]),
+            rule.name,
+            matched_conditions,
+            top_signals
+        )
+
+    def build_output(self, batch: BatchScores, row_index: int) -> InferenceOutput:
+        """Build the InferenceOutput for one scored row"""
+        engine = self.engine
+        signals = batch.rows[row_index]
+        user_need_state, confidence, matched_rule_name, matched_conditions, top_signals = \
+            self.need_state(batch, row_index)
+
+        recommended_actions, ui_mode, language_preference = \
+            engine.generate_recommendations(user_need_state, matched_rule_name, signals)
+
+        explanation = engine.generate_explanation(
+            user_need_state, matched_conditions, top_signals, confidence
+        )
+
+        return InferenceOutput(
+            user_need_state=user_need_state,
+            confidence=confidence,
+            recommended_actions=recommended_actions,
+            ui_mode=ui_mode,
+            language_preference=language_preference,
+            explanation=explanation,
+            matched_rule=matched_rule_name,
+            matched_signals=matched_conditions,
+            signal_count=len(matched_conditions),
+            ruleset_version=engine.ruleset_version
+        )
+
+    def infer(self, signals_list: Sequence[RawSignals]) -> List[InferenceOutput]:
+        """
+        Batch equivalent of InferenceEngine.infer
+        Args:
+            signals_list: RawSignals objects
+        Returns:
+            InferenceOutput per row, in input order
+        """
+        batch = self.score(signals_list)
+        return [self.build_output(batch, i) for i in range(len(batch))]
+
+
+# Singleton instance
+_batch_scorer_instance: Optional[BatchScorer] = None
+
+
+def get_batch_scorer() -> BatchScorer:
+    """Get or create batch scorer bound to the shared inference engine"""
+    global _batch_scorer_instance
+
+    engine = get_inference_engine()
+    # Rebuild when the rules were reloaded
+    if _batch_scorer_instance is None or _batch_scorer_instance.plan is not engine.plan:
+        _batch_scorer_instance = BatchScorer(engine)
+
+    return _batch_scorer_instance
+
+
+def set_batch_scorer(scorer: BatchScorer):
+    """Replace the shared batch scorer (used by the rules watcher)"""
+    global _batch_scorer_instance
+    _batch_scorer_instance = scorer
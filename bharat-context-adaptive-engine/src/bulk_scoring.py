@@ -0,0 +1,392 @@
+"""
+Bulk Scoring for Bharat Context-Adaptive Engine
+Columnar scoring of signal row streams (NDJSON or Arrow IPC) for offline rescoring
+"""
+
+import io
+import os
+import json
+import asyncio
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterable, Iterator, AsyncIterable, AsyncIterator
+import numpy as np
+
+from .models import UIMode, LanguagePreference
+from .batch_scoring import BatchScorer, get_batch_scorer
+from .sparse_signals import SparseSignals, SignalValidationError
+from .responses import dumps
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ARROW_AVAILABLE = False
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Result columns, in output order
+BULK_COLUMNS = ("rule_id", "need_state_id", "confidence", "ui_mode", "language")
+
+# rule_id values that are not rule indices
+DEFAULT_RULE_ID = -1  # no rule matched, default rule applied
+INVALID_ROW_ID = -2   # signals failed validation (see BulkChunk.errors)
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# Arrow input is buffered whole before scoring (pyarrow's stream reader is
+# blocking), so its size is capped; NDJSON input is streamed
+MAX_ARROW_BODY_BYTES = int(os.getenv("BULK_MAX_ARROW_BYTES", str(256 * 1024 * 1024)))
+# Longest accepted NDJSON line, so one unterminated line cannot grow without bound
+MAX_NDJSON_LINE_BYTES = int(os.getenv("BULK_MAX_LINE_BYTES", str(1024 * 1024)))
+
+
+class BulkInputTooLarge(ValueError):
+    """Bulk input over a configured size limit (answered with 413)"""
+
+
+class BulkChunk:
+    """Scored rows of one chunk as parallel arrays (codes index BulkScorer.dictionaries())"""
+
+    def __init__(self, offset: int, columns: Dict[str, np.ndarray], errors: List[Tuple[int, str]]):
+        self.offset = offset      # index of the chunk's first row in the stream
+        self.columns = columns
+        self.errors = errors      # (row index in stream, message) for invalid rows
+
+    def __len__(self) -> int:
+        return len(self.columns["rule_id"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"offset": self.offset}
+        for name in BULK_COLUMNS:
+            column = self.columns[name]
+            data[name] = np.round(column, 4).tolist() if column.dtype.kind == "f" else column.tolist()
+        if self.errors:
+            data["errors"] = [{"row": row, "error": message} for row, message in self.errors]
+        return data
+
+
+class BulkScorer:
+    """
+    Scores signal rows into compact columns
+
+    Rows are validated sparsely (SparseSignals), scored in chunks by the
+    vectorized BatchScorer, and reduced to integer codes: no InferenceOutput,
+    actions or explanation text is built per row. ui_mode and language only
+    depend on the winning rule, so they come from per-rule lookup tables.
+    """
+
+    def __init__(self, scorer: BatchScorer):
+        self.scorer = scorer
+        engine = scorer.engine
+        rules = scorer.rules
+        default_state = engine.default_rule.get("user_need_state", "First-time AI Explorer")
+
+        self.rule_names = [rule.name for rule in rules]
+        self.ui_modes = [mode.value for mode in UIMode]
+        self.languages = [language.value for language in LanguagePreference]
+
+        # Lookup tables indexed by rule index, with the default rule last
+        states = [rule.output.get("user_need_state", default_state) for rule in rules] + [default_state]
+        self.need_states = list(dict.fromkeys(states))
+        ui_modes, languages = [], []
+        for rule_name, state in zip(self.rule_names + ["default"], states):
+            _, ui_mode, language = engine.generate_recommendations(state, rule_name, None)
+            ui_modes.append(self.ui_modes.index(ui_mode.value))
+            languages.append(self.languages.index(language.value))
+
+        self._state_codes = np.array([self.need_states.index(s) for s in states], dtype=np.int16)
+        self._ui_mode_codes = np.array(ui_modes, dtype=np.int8)
+        self._language_codes = np.array(languages, dtype=np.int8)
+
+    def dictionaries(self) -> Dict[str, Any]:
+        """Code -> value tables for the result columns"""
+        return {
+            "columns": list(BULK_COLUMNS),
+            "rules": self.rule_names,
+            "need_states": self.need_states,
+            "ui_modes": self.ui_modes,
+            "languages": self.languages,
+            "ruleset_version": self.scorer.engine.ruleset_version
+        }
+
+    def score_chunk(self, rows: List[Dict[str, Any]], offset: int = 0) -> BulkChunk:
+        """
+        Score one chunk of signal dicts
+        Args:
+            rows: Signal dicts (or {"signals": {...}} request objects)
+            offset: Stream index of the first row (for error positions)
+        """
+        signals = []
+        valid = np.ones(len(rows), dtype=bool)
+        errors = []
+        for row_index, row in enumerate(rows):
+            if isinstance(row, dict) and isinstance(row.get("signals"), dict):
+                row = row["signals"]
+            try:
+                signals.append(SparseSignals.from_payload(row))
+            except SignalValidationError as e:
+                valid[row_index] = False
+                errors.append((offset + row_index, str(e)))
+
+        rule_id = np.full(len(rows), INVALID_ROW_ID, dtype=np.int16)
+        confidence = np.zeros(len(rows), dtype=np.float32)
+        need_state_id = np.full(len(rows), -1, dtype=np.int16)
+        ui_mode = np.full(len(rows), -1, dtype=np.int8)
+        language = np.full(len(rows), -1, dtype=np.int8)
+
+        if signals:
+            batch = self.scorer.score(signals)
+            winners = batch.winners
+            # Default rule sits after the last rule in the lookup tables
+            lookup = np.where(winners >= 0, winners, len(self.rule_names))
+
+            rule_id[valid] = np.where(winners >= 0, winners, DEFAULT_RULE_ID)
+            confidence[valid] = batch.confidence
+            need_state_id[valid] = self._state_codes[lookup]
+            ui_mode[valid] = self._ui_mode_codes[lookup]
+            language[valid] = self._language_codes[lookup]
+
+        columns = {
+            "rule_id": rule_id,
+            "need_state_id": need_state_id,
+            "confidence": confidence,
+            "ui_mode": ui_mode,
+            "language": language
+        }
+        return BulkChunk(offset, columns, errors)
+
+    def score_stream(self, rows: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[BulkChunk]:
+        """Score rows lazily, chunk_size rows at a time"""
+        offset = 0
+        for chunk in _chunked(rows, chunk_size):
+            yield self.score_chunk(chunk, offset)
+            offset += len(chunk)
+
+
+def _chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_bulk(rows: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+               scorer: Optional[BulkScorer] = None) -> Iterator[BulkChunk]:
+    """
+    Library entry point: score signal dicts with the shared rules
+    Args:
+        rows: Signal dicts, e.g. from iter_ndjson_rows or iter_arrow_rows
+        chunk_size: Rows scored per vectorized pass
+        scorer: BulkScorer to use (default: bound to the shared engine)
+    Returns:
+        Iterator of BulkChunk in input order
+    """
+    return (scorer or get_bulk_scorer()).score_stream(rows, chunk_size)
+
+
+async def _as_async(rows: Iterable[Any]) -> AsyncIterator[Any]:
+    for row in rows:
+        yield row
+
+
+async def ascore_bulk(rows: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      scorer: Optional[BulkScorer] = None) -> AsyncIterator[BulkChunk]:
+    """
+    score_bulk for (async) row streams; each chunk is scored in the default
+    executor so the event loop keeps serving other requests
+    """
+    bulk = scorer or get_bulk_scorer()
+    if not hasattr(rows, "__aiter__"):
+        rows = _as_async(rows)
+    loop = asyncio.get_running_loop()
+    offset = 0
+    chunk = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield await loop.run_in_executor(None, bulk.score_chunk, chunk, offset)
+            offset += len(chunk)
+            chunk = []
+    if chunk:
+        yield await loop.run_in_executor(None, bulk.score_chunk, chunk, offset)
+
+
+# NDJSON
+
+def _parse_line(line: Any) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        # Kept as the raw line so it is reported as an invalid row
+        return line.decode("utf-8", "replace") if isinstance(line, bytes) else line
+
+
+def iter_ndjson_rows(lines: Iterable[Any]) -> Iterator[Any]:
+    """Parse NDJSON lines (str or bytes), skipping blank lines"""
+    for line in lines:
+        if line.strip():
+            yield _parse_line(line)
+
+
+def _line_too_long(max_line_bytes: int) -> BulkInputTooLarge:
+    return BulkInputTooLarge(f"NDJSON line longer than {max_line_bytes} bytes")
+
+
+async def aiter_ndjson_rows(chunks: AsyncIterable[bytes], max_line_bytes: Optional[int] = None) -> AsyncIterator[Any]:
+    """
+    Parse an NDJSON byte stream (e.g. Request.stream()) row by row
+    Only newly received bytes are searched for line breaks, and at most one
+    partial line is held between chunks.
+    Raises:
+        BulkInputTooLarge: For a line over max_line_bytes (default MAX_NDJSON_LINE_BYTES)
+    """
+    max_line_bytes = MAX_NDJSON_LINE_BYTES if max_line_bytes is None else max_line_bytes
+    partial = bytearray()
+    async for chunk in chunks:
+        start = 0
+        end = chunk.find(b"\n")
+        while end != -1:
+            line = chunk[start:end]
+            if partial:
+                partial += line
+                line = bytes(partial)
+                partial.clear()
+            if len(line) > max_line_bytes:
+                raise _line_too_long(max_line_bytes)
+            if line.strip():
+                yield _parse_line(line)
+            start = end + 1
+            end = chunk.find(b"\n", start)
+        partial += chunk[start:]
+        if len(partial) > max_line_bytes:
+            raise _line_too_long(max_line_bytes)
+    if partial.strip():
+        yield _parse_line(bytes(partial))
+
+
+class NDJSONEncoder:
+    """Header line with the dictionaries, one line per chunk, then a summary line"""
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    def __init__(self, bulk: BulkScorer):
+        self.bulk = bulk
+        self.rows = 0
+        self.invalid = 0
+
+    def header(self) -> bytes:
+        return dumps(self.bulk.dictionaries()) + b"\n"
+
+    def encode(self, chunk: BulkChunk) -> bytes:
+        self.rows += len(chunk)
+        self.invalid += len(chunk.errors)
+        return dumps(chunk.to_dict()) + b"\n"
+
+    def close(self, error: Optional[str] = None) -> bytes:
+        summary = {"total_processed": self.rows, "invalid": self.invalid}
+        if error:
+            summary["error"] = error
+        return dumps(summary) + b"\n"
+
+
+# Arrow IPC (optional)
+
+def _require_arrow():
+    if not ARROW_AVAILABLE:
+        raise RuntimeError("Arrow support requires pyarrow (pip install pyarrow)")
+
+
+async def aread_arrow_body(chunks: AsyncIterable[bytes], max_bytes: Optional[int] = None) -> bytes:
+    """
+    Buffer an Arrow IPC request body (e.g. Request.stream())
+    Raises:
+        BulkInputTooLarge: As soon as the body exceeds max_bytes (default MAX_ARROW_BODY_BYTES)
+    """
+    max_bytes = MAX_ARROW_BODY_BYTES if max_bytes is None else max_bytes
+    parts = []
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise BulkInputTooLarge(
+                f"Arrow input is buffered and limited to {max_bytes} bytes; split it or send NDJSON"
+            )
+        parts.append(chunk)
+    return b"".join(parts)
+
+
+def iter_arrow_rows(data: bytes) -> Iterator[Dict[str, Any]]:
+    """Rows of an Arrow IPC stream, one record batch at a time (the schema is read eagerly)"""
+    _require_arrow()
+    reader = pa.ipc.open_stream(data)
+    return (row for record_batch in reader for row in record_batch.to_pylist())
+
+
+def arrow_schema(bulk: BulkScorer) -> "pa.Schema":
+    """Result schema; the code dictionaries travel in the schema metadata"""
+    _require_arrow()
+    return pa.schema(
+        [
+            ("rule_id", pa.int16()),
+            ("need_state_id", pa.int16()),
+            ("confidence", pa.float32()),
+            ("ui_mode", pa.int8()),
+            ("language", pa.int8()),
+        ],
+        metadata={"bharat.dictionaries": json.dumps(bulk.dictionaries())}
+    )
+
+
+class ArrowEncoder:
+    """Arrow IPC stream with one record batch per chunk"""
+
+    media_type = ARROW_MEDIA_TYPE
+
+    def __init__(self, bulk: BulkScorer):
+        self.schema = arrow_schema(bulk)
+        self._sink = io.BytesIO()
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def header(self) -> bytes:
+        return self._drain()
+
+    def encode(self, chunk: BulkChunk) -> bytes:
+        columns = [chunk.columns[name] for name in BULK_COLUMNS]
+        self._writer.write_batch(pa.record_batch(columns, schema=self.schema))
+        return self._drain()
+
+    def close(self, error: Optional[str] = None) -> bytes:
+        # Arrow streams have no error trailer; a truncated stream signals failure
+        if error:
+            raise RuntimeError(error)
+        self._writer.close()
+        return self._drain()
+
+
+# Singleton instance
+_bulk_scorer_instance: Optional[BulkScorer] = None
+
+
+def get_bulk_scorer() -> BulkScorer:
+    """Get or create the bulk scorer bound to the shared batch scorer"""
+    global _bulk_scorer_instance
+
+    scorer = get_batch_scorer()
+    # Rebuild when the rules were reloaded
+    if _bulk_scorer_instance is None or _bulk_scorer_instance.scorer is not scorer:
+        _bulk_scorer_instance = BulkScorer(scorer)
+
+    return _bulk_scorer_instance
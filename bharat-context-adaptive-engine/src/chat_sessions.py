@@ -0,0 +1,219 @@
+"""
+Chat Sessions for Bharat Context-Adaptive Engine
+Server-side chat history kept under a token budget, expiring on TTL
+"""
+
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without a tokenizer
+
+    About four UTF-8 bytes per token holds for English and overestimates
+    slightly for Devanagari and other Indic scripts, which is the safe side
+    for a budget.
+    """
+    return len(text.encode("utf-8")) // 4 + 1
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+class ChatSession:
+    """One conversation: recent turns, a summary of older ones and its context"""
+
+    def __init__(self, session_id: str, context: str = "", context_ref: Optional[str] = None):
+        self.session_id = session_id
+        self.context = context
+        self.context_ref = context_ref
+        self.messages: List[Dict[str, str]] = []
+        self.summary: List[str] = []
+        self.compacted_turns = 0
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+    def prompt_context(self) -> str:
+        """Context for the system prompt, with the summary of compacted turns"""
+        if not self.summary:
+            return self.context
+        earlier = "Earlier in this conversation:\n" + "\n".join(self.summary)
+        return f"{self.context}\n\n{earlier}" if self.context else earlier
+
+    def tokens(self) -> int:
+        return estimate_tokens(self.prompt_context()) + sum(
+            estimate_tokens(message["content"]) for message in self.messages
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "context_ref": self.context_ref,
+            "messages": list(self.messages),
+            "summary": list(self.summary),
+            "compacted_turns": self.compacted_turns,
+            "tokens": self.tokens(),
+            "created_at": self.created_at,
+            "last_used": self.last_used
+        }
+
+
+class ChatSessionStore:
+    """
+    Chat sessions keyed by session ID
+
+    Clients send only the new message; the store holds the history. When a
+    session grows past token_budget, its oldest turns are folded into a
+    short extractive summary (first words of each message) that travels in
+    the system prompt, keeping at least keep_messages recent messages
+    verbatim. Summary lines are dropped oldest first once they alone would
+    take more than a quarter of the budget. Sessions idle for ttl_seconds
+    expire, and the least recently used session is evicted past
+    max_sessions.
+    """
+
+    SUMMARY_CHARS = 160
+
+    def __init__(
+        self,
+        max_sessions: int = 10000,
+        ttl_seconds: float = 1800.0,
+        token_budget: int = 2000,
+        keep_messages: int = 4
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.token_budget = token_budget
+        self.keep_messages = keep_messages
+
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.created = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.compactions = 0
+
+    @classmethod
+    def from_env(cls) -> "ChatSessionStore":
+        """Build with CHAT_SESSION_* environment variable settings"""
+        return cls(
+            max_sessions=int(os.getenv("CHAT_SESSION_MAX_SESSIONS", "10000")),
+            ttl_seconds=float(os.getenv("CHAT_SESSION_TTL_SECONDS", "1800")),
+            token_budget=int(os.getenv("CHAT_SESSION_TOKEN_BUDGET", "2000")),
+            keep_messages=int(os.getenv("CHAT_SESSION_KEEP_MESSAGES", "4"))
+        )
+
+    def _expired(self, session: ChatSession, now: float) -> bool:
+        return now - session.last_used > self.ttl_seconds
+
+    def _enforce_limits_locked(self, now: float):
+        # Idle sessions sit at the LRU end
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if not self._expired(oldest, now):
+                break
+            self._sessions.popitem(last=False)
+            self.expirations += 1
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    def create(
+        self,
+        context: str = "",
+        context_ref: Optional[str] = None,
+        messages: Optional[List[Dict[str, str]]] = None
+    ) -> ChatSession:
+        """Start a session, optionally seeded with earlier turns"""
+        session = ChatSession(uuid.uuid4().hex, context, context_ref)
+        for message in messages or []:
+            session.messages.append({"role": message.get("role", "user"), "content": message.get("content", "")})
+        self._compact(session)
+        now = time.time()
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self.created += 1
+            self._enforce_limits_locked(now)
+        return session
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """Live session for an ID (None when unknown or expired)"""
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if self._expired(session, now):
+                del self._sessions[session_id]
+                self.expirations += 1
+                return None
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def append(self, session: ChatSession, role: str, content: str):
+        """Add a turn and compact the session back under its token budget"""
+        with self._lock:
+            session.messages.append({"role": role, "content": content})
+            session.last_used = time.time()
+        self._compact(session)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _compact(self, session: ChatSession):
+        with self._lock:
+            compacted = False
+            while len(session.messages) > self.keep_messages and session.tokens() > self.token_budget:
+                message = session.messages.pop(0)
+                speaker = "User" if message["role"] == "user" else "Assistant"
+                session.summary.append(f"- {speaker}: {_clip(message['content'], self.SUMMARY_CHARS)}")
+                session.compacted_turns += 1
+                compacted = True
+            summary_budget = self.token_budget // 4
+            while session.summary and estimate_tokens("\n".join(session.summary)) > summary_budget:
+                session.summary.pop(0)
+            if compacted:
+                self.compactions += 1
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "token_budget": self.token_budget,
+            "created": self.created,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "compactions": self.compactions
+        }
+
+
+# Singleton instance
+_chat_session_store_instance: Optional[ChatSessionStore] = None
+
+
+def get_chat_session_store() -> ChatSessionStore:
+    """Get or create the shared chat session store"""
+    global _chat_session_store_instance
+
+    if _chat_session_store_instance is None:
+        _chat_session_store_instance = ChatSessionStore.from_env()
+
+    return _chat_session_store_instance
@@ -0,0 +1,155 @@
+"""
+Dispatch for Bharat Context-Adaptive Engine
+Bounded thread pool for blocking calls made from async route handlers
+"""
+
+import os
+import asyncio
+import threading
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from .metrics import (
+    Timer, get_metrics,
+    DISPATCH_WAIT_SECONDS, DISPATCH_QUEUE_DEPTH, DISPATCH_ACTIVE, DISPATCH_REJECTED
+)
+
+
+T = TypeVar("T")
+
+
+class DispatchOverloaded(HTTPException):
+    """Raised when the dispatch pool and its queue are full (HTTP 429)"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Server is saturated, retry shortly",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class Dispatcher:
+    """
+    Runs sync engine and LLM calls off the event loop
+
+    At most max_workers calls run at once; up to max_queue more wait for a
+    thread. Beyond that run() rejects immediately with DispatchOverloaded
+    instead of letting latency grow without bound. Context variables (e.g.
+    the upstream-call collector) are carried into the worker thread.
+
+    pending and rejected belong to the event loop thread: only run() changes
+    them, between awaits, so they need no lock; a dispatcher must therefore
+    be used from a single event loop. active and completed are updated by
+    the worker threads under _lock. Reads from other threads (stats, metric
+    gauges) are point-in-time snapshots.
+    """
+
+    def __init__(self, max_workers: int = 16, max_queue: int = 64, name: str = "default"):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"dispatch-{name}")
+
+        self.pending = 0    # admitted and not finished (event loop thread only)
+        self.rejected = 0   # event loop thread only
+        self.active = 0     # running on a thread (updated under _lock)
+        self.completed = 0
+        self._lock = threading.Lock()
+
+        metrics = get_metrics()
+        metrics.gauge(DISPATCH_QUEUE_DEPTH, lambda: self.queue_depth, pool=name)
+        metrics.gauge(DISPATCH_ACTIVE, lambda: self.active, pool=name)
+        metrics.gauge(DISPATCH_REJECTED, lambda: self.rejected, kind="counter", pool=name)
+
+    @classmethod
+    def from_env(cls) -> "Dispatcher":
+        """Configure from DISPATCH_MAX_WORKERS and DISPATCH_MAX_QUEUE"""
+        return cls(
+            max_workers=int(os.getenv("DISPATCH_MAX_WORKERS", "16")),
+            max_queue=int(os.getenv("DISPATCH_MAX_QUEUE", "64"))
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.pending - self.active)
+
+    @property
+    def saturated(self) -> bool:
+        return self.pending >= self.max_workers + self.max_queue
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run func(*args, **kwargs) on a dispatch thread
+        Raises:
+            DispatchOverloaded: if max_workers calls run and max_queue wait
+        """
+        if self.saturated:
+            self.rejected += 1
+            raise DispatchOverloaded()
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        queued = Timer()
+        self.pending += 1
+
+        def call() -> T:
+            get_metrics().observe(DISPATCH_WAIT_SECONDS, queued.stop(), pool=self.name)
+            with self._lock:
+                self.active += 1
+            try:
+                return context.run(functools.partial(func, *args, **kwargs))
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        try:
+            return await loop.run_in_executor(self._executor, call)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+
+
+# Singleton instance
+_dispatcher_instance: Optional[Dispatcher] = None
+
+
+def get_dispatcher() -> Dispatcher:
+    """Get or create the shared dispatcher"""
+    global _dispatcher_instance
+
+    if _dispatcher_instance is None:
+        _dispatcher_instance = Dispatcher.from_env()
+
+    return _dispatcher_instance
+
+
+def shutdown_dispatcher():
+    """Stop the shared dispatcher (a new one is created on next use)"""
+    global _dispatcher_instance
+
+    if _dispatcher_instance is not None:
+        _dispatcher_instance.shutdown()
+        _dispatcher_instance = None
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking call on the shared dispatcher"""
+    return await get_dispatcher().run(func, *args, **kwargs)
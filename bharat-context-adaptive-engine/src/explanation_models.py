@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
 
+from .models import InferenceOutput
+
 
 class ExplanationEventType(str, Enum):
     """Types of explanation events"""
@@ -34,12 +36,14 @@ class ExplanationEvent(BaseModel):
     confidence_contribution: Optional[float] = Field(None, description="Confidence contribution from this step")
     reasoning: Optional[str] = Field(None, description="Reasoning explanation")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+    duration_ms: Optional[float] = Field(None, description="Wall-clock duration of this step in milliseconds")
 
 
 class InferenceExplanation(BaseModel):
     """Complete explanation of inference process"""
     
     inference_id: str = Field(..., description="Unique inference ID")
+    coalesced_from: Optional[str] = Field(None, description="Inference ID whose computation this request shared")
     timestamp: datetime = Field(default_factory=datetime.now)
     events: List[ExplanationEvent] = Field(default_factory=list, description="All explanation events")
     
@@ -51,6 +55,7 @@ class InferenceExplanation(BaseModel):
     # Web Intelligence
     web_intelligence_applied: bool = Field(False, description="Whether web intelligence was used")
     web_intelligence_insights: Optional[List[str]] = Field(None, description="Web intelligence insights")
+    web_context_cache: Optional[Dict[str, Any]] = Field(None, description="Web context cache lookup: pattern key, hit/stale_hit/miss, age in seconds")
     
     # App Context
     app_context_applied: bool = Field(False, description="Whether app context was used")
@@ -97,6 +102,10 @@ class InferenceExplanation(BaseModel):
             parts.append("Web Intelligence Insights:")
             for insight in self.web_intelligence_insights:
                 parts.append(f"  - {insight}")
+            if self.web_context_cache:
+                age = self.web_context_cache.get("age_seconds")
+                parts.append(f"  Web context cache: {self.web_context_cache.get('status')}"
+                             + (f" (age {age:.0f}s)" if age is not None else ""))
             parts.append("")
         
         # App Context
@@ -144,3 +153,10 @@ class InferenceExplanation(BaseModel):
         self.human_readable_explanation = "\n".join(parts)
         return self.human_readable_explanation
 
+
+class InferenceResult(BaseModel):
+    """Enhanced inference output together with its own ID and explanation"""
+    
+    output: InferenceOutput = Field(..., description="Inference output")
+    inference_id: str = Field(..., description="Unique inference ID")
+    explanation: InferenceExplanation = Field(..., description="Explanation recorded for this inference")
@@ -0,0 +1,337 @@
+"""
+Explanation Store for Bharat Context-Adaptive Engine
+Bounded store for InferenceExplanation objects with optional spill-to-disk
+"""
+
+import os
+import time
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+
+from .explanation_models import InferenceExplanation
+
+
+class SpillSegments:
+    """
+    Append-only on-disk segments of JSON-lines explanations
+
+    An in-memory offset index maps inference_id to (segment, offset, length).
+    When the active segment exceeds segment_bytes a new one is started; the
+    oldest segments are deleted once max_bytes is exceeded. Segments left in
+    the directory by earlier runs are indexed at startup and count towards
+    max_bytes like any other.
+    """
+
+    ID_PREFIX = b'{"inference_id":"'  # InferenceExplanation's first field
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024,
+                 segment_bytes: int = 32 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self.index: Dict[str, Tuple[int, int, int]] = {}
+        self.segments: "OrderedDict[int, List[str]]" = OrderedDict()  # segment -> ids
+        self.segment_sizes: Dict[int, int] = {}
+        self._file = None
+        self.dropped = 0
+        self.adopted = 0
+        self.active = self._adopt_existing()
+
+    def _adopt_existing(self) -> int:
+        """Index segments from earlier runs; returns the next segment number"""
+        numbers = sorted(
+            int(name.split(".")[0]) for name in os.listdir(self.directory)
+            if name.endswith(".jsonl") and name.split(".")[0].isdigit()
+        )
+        for segment in numbers:
+            ids = self.segments[segment] = []
+            offset = 0
+            with open(self._path(segment), "rb") as f:
+                for line in f:
+                    # A line without its newline was cut short by a crash
+                    inference_id = self._record_id(line) if line.endswith(b"\n") else None
+                    if inference_id is not None:
+                        self.index[inference_id] = (segment, offset, len(line) - 1)
+                        ids.append(inference_id)
+                        self.adopted += 1
+                    offset += len(line)
+            self.segment_sizes[segment] = offset
+        self._enforce_size()
+        return max(numbers, default=-1) + 1
+
+    @classmethod
+    def _record_id(cls, line: bytes) -> Optional[str]:
+        """inference_id of a spilled record, read from its prefix without parsing"""
+        if not line.startswith(cls.ID_PREFIX):
+            return None
+        end = line.find(b'"', len(cls.ID_PREFIX))
+        return line[len(cls.ID_PREFIX):end].decode("utf-8") if end > 0 else None
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{segment:08d}.jsonl")
+
+    def _open_active(self):
+        if self._file is None:
+            self._file = open(self._path(self.active), "ab")
+            self.segments.setdefault(self.active, [])
+            self.segment_sizes.setdefault(self.active, 0)
+        return self._file
+
+    def append(self, inference_id: str, data: bytes):
+        if self.segment_sizes.get(self.active, 0) >= self.segment_bytes:
+            self._roll()
+        segment_file = self._open_active()
+        offset = self.segment_sizes[self.active]
+        segment_file.write(data + b"\n")
+        segment_file.flush()
+        self.index[inference_id] = (self.active, offset, len(data))
+        self.segments[self.active].append(inference_id)
+        self.segment_sizes[self.active] += len(data) + 1
+        self._enforce_size()
+
+    def _roll(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.active += 1
+
+    def _enforce_size(self):
+        while self.total_bytes() > self.max_bytes and len(self.segments) > 1:
+            segment, ids = self.segments.popitem(last=False)
+            for inference_id in ids:
+                location = self.index.get(inference_id)
+                if location is not None and location[0] == segment:
+                    del self.index[inference_id]
+                    self.dropped += 1
+            self.segment_sizes.pop(segment, None)
+            try:
+                os.remove(self._path(segment))
+            except OSError:
+                pass
+
+    def read(self, inference_id: str) -> Optional[bytes]:
+        location = self.index.get(inference_id)
+        if location is None:
+            return None
+        segment, offset, length = location
+        with open(self._path(segment), "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def total_bytes(self) -> int:
+        return sum(self.segment_sizes.values())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ExplanationStore:
+    """
+    Bounded mapping of inference_id -> InferenceExplanation
+
+    Entries are evicted least-recently-used first once the count or the
+    approximate byte cap is exceeded, and on access once older than the TTL.
+    With a spill directory, evicted entries are handed to a background writer
+    thread that serializes and appends them to on-disk segments; they can
+    still be read back (disk reads are not promoted to memory).
+    """
+
+    # Size estimate per entry, close to the serialized size of a typical
+    # explanation without serializing it on the request path
+    BASE_BYTES = 1024
+    EVENT_BYTES = 768
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 3600.0,
+        spill_dir: Optional[str] = None,
+        spill_max_bytes: int = 256 * 1024 * 1024
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill = SpillSegments(spill_dir, spill_max_bytes) if spill_dir else None
+
+        # inference_id -> (stored_at, approx_bytes, explanation)
+        self._entries: "OrderedDict[str, Tuple[float, int, InferenceExplanation]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._spill_pending: Dict[str, InferenceExplanation] = {}  # evicted, not yet written
+        self._spill_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._spill_writer: Optional[threading.Thread] = None
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.spilled = 0
+        self.disk_hits = 0
+
+    @classmethod
+    def from_env(cls) -> "ExplanationStore":
+        """Build from EXPLANATION_STORE_* environment variables"""
+        ttl = float(os.getenv("EXPLANATION_STORE_TTL_SECONDS", "3600"))
+        return cls(
+            max_entries=int(os.getenv("EXPLANATION_STORE_MAX_ENTRIES", "1000")),
+            max_bytes=int(os.getenv("EXPLANATION_STORE_MAX_BYTES", str(64 * 1024 * 1024))),
+            ttl_seconds=ttl if ttl > 0 else None,
+            spill_dir=os.getenv("EXPLANATION_SPILL_DIR") or None,
+            spill_max_bytes=int(os.getenv("EXPLANATION_SPILL_MAX_BYTES", str(256 * 1024 * 1024)))
+        )
+
+    @staticmethod
+    def _serialize(explanation: InferenceExplanation) -> bytes:
+        return explanation.model_dump_json().encode("utf-8")
+
+    @classmethod
+    def _estimate_size(cls, explanation: InferenceExplanation) -> int:
+        return (cls.BASE_BYTES + cls.EVENT_BYTES * len(explanation.events)
+                + len(explanation.human_readable_explanation))
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+
+    def _evict_locked(self, inference_id: str):
+        """Remove an entry from memory, spilling it if configured"""
+        _, size, explanation = self._entries.pop(inference_id)
+        self.bytes -= size
+        if self.spill is not None:
+            self._spill_pending[inference_id] = explanation
+            self._spill_queue.put(inference_id)
+            if self._spill_writer is None:
+                self._spill_writer = threading.Thread(
+                    target=self._write_spills, name="explanation-spill", daemon=True
+                )
+                self._spill_writer.start()
+
+    def _write_spills(self):
+        """Writer thread: serialize and append evicted entries in eviction order"""
+        while True:
+            inference_id = self._spill_queue.get()
+            try:
+                if inference_id is None:
+                    return
+                with self._lock:
+                    explanation = self._spill_pending.get(inference_id)
+                if explanation is None:
+                    continue  # stored again (or already written) meanwhile
+                data = self._serialize(explanation)
+                with self._spill_lock:
+                    self.spill.append(inference_id, data)
+                with self._lock:
+                    if self._spill_pending.get(inference_id) is explanation:
+                        del self._spill_pending[inference_id]
+                    self.spilled += 1
+            except Exception as e:
+                print(f"Explanation spill failed for {inference_id}: {e}")
+            finally:
+                self._spill_queue.task_done()
+
+    def flush(self):
+        """Block until every evicted entry has been written to the spill"""
+        if self._spill_writer is not None:
+            self._spill_queue.join()
+
+    def _enforce_limits_locked(self):
+        now = time.time()
+        # Expired entries sit at the LRU end once they stop being read
+        while self._entries:
+            oldest_id, (stored_at, _, _) = next(iter(self._entries.items()))
+            if not self._expired(stored_at, now):
+                break
+            self._evict_locked(oldest_id)
+            self.expirations += 1
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            self._evict_locked(next(iter(self._entries)))
+            self.evictions += 1
+
+    def __setitem__(self, inference_id: str, explanation: InferenceExplanation):
+        size = self._estimate_size(explanation)
+        with self._lock:
+            self._spill_pending.pop(inference_id, None)
+            if inference_id in self._entries:
+                self.bytes -= self._entries.pop(inference_id)[1]
+            self._entries[inference_id] = (time.time(), size, explanation)
+            self.bytes += size
+            self._enforce_limits_locked()
+
+    def get(self, inference_id: str, default: Any = None) -> Optional[InferenceExplanation]:
+        with self._lock:
+            entry = self._entries.get(inference_id)
+            if entry is not None:
+                if not self._expired(entry[0], time.time()):
+                    self._entries.move_to_end(inference_id)
+                    return entry[2]
+                self._evict_locked(inference_id)
+                self.expirations += 1
+
+            pending = self._spill_pending.get(inference_id)
+            if pending is not None:
+                return pending
+        if self.spill is not None:
+            with self._spill_lock:
+                data = self.spill.read(inference_id)
+            if data is not None:
+                self.disk_hits += 1
+                return InferenceExplanation.model_validate_json(data)
+        return default
+
+    def __getitem__(self, inference_id: str) -> InferenceExplanation:
+        explanation = self.get(inference_id)
+        if explanation is None:
+            raise KeyError(inference_id)
+        return explanation
+
+    def __contains__(self, inference_id: object) -> bool:
+        with self._lock:
+            if inference_id in self._entries or inference_id in self._spill_pending:
+                return True
+        return self.spill is not None and inference_id in self.spill.index
+
+    def __len__(self) -> int:
+        """Number of explanations held in memory"""
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def keys(self) -> List[str]:
+        """In-memory inference IDs, least recently used first"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def close(self):
+        """Write out pending spills, stop the writer and close the active segment"""
+        if self._spill_writer is not None:
+            self._spill_queue.put(None)
+            self._spill_writer.join()
+            self._spill_writer = None
+        if self.spill is not None:
+            self.spill.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "spill_enabled": self.spill is not None,
+            "spilled": self.spilled,
+            "spill_pending": len(self._spill_pending),
+            "disk_hits": self.disk_hits
+        }
+        if self.spill is not None:
+            stats["spill_entries"] = len(self.spill.index)
+            stats["spill_bytes"] = self.spill.total_bytes()
+            stats["spill_dropped"] = self.spill.dropped
+            stats["spill_adopted"] = self.spill.adopted
+        return stats
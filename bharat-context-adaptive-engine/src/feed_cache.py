@@ -0,0 +1,94 @@
+"""
+Feed Cache for Bharat Context-Adaptive Engine
+Persona-keyed personalized feed cache with stale-while-revalidate refresh
+"""
+
+import os
+import uuid
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
+
+from .swr_cache import SWRCache
+
+
+FeedKey = Tuple[str, str]  # (user_need_state, language_preference)
+
+
+class FeedCache(SWRCache):
+    """
+    Feed cache keyed on (user_need_state, language_preference)
+
+    Serving, refresh and single-flight work as in SWRCache; a background task
+    keeps every known persona warm on a schedule. Empty upstream results
+    (missing API key, upstream error) are not cached, so they never replace
+    a good feed. Items get a server-side id when stored, unique across
+    personas (usable as a chat context_ref); upstream ids such as "1" repeat
+    between feeds and are kept as upstream_id. Callers always receive copies.
+    """
+
+    label = "Feed"
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], Awaitable[List[Dict[str, Any]]]],
+        sync_loader: Optional[Callable[[str, str], List[Dict[str, Any]]]] = None,
+        fresh_seconds: float = 900.0,
+        max_stale_seconds: float = 86400.0,
+        refresh_interval: float = 300.0,
+        max_entries: int = 256
+    ):
+        super().__init__(
+            lambda key: loader(*key),
+            (lambda key: sync_loader(*key)) if sync_loader is not None else None,
+            fresh_seconds=fresh_seconds,
+            max_stale_seconds=max_stale_seconds,
+            refresh_interval=refresh_interval,
+            max_entries=max_entries
+        )
+
+    @classmethod
+    def from_env(cls, loader, sync_loader=None) -> "FeedCache":
+        """Build with FEED_CACHE_* environment variable settings"""
+        return cls(
+            loader,
+            sync_loader,
+            fresh_seconds=float(os.getenv("FEED_CACHE_FRESH_SECONDS", "900")),
+            max_stale_seconds=float(os.getenv("FEED_CACHE_MAX_STALE_SECONDS", "86400")),
+            refresh_interval=float(os.getenv("FEED_CACHE_REFRESH_INTERVAL", "300")),
+            max_entries=int(os.getenv("FEED_CACHE_MAX_ENTRIES", "256"))
+        )
+
+    def _prepare(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        prepared = []
+        for item in items:
+            item = dict(item)
+            upstream_id = item.pop("id", None)
+            if upstream_id is not None:
+                item["upstream_id"] = upstream_id
+            item["id"] = str(uuid.uuid4())
+            prepared.append(item)
+        return prepared
+
+    def _copy(self, items: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return [dict(item) for item in items or []]
+
+    async def get(self, user_need_state: str, language: str) -> List[Dict[str, Any]]:
+        """Get the feed for a persona, serving stale content while revalidating"""
+        items, _ = await super().get((user_need_state, language))
+        return items
+
+    def get_sync(self, user_need_state: str, language: str) -> List[Dict[str, Any]]:
+        """
+        Blocking variant for the sync pipeline: only a miss waits for
+        upstream; stale entries are refreshed on a background thread
+        """
+        items, _ = super().get_sync((user_need_state, language))
+        return items
+
+    def find_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Cached feed item with this id, from any persona (e.g. to ground a chat)"""
+        with self._lock:
+            for entry in reversed(self._entries.values()):
+                for item in entry.value:
+                    if item.get("id") == item_id:
+                        return dict(item)
+        return None
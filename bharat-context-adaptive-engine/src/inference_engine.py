@@ -5,9 +5,12 @@ Core logic for inferring user need states from implicit signals
 
 import yaml
 import os
-from typing import Dict, List, Any, Optional, Tuple
+import copy
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable
 from pathlib import Path
 from datetime import datetime
+from enum import Enum
 from .models import RawSignals, InferenceOutput, UIMode, LanguagePreference
 
 
@@ -19,6 +22,69 @@ class RuleCondition:
         self.operator = condition_dict.get("operator")
         self.value = condition_dict.get("value")
         self.weight = condition_dict.get("weight", 1.0)
+        # Operator is resolved once here instead of on every evaluation
+        self.predicate: Callable[[Any], bool] = self._compile_predicate()
+    
+    def _compile_predicate(self) -> Callable[[Any], bool]:
+        """
+        Resolve the operator into a predicate bound to this condition's value
+        Returns: callable(signal_value) -> bool, signal_value is never None
+        """
+        value = self.value
+        
+        if self.operator == "equals":
+            return lambda signal_value: signal_value == value
+        
+        if self.operator == "not_equals":
+            return lambda signal_value: signal_value != value
+        
+        if self.operator in ("in", "not_in"):
+            if not isinstance(value, list):
+                if self.operator == "in":
+                    return lambda signal_value: signal_value == value
+                return lambda signal_value: signal_value != value
+            
+            members = frozenset(value)
+            
+            def is_member(signal_value: Any) -> bool:
+                # str enums hash by member name, so look them up by value
+                if isinstance(signal_value, Enum):
+                    signal_value = signal_value.value
+                try:
+                    return signal_value in members
+                except TypeError:
+                    # Unhashable signal values (e.g. app lists) fall back to list semantics
+                    return signal_value in value
+            
+            if self.operator == "in":
+                return is_member
+            return lambda signal_value: not is_member(signal_value)
+        
+        if self.operator == "between":
+            if isinstance(value, list) and len(value) == 2:
+                low, high = value
+                return lambda signal_value: low <= signal_value <= high
+            return lambda signal_value: False
+        
+        if self.operator == "greater_than":
+            return lambda signal_value: signal_value > value
+        
+        if self.operator == "less_than":
+            return lambda signal_value: signal_value < value
+        
+        if self.operator == "contains":
+            if isinstance(value, str):
+                return lambda signal_value: (
+                    isinstance(signal_value, (str, list)) and value in str(signal_value)
+                )
+            if isinstance(value, list):
+                return lambda signal_value: (
+                    isinstance(signal_value, (str, list))
+                    and any(v in str(signal_value) for v in value)
+                )
+        
+        # Unknown operators never match
+        return lambda signal_value: False
     
     def evaluate(self, signal_value: Any) -> Tuple[bool, float]:
         """
@@ -28,35 +94,7 @@ class RuleCondition:
         if signal_value is None:
             return (False, 0.0)
         
-        matches = False
-        
-        if self.operator == "equals":
-            matches = signal_value == self.value
-        elif self.operator == "not_equals":
-            matches = signal_value != self.value
-        elif self.operator == "in":
-            if isinstance(self.value, list):
-                matches = signal_value in self.value
-            else:
-                matches = signal_value == self.value
-        elif self.operator == "not_in":
-            if isinstance(self.value, list):
-                matches = signal_value not in self.value
-            else:
-                matches = signal_value != self.value
-        elif self.operator == "between":
-            if isinstance(self.value, list) and len(self.value) == 2:
-                matches = self.value[0] <= signal_value <= self.value[1]
-        elif self.operator == "greater_than":
-            matches = signal_value > self.value
-        elif self.operator == "less_than":
-            matches = signal_value < self.value
-        elif self.operator == "contains":
-            if isinstance(signal_value, (str, list)):
-                if isinstance(self.value, str):
-                    matches = self.value in str(signal_value)
-                elif isinstance(self.value, list):
-                    matches = any(v in str(signal_value) for v in self.value)
+        matches = self.predicate(signal_value)
         
         score = self.weight if matches else 0.0
         return (matches, score)
@@ -85,10 +123,9 @@ class InferenceRule:
         
         for condition in self.conditions:
             signal_value = getattr(signals, condition.signal, None)
-            matches, score = condition.evaluate(signal_value)
             
-            if matches:
-                total_score += score
+            if signal_value is not None and condition.predicate(signal_value):
+                total_score += condition.weight
                 matched_conditions.append(condition.signal)
                 top_signals.append(f"{condition.signal}={signal_value}")
         
@@ -96,46 +133,240 @@ class InferenceRule:
         return (total_score, matched_conditions, top_signals[:5])
 
 
+class RuleExecutionPlan:
+    """
+    Rules compiled for scoring
+    
+    Holds an inverted index from signal name to the (rule, condition) pairs that
+    read it, so scoring only visits signals that are present on the request.
+    """
+    
+    def __init__(self, rules: List[InferenceRule]):
+        self.rules = rules
+        self.rules_by_name: Dict[str, InferenceRule] = {}
+        for rule in rules:
+            self.rules_by_name.setdefault(rule.name, rule)
+        
+        # signal -> ((rule_index, condition_index, predicate, weight), ...)
+        index: Dict[str, List[Tuple[int, int, Callable[[Any], bool], float]]] = {}
+        for rule_index, rule in enumerate(rules):
+            for condition_index, condition in enumerate(rule.conditions):
+                index.setdefault(condition.signal, []).append(
+                    (rule_index, condition_index, condition.predicate, condition.weight)
+                )
+        self.signal_index: Dict[str, Tuple[Tuple[int, int, Callable[[Any], bool], float], ...]] = {
+            signal: tuple(entries) for signal, entries in index.items()
+        }
+        
+        # Indexed signals that carry a non-None default even when the client omits them
+        self.defaulted_signals = frozenset(
+            name for name, field in RawSignals.model_fields.items()
+            if name in self.signal_index
+            and (field.default is not None or field.default_factory is not None)
+        )
+    
+    def _present_signals(self, signals: RawSignals) -> Iterable[str]:
+        """Names of indexed signals that may be set on this request"""
+        fields_set = getattr(signals, "model_fields_set", None)
+        if fields_set is None:
+            return self.signal_index.keys()
+        if self.defaulted_signals:
+            return fields_set | self.defaulted_signals
+        return fields_set
+    
+    def score(self, signals: RawSignals) -> List[Tuple[InferenceRule, float, List[str], List[str]]]:
+        """
+        Score all rules against signals
+        Returns:
+            List of (rule, score, matched_conditions, top_signals) tuples in rule order
+        """
+        signal_index = self.signal_index
+        hits: Dict[int, List[Tuple[int, str, Any, float]]] = {}
+        
+        for signal in self._present_signals(signals):
+            entries = signal_index.get(signal)
+            if entries is None:
+                continue
+            signal_value = getattr(signals, signal, None)
+            if signal_value is None:
+                continue
+            for rule_index, condition_index, predicate, weight in entries:
+                if predicate(signal_value):
+                    hits.setdefault(rule_index, []).append(
+                        (condition_index, signal, signal_value, weight)
+                    )
+        
+        rule_scores = []
+        for rule_index, rule in enumerate(self.rules):
+            rule_hits = hits.get(rule_index)
+            if not rule_hits:
+                rule_scores.append((rule, 0.0, [], []))
+                continue
+            
+            # Keep rule-definition order so output matches InferenceRule.score
+            rule_hits.sort()
+            total_score = 0.0
+            matched_conditions = []
+            top_signals = []
+            for _, signal, signal_value, weight in rule_hits:
+                total_score += weight
+                matched_conditions.append(signal)
+                top_signals.append(f"{signal}={signal_value}")
+            rule_scores.append((rule, total_score, matched_conditions, top_signals[:5]))
+        
+        return rule_scores
+
+
+KNOWN_OPERATORS = frozenset({
+    "equals", "not_equals", "in", "not_in", "between", "contains", "greater_than", "less_than"
+})
+
+
+def validate_rules_config(config: Any):
+    """
+    Validate a parsed rules.yaml document
+    Raises:
+        ValueError: listing every problem found
+    """
+    if not isinstance(config, dict):
+        raise ValueError("Rules file must be a mapping")
+    
+    errors = []
+    rules = config.get("rules")
+    if not isinstance(rules, list) or not rules:
+        errors.append("'rules' must be a non-empty list")
+        rules = []
+    
+    names = set()
+    for index, rule in enumerate(rules):
+        label = f"rules[{index}]"
+        if not isinstance(rule, dict):
+            errors.append(f"{label} must be a mapping")
+            continue
+        name = rule.get("name")
+        if not name:
+            errors.append(f"{label} has no name")
+        elif name in names:
+            errors.append(f"{label} duplicates rule name '{name}'")
+        names.add(name)
+        label = f"rule '{name or index}'"
+        
+        conditions = rule.get("conditions")
+        if not isinstance(conditions, list) or not conditions:
+            errors.append(f"{label} must have a non-empty conditions list")
+            conditions = []
+        for cond_index, condition in enumerate(conditions):
+            if not isinstance(condition, dict) or not condition.get("signal"):
+                errors.append(f"{label} condition {cond_index} has no signal")
+                continue
+            if condition.get("operator") not in KNOWN_OPERATORS:
+                errors.append(f"{label} condition {cond_index} has unknown operator '{condition.get('operator')}'")
+            if not isinstance(condition.get("weight", 1.0), (int, float)):
+                errors.append(f"{label} condition {cond_index} weight must be a number")
+        
+        output = rule.get("output")
+        if not isinstance(output, dict) or not output.get("user_need_state"):
+            errors.append(f"{label} output must set user_need_state")
+        elif not isinstance(output.get("confidence_threshold", 0.0), (int, float)):
+            errors.append(f"{label} confidence_threshold must be a number")
+    
+    for section in ("default_rule", "scoring", "output"):
+        if not isinstance(config.get(section, {}), dict):
+            errors.append(f"'{section}' must be a mapping")
+    
+    if errors:
+        raise ValueError("Invalid rules: " + "; ".join(errors))
+
+
+class RuleSet:
+    """
+    Immutable snapshot of a parsed and validated rules.yaml
+    
+    Engines swap whole snapshots, so a request that started on one version
+    finishes on it. version is a short content hash of the file.
+    """
+    
+    def __init__(self, config: Dict[str, Any], version: str, source: Optional[Path] = None):
+        self.config = config
+        self.rules: List[InferenceRule] = [InferenceRule(rule) for rule in config.get("rules", [])]
+        self.plan = RuleExecutionPlan(self.rules)
+        self.default_rule: Dict[str, Any] = config.get("default_rule", {})
+        self.scoring_config: Dict[str, Any] = config.get("scoring", {})
+        self.output_config: Dict[str, Any] = config.get("output", {})
+        self.version = version
+        self.source = source
+        self.loaded_at = datetime.now()
+    
+    @classmethod
+    def load(cls, rules_path: Path) -> "RuleSet":
+        """
+        Parse, validate and compile a rules file
+        Raises:
+            FileNotFoundError, yaml.YAMLError, ValueError
+        """
+        rules_path = Path(rules_path)
+        if not rules_path.exists():
+            raise FileNotFoundError(f"Rules file not found: {rules_path}")
+        
+        raw = rules_path.read_bytes()
+        config = yaml.safe_load(raw)
+        validate_rules_config(config)
+        return cls(config, hashlib.sha256(raw).hexdigest()[:12], rules_path)
+
+
 class InferenceEngine:
     """Main inference engine class"""
     
-    def __init__(self, rules_path: Optional[str] = None):
+    def __init__(self, rules_path: Optional[str] = None, ruleset: Optional[RuleSet] = None):
         """
         Initialize inference engine
         Args:
             rules_path: Path to rules.yaml file. If None, looks for rules.yaml in current directory.
+            ruleset: Already-compiled rule set to use instead of loading rules_path
         """
         if rules_path is None:
             rules_path = Path(__file__).parent / "rules.yaml"
         
         self.rules_path = Path(rules_path)
+        self.ruleset: Optional[RuleSet] = None
         self.rules: List[InferenceRule] = []
+        self.plan: Optional[RuleExecutionPlan] = None
         self.default_rule: Dict[str, Any] = {}
         self.scoring_config: Dict[str, Any] = {}
         self.output_config: Dict[str, Any] = {}
         
-        self._load_rules()
+        if ruleset is not None:
+            self._apply_ruleset(ruleset)
+        else:
+            self._load_rules()
     
     def _load_rules(self):
         """Load rules from YAML file"""
-        if not self.rules_path.exists():
-            raise FileNotFoundError(f"Rules file not found: {self.rules_path}")
-        
-        with open(self.rules_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-        
-        # Load rules
-        rules_list = config.get("rules", [])
-        self.rules = [InferenceRule(rule) for rule in rules_list]
-        
-        # Load default rule
-        self.default_rule = config.get("default_rule", {})
-        
-        # Load scoring config
-        self.scoring_config = config.get("scoring", {})
+        self._apply_ruleset(RuleSet.load(self.rules_path))
+    
+    def _apply_ruleset(self, ruleset: RuleSet):
+        """Point this engine at a compiled rule set"""
+        self.ruleset = ruleset
+        self.rules = ruleset.rules
+        self.plan = ruleset.plan
+        self.default_rule = ruleset.default_rule
+        self.scoring_config = ruleset.scoring_config
+        self.output_config = ruleset.output_config
+    
+    @property
+    def ruleset_version(self) -> Optional[str]:
+        return self.ruleset.version if self.ruleset is not None else None
+    
+    def with_ruleset(self, ruleset: RuleSet) -> "InferenceEngine":
+        """
+        Copy of this engine running on another rule set
         
-        # Load output config
-        self.output_config = config.get("output", {})
+        The copy is shallow: everything except the rules (caches, stores,
+        service clients) is shared with this engine.
+        """
+        engine = copy.copy(self)
+        engine._apply_ruleset(ruleset)
+        return engine
     
     def extract_signals(self, payload: Dict[str, Any]) -> RawSignals:
         """
@@ -164,11 +395,7 @@ class InferenceEngine:
         Returns:
             List of (rule, score, matched_conditions, top_signals) tuples, sorted by score
         """
-        rule_scores = []
-        
-        for rule in self.rules:
-            score, matched_conditions, top_signals = rule.score(signals)
-            rule_scores.append((rule, score, matched_conditions, top_signals))
+        rule_scores = self.plan.score(signals)
         
         # Sort by score (descending)
         rule_scores.sort(key=lambda x: x[1], reverse=True)
@@ -237,11 +464,7 @@ class InferenceEngine:
             (recommended_actions, ui_mode, language_preference)
         """
         # Find the rule that generated this state
-        matched_rule = None
-        for rule in self.rules:
-            if rule.name == matched_rule_name:
-                matched_rule = rule
-                break
+        matched_rule = self.plan.rules_by_name.get(matched_rule_name)
         
         if matched_rule:
             output = matched_rule.output
@@ -349,7 +572,8 @@ class InferenceEngine:
             explanation=explanation,
             matched_rule=matched_rule_name,
             matched_signals=matched_conditions,
-            signal_count=len(matched_conditions)
+            signal_count=len(matched_conditions),
+            ruleset_version=self.ruleset_version
         )
 
 
@@ -372,3 +596,8 @@ def get_inference_engine(rules_path: Optional[str] = None) -> InferenceEngine:
     
     return _engine_instance
 
+
+def set_inference_engine(engine: InferenceEngine):
+    """Replace the shared inference engine (used by the rules watcher)"""
+    global _engine_instance
+    _engine_instance = engine
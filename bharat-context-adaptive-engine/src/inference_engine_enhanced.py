@@ -6,50 +6,422 @@ Uses signals + web intelligence + app context + LLM reasoning
 import yaml
 import os
 import uuid
+import asyncio
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
 from .models import RawSignals, InferenceOutput, UIMode, LanguagePreference, FeedItem
-from .explanation_models import InferenceExplanation, ExplanationEvent, ExplanationEventType
+from .explanation_models import InferenceExplanation, ExplanationEvent, ExplanationEventType, InferenceResult
 from .web_intelligence import WebIntelligence
 from .app_context import AppContext
 from .llm_reasoning import LLMReasoning
 from .llm_service import get_llm_service
+from .feed_cache import FeedCache
+from .web_context_cache import web_context_key
+from .explanation_store import ExplanationStore
+from .llm_cache import signal_fingerprint
+from .signal_patterns import PatternMatch, match_patterns, get_pattern_dag
+from .metrics import get_metrics, Timer, timed, collect_upstream_calls, STAGE_SECONDS, INFERENCE_SECONDS
+from .latency_budget import (
+    LatencyBudget, estimate_tiers, DECISION_RESERVE_SECONDS, DEGRADATION_ORDER,
+    TIER_RULES, TIER_ENHANCED, TIER_LLM, TIER_WEB_CONTEXT, TIER_FEED
+)
 
 # Import original rule-based engine
-from .inference_engine import InferenceEngine, InferenceRule, RuleCondition
+from .inference_engine import InferenceEngine, InferenceRule, RuleCondition, RuleSet
+
+
+# Explanation event that owns each kind of outbound call (feeds follow the final decision)
+UPSTREAM_CALL_EVENTS = {
+    "reasoning": ExplanationEventType.LLM_REASONING,
+    "web_intelligence": ExplanationEventType.WEB_INTELLIGENCE,
+    "feed": ExplanationEventType.FINAL_DECISION,
+}
 
 
 class EnhancedInferenceEngine(InferenceEngine):
     """Enhanced inference engine with web intelligence, app context, and LLM reasoning"""
     
-    def __init__(self, rules_path: Optional[str] = None):
-        """Initialize enhanced inference engine"""
+    # Correlations reported in the explanation (conditions in signal_patterns.PATTERNS)
+    SIGNAL_CORRELATIONS = {
+        "business_payments": "Strong correlation: Business apps + WhatsApp Business + Payment apps",
+        "student_sessions": "Strong correlation: Education apps + Long sessions + Long text",
+        "active_transactions": "Strong correlation: High OTP + Banking SMS + Payment apps"
+    }
+    
+    # Key signals listed among the decision factors
+    DECISION_SIGNALS = {
+        "business_apps_factor": "Business apps present",
+        "whatsapp_business_factor": "WhatsApp Business usage",
+        "high_otp_factor": "High OTP frequency",
+        "education_apps_factor": "Education apps present"
+    }
+    
+    def __init__(self, rules_path: Optional[str] = None, use_web_context: Optional[bool] = None):
+        """
+        Initialize enhanced inference engine
+        Args:
+            rules_path: Path to rules.yaml file
+            use_web_context: Query Perplexity for web context on detected patterns
+                (default: ENABLE_WEB_CONTEXT environment variable)
+        """
         super().__init__(rules_path)
         self.web_intelligence = WebIntelligence()
         self.app_context = AppContext()
         self.llm_reasoning = LLMReasoning()
         self.llm_service = get_llm_service()
-        self.explanations: Dict[str, InferenceExplanation] = {}
+        # Resolve llm_service at call time so a swapped service is honoured
+        self.feed_cache = FeedCache.from_env(
+            lambda state, language: self.llm_service.agenerate_feed_from_perplexity(state, language),
+            lambda state, language: self.llm_service.generate_feed_from_perplexity(state, language)
+        )
+        self.explanations = ExplanationStore.from_env()
+        # In-flight async inferences by signal fingerprint (single-flight);
+        # the counters are shared with with_ruleset() copies
+        self._inflight: Dict[str, "asyncio.Future"] = {}
+        self._coalescing = {"coalesced_requests": 0}
+        if use_web_context is None:
+            use_web_context = os.getenv("ENABLE_WEB_CONTEXT", "false").lower() == "true"
+        self.use_web_context = use_web_context
+    
+    def with_ruleset(self, ruleset: RuleSet) -> "EnhancedInferenceEngine":
+        """
+        Copy of this engine running on another rule set
+        
+        Like InferenceEngine.with_ruleset(), but the copy coalesces its own
+        in-flight inferences; the coalescing counters stay shared, so they
+        survive rule reloads.
+        """
+        engine = super().with_ruleset(ruleset)
+        engine._inflight = {}
+        return engine
+    
+    @property
+    def coalesced_requests(self) -> int:
+        """Requests served by awaiting an identical in-flight inference"""
+        return self._coalescing["coalesced_requests"]
+    
+    def coalescing_stats(self) -> Dict[str, Any]:
+        return {**self._coalescing, "inflight": len(self._inflight)}
     
     def infer(self, signals: RawSignals) -> InferenceOutput:
         """
         Complete enhanced inference pipeline with explanation logging
         """
+        return self.infer_with_explanation(signals).output
+    
+    def infer_with_explanation(self, signals: RawSignals) -> InferenceResult:
+        """
+        Run infer() and return the output with its inference ID and explanation
+        """
         inference_id = str(uuid.uuid4())
+        pipeline_timer = Timer()
+        
+        with collect_upstream_calls() as upstream_calls:
+            # Steps 1-3: signals, web intelligence, app context
+            explanation, web_intel_result, app_context_result, match = self._analyze_context(
+                inference_id, signals, use_perplexity=self.use_web_context
+            )
+            
+            # LLM reasoning (OpenRouter) + worldly knowledge
+            llm_timer = Timer()
+            llm_result = self.llm_reasoning.reason(signals, web_intel_result, app_context_result, match=match)
+            
+            # Steps 4-8: reasoning, scoring, correlation, contextual inference, final decision
+            inference_output = self._decide(signals, explanation, web_intel_result, app_context_result, llm_result,
+                                            llm_duration_ms=llm_timer.duration_ms, match=match)
+            
+            # Generate Personalized Feed using Perplexity
+            feed_timer = Timer()
+            try:
+                # Use the inferred state and language to get real content
+                raw_feed = self.feed_cache.get_sync(
+                    inference_output.user_need_state, inference_output.language_preference.value
+                )
+                inference_output.feed = self._build_feed_items(raw_feed)
+            except Exception as e:
+                print(f"Feed generation failed: {e}")
+                # Fallback to empty feed or default items if needed
+            get_metrics().observe(STAGE_SECONDS, feed_timer.stop(), stage="feed_generation")
+        
+        inference_output.applied_tiers = [TIER_RULES] + self._requested_tiers()
+        inference_output.dropped_tiers = []
+        self._attach_upstream_calls(explanation, upstream_calls)
+        get_metrics().observe(INFERENCE_SECONDS, pipeline_timer.stop(), pipeline="sync")
+        
+        return InferenceResult(output=inference_output, inference_id=inference_id, explanation=explanation)
+    
+    async def ainfer(self, signals: RawSignals, budget: Optional[LatencyBudget] = None) -> InferenceOutput:
+        """
+        Async enhanced inference pipeline
+        
+        Same result as infer(), but the upstream calls run concurrently on the
+        event loop: the LLM reasoning call, the web-context lookup and a feed
+        request for the rule-based need state all start as soon as their inputs
+        are known, and rule scoring runs while they are in flight. The feed is
+        re-requested only if the LLM overrides the need state or language.
+        Feeds come from the persona feed cache, so most requests make no
+        feed call at all.
+        """
+        return (await self.ainfer_with_explanation(signals, budget)).output
+    
+    async def ainfer_with_explanation(self, signals: RawSignals,
+                                      budget: Optional[LatencyBudget] = None) -> InferenceResult:
+        """
+        Run ainfer() and return the output with its inference ID and explanation
+        
+        Concurrent requests with the same canonical signals, rules version and
+        planned tiers are coalesced: the first runs the pipeline, the others
+        await it and get their own inference_id and explanation copy. A
+        follower whose latency budget runs out first falls back to the
+        rules-only result; one whose leader had to drop a tier the follower
+        planned for runs its own pipeline instead of sharing the degraded result.
+        """
+        dropped = self._plan_tiers(budget)
+        planned = [tier for tier in self._requested_tiers() if tier not in dropped]
+        key = signal_fingerprint(signals, self.ruleset_version or "", str(self.use_web_context), *planned)
+        leader = self._inflight.get(key)
+        if leader is not None:
+            return await self._follow(leader, signals, budget, planned)
+        
+        future = asyncio.ensure_future(self._ainfer_pipeline(signals, budget, dropped))
+        self._inflight[key] = future
+        
+        def release(done: "asyncio.Future"):
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+        
+        future.add_done_callback(release)
+        # shield: a disconnecting leader must not cancel the followers' result
+        return await asyncio.shield(future)
+    
+    async def _follow(self, leader: "asyncio.Future", signals: RawSignals,
+                      budget: Optional[LatencyBudget], planned: List[str]) -> InferenceResult:
+        """Await a coalesced in-flight inference and copy its result"""
+        self._coalescing["coalesced_requests"] += 1
+        try:
+            if budget is None:
+                shared = await asyncio.shield(leader)
+            else:
+                shared = await asyncio.wait_for(asyncio.shield(leader), budget.remaining())
+        except asyncio.TimeoutError:
+            dropped = [tier for tier in DEGRADATION_ORDER if tier in self._requested_tiers()]
+            return self._rules_only_result(str(uuid.uuid4()), signals, dropped)
+        
+        if any(tier not in shared.output.applied_tiers for tier in planned):
+            # The leader ran out of its own budget; this request may have more
+            return await self._ainfer_pipeline(signals, budget)
+        
+        inference_id = str(uuid.uuid4())
+        explanation = shared.explanation.model_copy(
+            deep=True, update={"inference_id": inference_id, "coalesced_from": shared.inference_id}
+        )
+        explanation.human_readable_explanation = explanation.generate_human_readable()
+        inference_output = shared.output.model_copy(deep=True)
+        inference_output.explanation = explanation.human_readable_explanation
+        self.explanations[inference_id] = explanation
+        return InferenceResult(output=inference_output, inference_id=inference_id, explanation=explanation)
+    
+    def _requested_tiers(self) -> List[str]:
+        """Tiers the enhanced pipeline runs without a latency budget (besides rules)"""
+        return [TIER_ENHANCED, TIER_LLM] + ([TIER_WEB_CONTEXT] if self.use_web_context else []) + [TIER_FEED]
+    
+    def _plan_tiers(self, budget: Optional[LatencyBudget]) -> List[str]:
+        """Tiers to drop up front because their p95 estimate does not fit the budget"""
+        return budget.plan(self._requested_tiers(), estimate_tiers()) if budget is not None else []
+    
+    async def _ainfer_pipeline(self, signals: RawSignals, budget: Optional[LatencyBudget] = None,
+                               dropped: Optional[List[str]] = None) -> InferenceResult:
+        """
+        The async enhanced pipeline behind ainfer_with_explanation
+        
+        With a latency budget, tiers whose p95 estimate does not fit are skipped
+        up front and upstream calls still pending at the deadline are cancelled.
+        Tiers are dropped in DEGRADATION_ORDER (feed, web context, LLM override,
+        enhanced reasoning); with nothing but rules left the pure InferenceEngine
+        result is returned. The output reports applied and dropped tiers.
+        """
+        inference_id = str(uuid.uuid4())
+        pipeline_timer = Timer()
+        
+        dropped = list(dropped) if dropped is not None else self._plan_tiers(budget)
+        tiers = [tier for tier in self._requested_tiers() if tier not in dropped]
+        
+        if TIER_ENHANCED not in tiers:
+            result = self._rules_only_result(inference_id, signals, dropped)
+            get_metrics().observe(INFERENCE_SECONDS, pipeline_timer.stop(), pipeline="async")
+            return result
+        
+        # Tasks spawned below inherit the upstream-call collector
+        with collect_upstream_calls() as upstream_calls:
+            # Steps 1-3 are local; web context is fetched concurrently below
+            explanation, web_intel_result, app_context_result, match = self._analyze_context(
+                inference_id, signals, use_perplexity=False
+            )
+            
+            llm_task = None
+            if TIER_LLM in tiers:
+                llm_task = asyncio.ensure_future(
+                    timed(self.llm_reasoning.ainfer_with_llm(signals, web_intel_result, app_context_result))
+                )
+            web_key = web_context_key(web_intel_result.get("detected_patterns", []))
+            web_task = None
+            if self.use_web_context and web_key:
+                web_cache = self.web_intelligence.web_context_cache
+                cached = web_cache.lookup(web_key)
+                if cached is not None:
+                    # A cached web context costs nothing, even when the budget dropped the tier
+                    self._apply_web_context(explanation, web_intel_result, *cached)
+                    if TIER_WEB_CONTEXT in dropped:
+                        dropped.remove(TIER_WEB_CONTEXT)
+                        tiers = [tier for tier in self._requested_tiers() if tier not in dropped]
+                elif TIER_WEB_CONTEXT in tiers:
+                    web_task = asyncio.ensure_future(web_cache.fetch(web_key))
+            
+            # Rule-based stages run while the I/O is in flight
+            knowledge = self.llm_reasoning.apply_knowledge(signals, web_intel_result, app_context_result, match)
+            rule_scores = self.score_rules(signals)
+            feed_task = None
+            if TIER_FEED in tiers:
+                feed_key = self._predict_feed_key(signals, rule_scores, web_intel_result, app_context_result, knowledge)
+                feed_task = asyncio.ensure_future(self.feed_cache.get(*feed_key))
+            
+            try:
+                llm_output, llm_duration_ms = {}, None
+                if llm_task is not None:
+                    try:
+                        llm_output, llm_duration_ms = await self._within_budget(llm_task, budget)
+                    except asyncio.TimeoutError:
+                        self._drop_tier(tiers, dropped, TIER_LLM)
+                if web_task is not None:
+                    try:
+                        web_context, cache_info = await self._within_budget(web_task, budget)
+                        self._apply_web_context(explanation, web_intel_result, web_context, cache_info)
+                    except asyncio.TimeoutError:
+                        self._drop_tier(tiers, dropped, TIER_WEB_CONTEXT)
+                    except Exception as e:
+                        print(f"Web context lookup failed: {e}")
+                
+                llm_result = self.llm_reasoning.combine(knowledge, llm_output)
+                inference_output = self._decide(
+                    signals, explanation, web_intel_result, app_context_result, llm_result, rule_scores,
+                    llm_duration_ms=llm_duration_ms, match=match
+                )
+                
+                if feed_task is not None:
+                    final_key = (inference_output.user_need_state, inference_output.language_preference.value)
+                    if final_key != feed_key:
+                        # LLM changed the persona - the speculative feed does not apply
+                        # (a cancelled miss still completes and warms the cache)
+                        feed_task.cancel()
+                        feed_task = asyncio.ensure_future(self.feed_cache.get(*final_key))
+                    
+                    feed_timer = Timer()
+                    try:
+                        inference_output.feed = self._build_feed_items(await self._within_budget(feed_task, budget))
+                    except asyncio.TimeoutError:
+                        self._drop_tier(tiers, dropped, TIER_FEED)
+                    except Exception as e:
+                        print(f"Feed generation failed: {e}")
+                    get_metrics().observe(STAGE_SECONDS, feed_timer.stop(), stage="feed_generation")
+            finally:
+                for task in (llm_task, web_task, feed_task):
+                    if task is not None and not task.done():
+                        task.cancel()
+        
+        inference_output.applied_tiers = [TIER_RULES] + tiers
+        inference_output.dropped_tiers = dropped
+        self._attach_upstream_calls(explanation, upstream_calls)
+        get_metrics().observe(INFERENCE_SECONDS, pipeline_timer.stop(), pipeline="async")
+        
+        return InferenceResult(output=inference_output, inference_id=inference_id, explanation=explanation)
+    
+    @staticmethod
+    async def _within_budget(task: "asyncio.Future", budget: Optional[LatencyBudget]) -> Any:
+        """Await a task, cancelling it (asyncio.TimeoutError) if the budget runs out first"""
+        if budget is None:
+            return await task
+        return await asyncio.wait_for(task, budget.remaining(reserve=DECISION_RESERVE_SECONDS))
+    
+    @staticmethod
+    def _drop_tier(tiers: List[str], dropped: List[str], tier: str):
+        if tier in tiers:
+            tiers.remove(tier)
+            dropped.append(tier)
+    
+    def _rules_only_result(self, inference_id: str, signals: RawSignals, dropped: List[str]) -> InferenceResult:
+        """Last degradation tier: the plain rule-based InferenceEngine result"""
+        inference_output = InferenceEngine.infer(self, signals)
+        inference_output.applied_tiers = [TIER_RULES]
+        inference_output.dropped_tiers = dropped
+        
+        explanation = InferenceExplanation(
+            inference_id=inference_id,
+            final_user_need_state=inference_output.user_need_state,
+            final_confidence=inference_output.confidence,
+            decision_factors=[f"Latency budget: rules only (dropped {', '.join(dropped)})"],
+            human_readable_explanation=inference_output.explanation
+        )
+        self.explanations[inference_id] = explanation
+        return InferenceResult(output=inference_output, inference_id=inference_id, explanation=explanation)
+    
+    def _apply_web_context(self, explanation: InferenceExplanation, web_intel_result: Dict[str, Any],
+                           web_context: Optional[str], cache_info: Dict[str, Any]):
+        """Attach a web context fetched after step 2 to its result and the explanation"""
+        self.web_intelligence.apply_web_context(web_intel_result, web_context, cache_info)
+        explanation.web_intelligence_insights = web_intel_result.get("insights", [])
+        explanation.web_context_cache = cache_info
+    
+    def _record_event(self, explanation: InferenceExplanation, duration_ms: Optional[float],
+                      event: ExplanationEvent):
+        """Add an event with its stage duration and record it in the stage histogram"""
+        event.duration_ms = duration_ms
+        if duration_ms is not None:
+            get_metrics().observe(STAGE_SECONDS, duration_ms / 1000, stage=event.event_type.value)
+        explanation.add_event(event)
+    
+    def _attach_upstream_calls(self, explanation: InferenceExplanation, upstream_calls: List[Dict[str, Any]]):
+        """Attach timed outbound calls to the events of the stages that made them"""
+        for call in upstream_calls:
+            event_type = UPSTREAM_CALL_EVENTS.get(call["call"])
+            for event in explanation.events:
+                if event.event_type == event_type:
+                    event.metadata = dict(event.metadata or {})
+                    event.metadata.setdefault("upstream_calls", []).append(call)
+                    break
+    
+    def _analyze_context(
+        self,
+        inference_id: str,
+        signals: RawSignals,
+        use_perplexity: bool = False
+    ) -> Tuple[InferenceExplanation, Dict[str, Any], Dict[str, Any], PatternMatch]:
+        """
+        Steps 1-3: signal summary, web intelligence and app context
+        
+        The heuristic patterns are evaluated once here and the match is
+        shared by every later stage of the request.
+        Returns:
+            (explanation, web_intel_result, app_context_result, match)
+        """
         explanation = InferenceExplanation(inference_id=inference_id)
         
+        timer = Timer()
+        match = get_pattern_dag().match(signals)
+        get_metrics().observe(STAGE_SECONDS, timer.stop(), stage="pattern_matching")
+        
         step = 0
         
         # Step 1: Signal Extraction and Summary
         step += 1
+        timer = Timer()
         signal_summary = self._extract_signal_summary(signals)
         explanation.signal_summary = signal_summary
         explanation.signal_count = sum(signal_summary.values())
         explanation.signal_categories = list(signal_summary.keys())
         
-        explanation.add_event(ExplanationEvent(
+        self._record_event(explanation, timer.duration_ms, ExplanationEvent(
             event_type=ExplanationEventType.SIGNAL_EXTRACTION,
             step=step,
             description=f"Extracted and analyzed {explanation.signal_count} signals across {len(explanation.signal_categories)} categories",
@@ -59,11 +431,13 @@ class EnhancedInferenceEngine(InferenceEngine):
         
         # Step 2: Web Intelligence Analysis
         step += 1
-        web_intel_result = self.web_intelligence.analyze_signals(signals)
+        timer = Timer()
+        web_intel_result = self.web_intelligence.analyze_signals(signals, use_perplexity=use_perplexity, match=match)
         explanation.web_intelligence_applied = web_intel_result.get("web_intelligence_applied", False)
         explanation.web_intelligence_insights = web_intel_result.get("insights", [])
+        explanation.web_context_cache = web_intel_result.get("web_context_cache")
         
-        explanation.add_event(ExplanationEvent(
+        self._record_event(explanation, timer.duration_ms, ExplanationEvent(
             event_type=ExplanationEventType.WEB_INTELLIGENCE,
             step=step,
             description=f"Applied web intelligence: {len(web_intel_result.get('insights', []))} insights, {len(web_intel_result.get('detected_patterns', []))} patterns detected",
@@ -75,11 +449,12 @@ class EnhancedInferenceEngine(InferenceEngine):
         
         # Step 3: App Context Analysis
         step += 1
-        app_context_result = self.app_context.analyze_app_context(signals)
+        timer = Timer()
+        app_context_result = self.app_context.analyze_app_context(signals, match=match)
         explanation.app_context_applied = app_context_result.get("app_context_applied", False)
         explanation.app_context_insights = app_context_result.get("insights", [])
         
-        explanation.add_event(ExplanationEvent(
+        self._record_event(explanation, timer.duration_ms, ExplanationEvent(
             event_type=ExplanationEventType.APP_CONTEXT,
             step=step,
             description=f"Applied app context: {len(app_context_result.get('detected_use_cases', []))} use cases detected",
@@ -89,13 +464,50 @@ class EnhancedInferenceEngine(InferenceEngine):
             reasoning="App context provides ChatGPT-specific understanding of user behaviors and Indian use cases"
         ))
         
-        # Step 4: LLM Reasoning
+        return explanation, web_intel_result, app_context_result, match
+    
+    def _predict_feed_key(self, signals: RawSignals, rule_scores: List[Tuple],
+                          web_intel: Dict[str, Any], app_context: Dict[str, Any],
+                          knowledge: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        (user_need_state, language) the rule path will produce without an LLM override
+        """
+        confidence_adjustments = {}
+        confidence_adjustments.update(web_intel.get("confidence_adjustments", {}))
+        confidence_adjustments.update(knowledge.get("confidence_adjustments", {}))
+        adjusted_rule_scores = self._adjust_rule_scores(rule_scores, confidence_adjustments,
+                                                        web_intel, app_context, knowledge)
+        user_need_state, _, matched_rule_name, _, _ = self.infer_need_state(signals, adjusted_rule_scores)
+        _, _, language_preference = self.generate_recommendations(user_need_state, matched_rule_name, signals)
+        return (user_need_state, language_preference.value)
+    
+    def _decide(
+        self,
+        signals: RawSignals,
+        explanation: InferenceExplanation,
+        web_intel_result: Dict[str, Any],
+        app_context_result: Dict[str, Any],
+        llm_result: Dict[str, Any],
+        rule_scores: Optional[List[Tuple]] = None,
+        llm_duration_ms: Optional[float] = None,
+        match: Optional[PatternMatch] = None
+    ) -> InferenceOutput:
+        """
+        Steps 4-8: LLM reasoning record, rule scoring, correlation,
+        contextual inference and final decision. Stores the explanation.
+        llm_duration_ms is the measured duration of the LLM reasoning stage;
+        match is the request's pattern match from _analyze_context.
+        Returns:
+            InferenceOutput without feed items
+        """
+        step = len(explanation.events)
+        
+        # Step 4: LLM Reasoning (the reasoning call itself ran before _decide)
         step += 1
-        llm_result = self.llm_reasoning.reason(signals, web_intel_result, app_context_result)
         explanation.llm_reasoning_applied = llm_result.get("llm_reasoning_applied", False)
         explanation.llm_reasoning_insights = llm_result.get("insights", [])
         
-        explanation.add_event(ExplanationEvent(
+        self._record_event(explanation, llm_duration_ms, ExplanationEvent(
             event_type=ExplanationEventType.LLM_REASONING,
             step=step,
             description=f"Applied LLM reasoning: {len(llm_result.get('insights', []))} insights, {len(llm_result.get('reasoning_steps', []))} reasoning steps",
@@ -107,7 +519,9 @@ class EnhancedInferenceEngine(InferenceEngine):
         
         # Step 5: Enhanced Rule Scoring with Adjustments
         step += 1
-        rule_scores = self.score_rules(signals)
+        timer = Timer()
+        if rule_scores is None:
+            rule_scores = self.score_rules(signals)
         
         # Apply confidence adjustments from web intelligence and LLM reasoning
         confidence_adjustments = {}
@@ -130,7 +544,7 @@ class EnhancedInferenceEngine(InferenceEngine):
         explanation.top_rules = top_rules_list
         explanation.rule_scores = {rule.name: score for rule, score, _, _ in adjusted_rule_scores}
         
-        explanation.add_event(ExplanationEvent(
+        self._record_event(explanation, timer.duration_ms, ExplanationEvent(
             event_type=ExplanationEventType.RULE_SCORING,
             step=step,
             description=f"Scored {len(rule_scores)} rules, top score: {adjusted_rule_scores[0][1]:.2f}",
@@ -142,10 +556,11 @@ class EnhancedInferenceEngine(InferenceEngine):
         
         # Step 6: Signal Correlation Analysis
         step += 1
+        timer = Timer()
         correlation_insights = self._analyze_signal_correlations(signals, web_intel_result, 
-                                                                  app_context_result, llm_result)
+                                                                  app_context_result, llm_result, match)
         
-        explanation.add_event(ExplanationEvent(
+        self._record_event(explanation, timer.duration_ms, ExplanationEvent(
             event_type=ExplanationEventType.SIGNAL_CORRELATION,
             step=step,
             description=f"Analyzed signal correlations: {len(correlation_insights)} correlations found",
@@ -156,10 +571,11 @@ class EnhancedInferenceEngine(InferenceEngine):
         
         # Step 7: Contextual Inference
         step += 1
+        timer = Timer()
         contextual_result = self._contextual_inference(signals, adjusted_rule_scores, 
                                                        web_intel_result, app_context_result, llm_result)
         
-        explanation.add_event(ExplanationEvent(
+        self._record_event(explanation, timer.duration_ms, ExplanationEvent(
             event_type=ExplanationEventType.CONTEXTUAL_INFERENCE,
             step=step,
             description=f"Applied contextual inference: {contextual_result.get('reasoning', 'N/A')}",
@@ -170,6 +586,7 @@ class EnhancedInferenceEngine(InferenceEngine):
         
         # Step 8: Final Decision
         step += 1
+        timer = Timer()
         user_need_state, confidence, matched_rule_name, matched_conditions, top_signals = \
             self.infer_need_state(signals, adjusted_rule_scores)
         
@@ -180,17 +597,6 @@ class EnhancedInferenceEngine(InferenceEngine):
             user_need_state = llm_inference.get("user_need_state")
             confidence = float(llm_inference.get("confidence", 5.0))
             matched_rule_name = "LLM_Inference"
-            # Use LLM provided metadata if available
-            if llm_inference.get("ui_mode"):
-                 try:
-                     ui_mode = UIMode(llm_inference.get("ui_mode"))
-                 except:
-                     pass # Keep rule-based default or previous
-            if llm_inference.get("language_preference"):
-                 try:
-                     language_preference = LanguagePreference(llm_inference.get("language_preference"))
-                 except:
-                     pass
 
         # Apply final adjustments (if not fully overridden by LLM confidence, or maybe combine)
         # If LLM gave high confidence, we trust it.
@@ -204,11 +610,11 @@ class EnhancedInferenceEngine(InferenceEngine):
         # Generate decision factors
         decision_factors = self._generate_decision_factors(
             signals, user_need_state, matched_rule_name, web_intel_result, 
-            app_context_result, llm_result, adjusted_rule_scores
+            app_context_result, llm_result, adjusted_rule_scores, match
         )
         explanation.decision_factors = decision_factors
         
-        explanation.add_event(ExplanationEvent(
+        self._record_event(explanation, timer.duration_ms, ExplanationEvent(
             event_type=ExplanationEventType.FINAL_DECISION,
             step=step,
             description=f"Final decision: {user_need_state} (confidence: {final_confidence:.2f}/10.0)",
@@ -248,28 +654,8 @@ class EnhancedInferenceEngine(InferenceEngine):
         explanation.human_readable_explanation = human_explanation
         
         # Store explanation
-        self.explanations[inference_id] = explanation
+        self.explanations[explanation.inference_id] = explanation
         
-        # Generate Personalized Feed using Perplexity
-        feed_items = []
-        try:
-            # Use the inferred state and language to get real content
-            raw_feed = self.llm_service.generate_feed_from_perplexity(user_need_state, language_preference.value)
-            
-            for item in raw_feed:
-                feed_items.append(FeedItem(
-                    id=item.get('id', str(uuid.uuid4())),
-                    type=item.get('type', 'news'),
-                    title=item.get('title', 'Update'),
-                    summary=item.get('summary', ''),
-                    source=item.get('source', 'BharatAI'),
-                    time=item.get('time', 'Just now'),
-                    tags=item.get('tags', [])
-                ))
-        except Exception as e:
-            print(f"Feed generation failed: {e}")
-            # Fallback to empty feed or default items if needed
-
         # Create final output
         return InferenceOutput(
             user_need_state=user_need_state,
@@ -281,9 +667,27 @@ class EnhancedInferenceEngine(InferenceEngine):
             matched_rule=matched_rule_name,
             matched_signals=matched_conditions,
             signal_count=len(matched_conditions),
-            feed=feed_items
+            ruleset_version=self.ruleset_version
         )
     
+    def _build_feed_items(self, raw_feed: List[Dict[str, Any]]) -> List[FeedItem]:
+        """Convert raw Perplexity feed entries into FeedItems"""
+        feed_items = []
+        for item in raw_feed:
+            # FeedCache assigns ids when it stores a feed, so they stay stable
+            # across requests, unique across personas, and can be used as a
+            # chat context_ref
+            feed_items.append(FeedItem(
+                id=item.get('id') or str(uuid.uuid4()),
+                type=item.get('type', 'news'),
+                title=item.get('title', 'Update'),
+                summary=item.get('summary', ''),
+                source=item.get('source', 'BharatAI'),
+                time=item.get('time', 'Just now'),
+                tags=item.get('tags', [])
+            ))
+        return feed_items
+    
     def _extract_signal_summary(self, signals: RawSignals) -> Dict[str, int]:
         """Extract summary of signals by category"""
         summary = {}
@@ -372,29 +776,13 @@ class EnhancedInferenceEngine(InferenceEngine):
         return False
     
     def _analyze_signal_correlations(self, signals: RawSignals, web_intel: Dict[str, Any],
-                                   app_context: Dict[str, Any], llm_result: Dict[str, Any]) -> List[str]:
+                                   app_context: Dict[str, Any], llm_result: Dict[str, Any],
+                                   match: Optional[PatternMatch] = None) -> List[str]:
         """Analyze correlations between signals"""
-        correlations = []
-        
-        # Business correlation
-        if (signals.business_apps and isinstance(signals.business_apps, list) and len(signals.business_apps) > 0 and
-            signals.whatsapp_business_usage == "yes" and
-            signals.payment_apps_installed):
-            correlations.append("Strong correlation: Business apps + WhatsApp Business + Payment apps")
-        
-        # Student correlation
-        if (signals.education_apps and isinstance(signals.education_apps, list) and len(signals.education_apps) > 0 and
-            signals.session_duration == "long" and
-            signals.text_input_length == "long"):
-            correlations.append("Strong correlation: Education apps + Long sessions + Long text")
-        
-        # Transaction correlation
-        if (signals.otp_message_frequency == "high" and
-            signals.banking_sms_presence == "yes" and
-            signals.payment_apps_installed):
-            correlations.append("Strong correlation: High OTP + Banking SMS + Payment apps")
-        
-        return correlations
+        return [
+            self.SIGNAL_CORRELATIONS[correlation]
+            for correlation in match_patterns(signals, match).family("engine_correlation")
+        ]
     
     def _contextual_inference(self, signals: RawSignals, rule_scores: List[Tuple],
                              web_intel: Dict[str, Any], app_context: Dict[str, Any],
@@ -445,7 +833,7 @@ class EnhancedInferenceEngine(InferenceEngine):
     def _generate_decision_factors(self, signals: RawSignals, user_need_state: str,
                                    matched_rule: str, web_intel: Dict[str, Any],
                                    app_context: Dict[str, Any], llm_result: Dict[str, Any],
-                                   rule_scores: List[Tuple]) -> List[str]:
+                                   rule_scores: List[Tuple], match: Optional[PatternMatch] = None) -> List[str]:
         """Generate key decision factors"""
         factors = []
         
@@ -467,14 +855,8 @@ class EnhancedInferenceEngine(InferenceEngine):
             factors.append(f"LLM reasoning: {len(llm_result.get('reasoning_steps', []))} reasoning steps applied")
         
         # Key signals
-        if signals.business_apps and isinstance(signals.business_apps, list) and len(signals.business_apps) > 0:
-            factors.append("Business apps present")
-        if signals.whatsapp_business_usage == "yes":
-            factors.append("WhatsApp Business usage")
-        if signals.otp_message_frequency == "high":
-            factors.append("High OTP frequency")
-        if signals.education_apps and isinstance(signals.education_apps, list) and len(signals.education_apps) > 0:
-            factors.append("Education apps present")
+        for factor in match_patterns(signals, match).family("decision_factor"):
+            factors.append(self.DECISION_SIGNALS[factor])
         
         return factors
     
@@ -534,3 +916,8 @@ def get_enhanced_inference_engine(rules_path: Optional[str] = None) -> EnhancedI
     
     return _enhanced_engine_instance
 
+
+def set_enhanced_inference_engine(engine: EnhancedInferenceEngine):
+    """Replace the shared enhanced engine (used by the rules watcher)"""
+    global _enhanced_engine_instance
+    _enhanced_engine_instance = engine
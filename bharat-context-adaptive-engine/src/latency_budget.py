@@ -0,0 +1,94 @@
+"""
+Latency Budget for Bharat Context-Adaptive Engine
+Per-request deadlines and the degradation ladder of the enhanced pipeline
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from .metrics import MetricsRegistry, get_metrics, STAGE_SECONDS, UPSTREAM_SECONDS
+
+
+# Pipeline tiers. "rules" (pure InferenceEngine) is always applied.
+TIER_RULES = "rules"
+TIER_ENHANCED = "enhanced"        # local web/app-context knowledge, correlation, contextual inference
+TIER_LLM = "llm"                  # OpenRouter reasoning override
+TIER_WEB_CONTEXT = "web_context"  # Perplexity web context
+TIER_FEED = "feed"                # personalized feed
+
+# Tiers are dropped in this order when they do not fit the budget
+DEGRADATION_ORDER = (TIER_FEED, TIER_WEB_CONTEXT, TIER_LLM, TIER_ENHANCED)
+
+# p95 guesses (seconds) until the metrics registry has samples
+DEFAULT_ESTIMATES = {
+    TIER_ENHANCED: 0.02,
+    TIER_LLM: 3.0,
+    TIER_WEB_CONTEXT: 2.0,
+    TIER_FEED: 2.0,
+}
+
+# Local pipeline stages that make up the enhanced tier
+LOCAL_STAGES = (
+    "pattern_matching", "signal_extraction", "web_intelligence", "app_context", "rule_scoring",
+    "signal_correlation", "contextual_inference", "final_decision",
+)
+
+# Time kept back for the final decision after awaiting upstream calls
+DECISION_RESERVE_SECONDS = 0.005
+
+
+def estimate_tiers(metrics: Optional[MetricsRegistry] = None, quantile: float = 0.95) -> Dict[str, float]:
+    """Per-tier latency estimates (seconds) from the rolling stage histograms"""
+    metrics = metrics or get_metrics()
+
+    local = [metrics.quantile(STAGE_SECONDS, quantile, stage=stage) for stage in LOCAL_STAGES]
+    observed = {
+        TIER_ENHANCED: sum(local) if all(v is not None for v in local) else None,
+        TIER_LLM: metrics.quantile(STAGE_SECONDS, quantile, stage="llm_reasoning"),
+        TIER_WEB_CONTEXT: metrics.quantile(UPSTREAM_SECONDS, quantile, service="perplexity",
+                                           call="web_intelligence", outcome="ok"),
+        TIER_FEED: metrics.quantile(STAGE_SECONDS, quantile, stage="feed_generation"),
+    }
+    return {
+        tier: value if value is not None else DEFAULT_ESTIMATES[tier]
+        for tier, value in observed.items()
+    }
+
+
+class LatencyBudget:
+    """Deadline for one request (from the X-Latency-Budget-Ms header)"""
+
+    def __init__(self, budget_ms: float):
+        self.budget_ms = budget_ms
+        self.deadline = time.perf_counter() + budget_ms / 1000
+
+    def remaining(self, reserve: float = 0.0) -> float:
+        """Seconds left before the deadline, minus reserve (never negative)"""
+        return max(0.0, self.deadline - time.perf_counter() - reserve)
+
+    def plan(self, tiers: List[str], estimates: Dict[str, float]) -> List[str]:
+        """
+        Tiers to drop so the estimated pipeline fits the remaining budget
+        Args:
+            tiers: Requested tiers (besides rules)
+            estimates: Per-tier latency estimates in seconds
+        Returns:
+            Dropped tiers, in degradation order
+        """
+        active = list(tiers)
+        dropped = []
+        for tier in DEGRADATION_ORDER:
+            if self._cost(active, estimates) <= self.remaining():
+                break
+            if tier in active:
+                active.remove(tier)
+                dropped.append(tier)
+        return dropped
+
+    @staticmethod
+    def _cost(active: List[str], estimates: Dict[str, float]) -> float:
+        if TIER_ENHANCED not in active:
+            return 0.0
+        # Upstream calls run concurrently, so the slowest one bounds the wait
+        upstream = [estimates[tier] for tier in (TIER_LLM, TIER_WEB_CONTEXT, TIER_FEED) if tier in active]
+        return estimates[TIER_ENHANCED] + max(upstream, default=0.0)
@@ -0,0 +1,242 @@
+"""
+LLM Inference Cache for Bharat Context-Adaptive Engine
+Content-addressed cache for LLM results keyed on canonicalized signals
+"""
+
+import os
+import copy
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Hashable
+from datetime import datetime, date
+
+from .models import RawSignals
+
+
+# Signals that differ on every request but do not change the inference
+VOLATILE_SIGNAL_FIELDS = frozenset({
+    "timestamp",         # collection time
+    "first_launch_time", # per-install wall clock
+})
+
+
+# App-set signals: which apps are present matters, their order does not.
+# Other lists (e.g. screen_views, a navigation sequence) keep their order.
+UNORDERED_SIGNAL_FIELDS = frozenset(
+    name for name in RawSignals.model_fields
+    if name.endswith("_apps") or name == "payment_apps_installed"
+)
+
+
+def _json_default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def canonical_signals(signals: RawSignals) -> Dict[str, Any]:
+    """
+    Canonical form of a signal payload: JSON-mode values, no None fields,
+    no volatile fields, and app-set lists sorted (UNORDERED_SIGNAL_FIELDS)
+    """
+    canonical = {}
+    for name, value in signals.model_dump(mode="json", exclude_none=True).items():
+        if name in VOLATILE_SIGNAL_FIELDS:
+            continue
+        if name in UNORDERED_SIGNAL_FIELDS and isinstance(value, list) and all(isinstance(v, str) for v in value):
+            value = sorted(value)
+        canonical[name] = value
+    return canonical
+
+
+def signal_fingerprint(signals: RawSignals, *namespace: str) -> str:
+    """
+    Stable SHA-256 fingerprint of canonicalized signals
+    Args:
+        namespace: Extra key parts (e.g. prompt version, model name)
+    """
+    payload = json.dumps(
+        [list(namespace), canonical_signals(signals)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=_json_default
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """Thread-safe in-process cache with TTL expiry and LRU eviction"""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """
+        Get (stored_at, value) for a live entry
+        Returns None on miss or expiry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if now - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry[1] if entry is not None else None
+
+    def set(self, key: Hashable, value: Any, stored_at: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (stored_at if stored_at is not None else time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+
+class SQLiteCache:
+    """On-disk cache tier (survives restarts) with TTL expiry and a size bound"""
+
+    def __init__(self, path: str, max_entries: int = 100000, ttl_seconds: float = 86400.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at)")
+        self._conn.commit()
+
+    def get_entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        stored_at, value = row
+        if time.time() - stored_at > self.ttl_seconds:
+            return None
+        return stored_at, json.loads(value)
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        stored_at = stored_at if stored_at is not None else time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=_json_default), stored_at)
+            )
+            self._prune()
+            self._conn.commit()
+
+    def _prune(self):
+        """Drop expired rows, then the oldest rows beyond max_entries"""
+        self._conn.execute("DELETE FROM cache WHERE stored_at < ?", (time.time() - self.ttl_seconds,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY stored_at ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LLMInferenceCache:
+    """
+    Two-tier cache for LLM inference results
+
+    An in-process TTL/LRU tier in front of an optional SQLite tier. Disk hits
+    are promoted to memory. Values are JSON-serializable dicts; callers get
+    copies so cached results cannot be mutated in place.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 86400.0,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 100000
+    ):
+        self.memory = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk = SQLiteCache(disk_path, disk_max_entries, ttl_seconds) if disk_path else None
+        self.disk_hits = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMInferenceCache"]:
+        """Build from LLM_CACHE_* environment variables (None if disabled)"""
+        if os.getenv("LLM_CACHE_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")),
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+            disk_path=os.getenv("LLM_CACHE_PATH") or None,
+            disk_max_entries=int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "100000"))
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            entry = self.disk.get_entry(key)
+            if entry is not None:
+                self.disk_hits += 1
+                stored_at, value = entry
+                self.memory.set(key, value, stored_at=stored_at)
+        return copy.deepcopy(value) if value is not None else None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        value = copy.deepcopy(value)
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats["disk_enabled"] = self.disk is not None
+        stats["disk_hits"] = self.disk_hits
+        return stats
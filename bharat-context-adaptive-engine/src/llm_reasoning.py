@@ -7,6 +7,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, date
 from .models import RawSignals
 from .llm_service import get_llm_service
+from .signal_patterns import PatternMatch, match_patterns
 import json
 
 
@@ -21,22 +22,30 @@ class LLMReasoning:
         "indian_business_culture": {
             "insight": "Small businesses in India often use WhatsApp for customer communication and evening time for accounting",
             "applies_to": ["business_apps", "whatsapp_business_usage", "evening_activity"],
-            "confidence_boost": 0.4
+            "confidence_boost": 0.4,
+            "reasoning": "Indian business culture: Small businesses use WhatsApp for customer communication and evening for accounting",
+            "signals_used": ["business_apps", "whatsapp_business_usage", "time_of_day"]
         },
         "indian_education_system": {
             "insight": "Indian students often use education apps in afternoon/evening for exam preparation",
             "applies_to": ["education_apps", "afternoon_activity", "long_sessions"],
-            "confidence_boost": 0.3
+            "confidence_boost": 0.3,
+            "reasoning": "Indian education system: Students use education apps in afternoon/evening for exam prep",
+            "signals_used": ["education_apps", "time_of_day", "session_duration"]
         },
         "indian_digital_payment_adoption": {
             "insight": "High OTP frequency and multiple payment apps indicate active digital payment user in India",
             "applies_to": ["otp_frequency", "payment_apps", "banking_sms"],
-            "confidence_boost": 0.5
+            "confidence_boost": 0.5,
+            "reasoning": "Indian digital payment adoption: High OTP frequency + multiple payment apps = active digital payment user",
+            "signals_used": ["otp_message_frequency", "payment_apps_installed", "banking_sms_presence"]
         },
         "indian_language_preferences": {
             "insight": "Hindi-dominant users in North India prefer Hindi interface, regional language users prefer regional",
             "applies_to": ["system_language", "state", "messaging_language"],
-            "confidence_boost": 0.4
+            "confidence_boost": 0.4,
+            "reasoning": "Indian language preferences: Hindi-dominant users in North India prefer Hindi interface",
+            "signals_used": ["system_language", "state"]
         },
         "indian_festival_culture": {
             "insight": "Festival days see increased devotional and messaging activity",
@@ -46,60 +55,110 @@ class LLMReasoning:
         "indian_device_constraints": {
             "insight": "Tier-2/3/4 users often have low-end devices and slow networks, need optimized experiences",
             "applies_to": ["device_class", "network_type", "city_tier"],
-            "confidence_boost": 0.5
+            "confidence_boost": 0.5,
+            "reasoning": "Indian device constraints: Tier-2/3/4 users often have low-end devices and slow networks, need optimized experiences",
+            "signals_used": ["device_class", "network_type", "city_tier"]
         },
         "indian_social_communication": {
             "insight": "WhatsApp is primary communication tool in India, high group activity indicates social engagement",
             "applies_to": ["whatsapp_installed", "whatsapp_group_activity", "notification_frequency"],
-            "confidence_boost": 0.3
+            "confidence_boost": 0.3,
+            "reasoning": "Indian social communication: WhatsApp is primary communication tool, high group activity = social engagement",
+            "signals_used": ["whatsapp_installed", "whatsapp_group_activity", "whatsapp_notification_frequency"]
+        }
+    }
+    
+    # Cross-signal correlations
+    SIGNAL_CORRELATIONS = {
+        "business_user_strong": {
+            "insight": "Strong correlation: Business apps + WhatsApp Business + Payment apps + Evening = Shop Owner",
+            "reasoning": "Multiple business-related signals converge to indicate shop owner",
+            "signals_correlated": ["business_apps", "whatsapp_business_usage", "payment_apps_installed", "time_of_day"]
+        },
+        "student_strong": {
+            "insight": "Strong correlation: Education apps + Long sessions + Long text + Low notifications = Student",
+            "reasoning": "Education-focused signals with low distractions indicate student",
+            "signals_correlated": ["education_apps", "session_duration", "text_input_length", "total_notification_volume"]
         }
     }
     
     def reason(self, signals: RawSignals, web_intelligence: Dict[str, Any], 
-               app_context: Dict[str, Any]) -> Dict[str, Any]:
+               app_context: Dict[str, Any],
+               llm_output: Optional[Dict[str, Any]] = None,
+               match: Optional[PatternMatch] = None) -> Dict[str, Any]:
         """
         Apply LLM reasoning and worldly knowledge
+        Args:
+            llm_output: Result of infer_with_llm if already fetched (e.g. concurrently)
+            match: Pattern match already computed for these signals
         """
-        insights = []
-        reasoning_steps = []
-        confidence_adjustments = {}
-        llm_inference_result = {}
-        
         # 1. Try Real LLM Inference (OpenRouter)
+        if llm_output is None:
+            llm_output = self.infer_with_llm(signals, web_intelligence, app_context)
+        
+        # 2. Apply worldly knowledge patterns (Static/Fallback)
+        knowledge = self.apply_knowledge(signals, web_intelligence, app_context, match)
+        
+        return self.combine(knowledge, llm_output)
+    
+    def _build_llm_context(self, web_intelligence: Dict[str, Any], app_context: Dict[str, Any]) -> str:
+        """Construct context from web intelligence and app context to help LLM"""
+        # Helper for JSON serialization
+        def json_serial(obj):
+            if isinstance(obj, (datetime, date)):
+                return obj.isoformat()
+            return str(obj)
+        
+        return f"Web Intelligence: {json.dumps(web_intelligence, default=json_serial)}\nApp Context: {json.dumps(app_context, default=json_serial)}"
+    
+    def infer_with_llm(self, signals: RawSignals, web_intelligence: Dict[str, Any],
+                       app_context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Real LLM inference (OpenRouter)
+        Returns the structured LLM result, or an empty dict if it failed
+        """
         try:
-            # Helper for JSON serialization
-            def json_serial(obj):
-                if isinstance(obj, (datetime, date)):
-                    return obj.isoformat()
-                return str(obj)
-
-            # Construct context from web intelligence and app context to help LLM
-            context_str = f"Web Intelligence: {json.dumps(web_intelligence, default=json_serial)}\nApp Context: {json.dumps(app_context, default=json_serial)}"
-            
+            context_str = self._build_llm_context(web_intelligence, app_context)
             llm_output = self.llm_service.infer_user_profile_with_reasoning(signals, context_str)
-            
             if "error" not in llm_output:
-                llm_inference_result = llm_output
-                insights.append(f"LLM Inference: Identified as {llm_output.get('user_need_state')}")
-                reasoning_steps.append({
-                    "step": "llm_inference",
-                    "reasoning": llm_output.get("reasoning_summary", "LLM reasoning applied"),
-                    "output": llm_output
-                })
-                # Add confidence from LLM
-                # Mapping LLM confidence (0-10) to adjustment? Or use it directly later.
+                return llm_output
         except Exception as e:
             print(f"LLM Reasoning failed: {e}")
             # Fallback to static rules if LLM fails
-
-        # 2. Apply worldly knowledge patterns (Static/Fallback)
-        knowledge_insights = self._apply_worldly_knowledge(signals, web_intelligence, app_context)
+        return {}
+    
+    async def ainfer_with_llm(self, signals: RawSignals, web_intelligence: Dict[str, Any],
+                              app_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of infer_with_llm"""
+        try:
+            context_str = self._build_llm_context(web_intelligence, app_context)
+            llm_output = await self.llm_service.ainfer_user_profile_with_reasoning(signals, context_str)
+            if "error" not in llm_output:
+                return llm_output
+        except Exception as e:
+            print(f"LLM Reasoning failed: {e}")
+        return {}
+    
+    def apply_knowledge(self, signals: RawSignals, web_intelligence: Dict[str, Any],
+                        app_context: Dict[str, Any], match: Optional[PatternMatch] = None) -> Dict[str, Any]:
+        """
+        Local reasoning that needs no LLM call: worldly knowledge,
+        cross-signal correlation and contextual inference
+        Args:
+            match: Pattern match already computed for these signals
+        """
+        insights = []
+        reasoning_steps = []
+        confidence_adjustments = {}
+        match = match_patterns(signals, match)
+        
+        knowledge_insights = self._apply_worldly_knowledge(match)
         insights.extend(knowledge_insights.get("insights", []))
         reasoning_steps.extend(knowledge_insights.get("reasoning_steps", []))
         confidence_adjustments.update(knowledge_insights.get("confidence_adjustments", {}))
         
         # Cross-signal correlation reasoning
-        correlation_insights = self._correlate_signals(signals, web_intelligence, app_context)
+        correlation_insights = self._correlate_signals(match)
         insights.extend(correlation_insights.get("insights", []))
         reasoning_steps.extend(correlation_insights.get("reasoning_steps", []))
         
@@ -111,99 +170,49 @@ class LLMReasoning:
         return {
             "insights": insights,
             "reasoning_steps": reasoning_steps,
-            "confidence_adjustments": confidence_adjustments,
-            "llm_reasoning_applied": True,
-            "llm_inference_result": llm_inference_result # Return the structured LLM result
+            "confidence_adjustments": confidence_adjustments
         }
     
-    def _apply_worldly_knowledge(self, signals: RawSignals, web_intelligence: Dict[str, Any],
-                                app_context: Dict[str, Any]) -> Dict[str, Any]:
-        """Apply worldly knowledge patterns"""
+    def combine(self, knowledge: Dict[str, Any], llm_output: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge the LLM result (first) with local knowledge into the reasoning result"""
         insights = []
         reasoning_steps = []
-        confidence_adjustments = {}
-        
-        # Indian business culture
-        if (signals.business_apps and isinstance(signals.business_apps, list) and len(signals.business_apps) > 0 and
-            signals.whatsapp_business_usage == "yes" and
-            signals.time_of_day and signals.time_of_day.value == "evening"):
-            insight = "Indian business culture: Small businesses use WhatsApp for customer communication and evening for accounting"
-            insights.append(insight)
-            reasoning_steps.append({
-                "step": "worldly_knowledge",
-                "pattern": "indian_business_culture",
-                "reasoning": insight,
-                "signals_used": ["business_apps", "whatsapp_business_usage", "time_of_day"]
-            })
-            confidence_adjustments["indian_business_culture"] = 0.4
         
-        # Indian education system
-        if (signals.education_apps and isinstance(signals.education_apps, list) and len(signals.education_apps) > 0 and
-            signals.time_of_day and signals.time_of_day.value in ["afternoon", "evening"] and
-            signals.session_duration == "long"):
-            insight = "Indian education system: Students use education apps in afternoon/evening for exam prep"
-            insights.append(insight)
+        if llm_output:
+            insights.append(f"LLM Inference: Identified as {llm_output.get('user_need_state')}")
             reasoning_steps.append({
-                "step": "worldly_knowledge",
-                "pattern": "indian_education_system",
-                "reasoning": insight,
-                "signals_used": ["education_apps", "time_of_day", "session_duration"]
+                "step": "llm_inference",
+                "reasoning": llm_output.get("reasoning_summary", "LLM reasoning applied"),
+                "output": llm_output
             })
-            confidence_adjustments["indian_education_system"] = 0.3
         
-        # Indian digital payment adoption
-        if (signals.otp_message_frequency == "high" and
-            signals.payment_apps_installed and isinstance(signals.payment_apps_installed, list) and len(signals.payment_apps_installed) >= 2 and
-            signals.banking_sms_presence == "yes"):
-            insight = "Indian digital payment adoption: High OTP frequency + multiple payment apps = active digital payment user"
-            insights.append(insight)
-            reasoning_steps.append({
-                "step": "worldly_knowledge",
-                "pattern": "indian_digital_payment_adoption",
-                "reasoning": insight,
-                "signals_used": ["otp_message_frequency", "payment_apps_installed", "banking_sms_presence"]
-            })
-            confidence_adjustments["indian_digital_payment_adoption"] = 0.5
-        
-        # Indian language preferences
-        if signals.system_language == "hi" and signals.state in ["UP", "MP", "BH", "RJ"]:
-            insight = "Indian language preferences: Hindi-dominant users in North India prefer Hindi interface"
-            insights.append(insight)
-            reasoning_steps.append({
-                "step": "worldly_knowledge",
-                "pattern": "indian_language_preferences",
-                "reasoning": insight,
-                "signals_used": ["system_language", "state"]
-            })
-            confidence_adjustments["indian_language_preferences"] = 0.4
+        insights.extend(knowledge.get("insights", []))
+        reasoning_steps.extend(knowledge.get("reasoning_steps", []))
         
-        # Indian device constraints
-        if (signals.device_class and signals.device_class.value == "low_end" and
-            signals.network_type and signals.network_type.value in ["2g", "3g"] and
-            signals.city_tier in ["tier3", "tier4", "rural"]):
-            insight = "Indian device constraints: Tier-2/3/4 users often have low-end devices and slow networks, need optimized experiences"
-            insights.append(insight)
-            reasoning_steps.append({
-                "step": "worldly_knowledge",
-                "pattern": "indian_device_constraints",
-                "reasoning": insight,
-                "signals_used": ["device_class", "network_type", "city_tier"]
-            })
-            confidence_adjustments["indian_device_constraints"] = 0.5
+        return {
+            "insights": insights,
+            "reasoning_steps": reasoning_steps,
+            "confidence_adjustments": dict(knowledge.get("confidence_adjustments", {})),
+            "llm_reasoning_applied": True,
+            "llm_inference_result": llm_output or {} # Return the structured LLM result
+        }
+    
+    def _apply_worldly_knowledge(self, match: PatternMatch) -> Dict[str, Any]:
+        """Apply worldly knowledge patterns"""
+        insights = []
+        reasoning_steps = []
+        confidence_adjustments = {}
         
-        # Indian social communication
-        if (signals.whatsapp_installed == "yes" and
-            signals.whatsapp_group_activity == "high" and
-            signals.whatsapp_notification_frequency == "high"):
-            insight = "Indian social communication: WhatsApp is primary communication tool, high group activity = social engagement"
-            insights.append(insight)
+        for pattern in match.family("knowledge"):
+            knowledge = self.WORLD_KNOWLEDGE[pattern]
+            insights.append(knowledge["reasoning"])
             reasoning_steps.append({
                 "step": "worldly_knowledge",
-                "pattern": "indian_social_communication",
-                "reasoning": insight,
-                "signals_used": ["whatsapp_installed", "whatsapp_group_activity", "whatsapp_notification_frequency"]
+                "pattern": pattern,
+                "reasoning": knowledge["reasoning"],
+                "signals_used": list(knowledge["signals_used"])
             })
-            confidence_adjustments["indian_social_communication"] = 0.3
+            confidence_adjustments[pattern] = knowledge["confidence_boost"]
         
         return {
             "insights": insights,
@@ -211,38 +220,19 @@ class LLMReasoning:
             "confidence_adjustments": confidence_adjustments
         }
     
-    def _correlate_signals(self, signals: RawSignals, web_intelligence: Dict[str, Any],
-                          app_context: Dict[str, Any]) -> Dict[str, Any]:
+    def _correlate_signals(self, match: PatternMatch) -> Dict[str, Any]:
         """Correlate multiple signals for deeper insights"""
         insights = []
         reasoning_steps = []
         
-        # Business user correlation
-        if (signals.business_apps and isinstance(signals.business_apps, list) and len(signals.business_apps) > 0 and
-            signals.whatsapp_business_usage == "yes" and
-            signals.payment_apps_installed and isinstance(signals.payment_apps_installed, list) and len(signals.payment_apps_installed) >= 2 and
-            signals.time_of_day and signals.time_of_day.value == "evening"):
-            insight = "Strong correlation: Business apps + WhatsApp Business + Payment apps + Evening = Shop Owner"
-            insights.append(insight)
-            reasoning_steps.append({
-                "step": "signal_correlation",
-                "correlation": "business_user_strong",
-                "reasoning": "Multiple business-related signals converge to indicate shop owner",
-                "signals_correlated": ["business_apps", "whatsapp_business_usage", "payment_apps_installed", "time_of_day"]
-            })
-        
-        # Student correlation
-        if (signals.education_apps and isinstance(signals.education_apps, list) and len(signals.education_apps) > 0 and
-            signals.session_duration == "long" and
-            signals.text_input_length == "long" and
-            signals.total_notification_volume == "low"):
-            insight = "Strong correlation: Education apps + Long sessions + Long text + Low notifications = Student"
-            insights.append(insight)
+        for correlation in match.family("correlation"):
+            details = self.SIGNAL_CORRELATIONS[correlation]
+            insights.append(details["insight"])
             reasoning_steps.append({
                 "step": "signal_correlation",
-                "correlation": "student_strong",
-                "reasoning": "Education-focused signals with low distractions indicate student",
-                "signals_correlated": ["education_apps", "session_duration", "text_input_length", "total_notification_volume"]
+                "correlation": correlation,
+                "reasoning": details["reasoning"],
+                "signals_correlated": list(details["signals_correlated"])
             })
         
         return {"insights": insights, "reasoning_steps": reasoning_steps}
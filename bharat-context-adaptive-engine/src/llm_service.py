@@ -5,48 +5,134 @@ Handles interactions with OpenRouter (Reasoning Models) and Perplexity (Web Inte
 
 import os
 import json
+import threading
 import httpx
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime, date
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 from .models import RawSignals, InferenceOutput, UIMode, LanguagePreference
+from .llm_cache import LLMInferenceCache, signal_fingerprint
+from .metrics import Timer, get_metrics, track_upstream, CHAT_TTFT_SECONDS
+from .upstream import UpstreamClient
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # Load environment variables from .env file
 load_dotenv()
 
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
+REASONING_MODEL = "openai/gpt-5.1"  # As requested by user
+REASONING_PROMPT_VERSION = "1"  # Bump when the reasoning prompt changes (invalidates cached results)
+CHAT_MODEL = "openai/gpt-5.1"  # or use a cheaper/faster model for chat like gpt-4o-mini or llama-3
+PERPLEXITY_MODEL = "sonar-pro"
+# Placeholders returned instead of web context (never cached)
+WEB_CONTEXT_UNAVAILABLE = "Web intelligence unavailable (API Key missing)."
+WEB_CONTEXT_ERROR_PREFIX = "Error fetching web intelligence: "
+CHAT_UNAVAILABLE = "Chat service unavailable (API Key missing)."
+
+
+class ChatUnavailableError(RuntimeError):
+    """Raised by strict chat calls when no OpenRouter client is configured"""
+
+
 class LLMService:
     def __init__(self):
         self.openrouter_key = os.getenv("OPENROUTER_API_KEY")
         self.perplexity_key = os.getenv("PERPLEXITY_API_KEY")
-        
-        # Initialize OpenRouter client if key exists
+        # Overridable to point at a proxy or a local fake (see benchmarks/fake_upstream.py)
+        self.openrouter_base_url = os.getenv("OPENROUTER_BASE_URL", OPENROUTER_BASE_URL)
+
+        # Deadlines, retries, hedging and circuit breakers for every outbound call
+        self.upstream = UpstreamClient.from_env()
+
+        # Initialize OpenRouter client if key exists (retries happen in self.upstream)
         if self.openrouter_key:
             self.openai_client = OpenAI(
-                base_url="https://openrouter.ai/api/v1",
+                base_url=self.openrouter_base_url,
                 api_key=self.openrouter_key,
+                max_retries=0,
             )
         else:
             self.openai_client = None
 
         # Perplexity client configuration
-        self.perplexity_url = "https://api.perplexity.ai/chat/completions"
+        self.perplexity_url = os.getenv("PERPLEXITY_URL", PERPLEXITY_URL)
 
-    def get_web_intelligence(self, query: str) -> str:
-        """
-        Get real-time web intelligence using Perplexity Sonar API
-        """
-        if not self.perplexity_key:
-            print("Warning: PERPLEXITY_API_KEY not set. Returning mock response.")
-            return "Web intelligence unavailable (API Key missing)."
+        # Connection pool settings for the long-lived async clients
+        self.http2 = os.getenv("LLM_HTTP2", "true").lower() == "true" and HTTP2_AVAILABLE
+        self.pool_limits = httpx.Limits(
+            max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+        )
+
+        # Created on application startup (or lazily on first call)
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.async_openai_client: Optional[AsyncOpenAI] = None
+        # Pooled client for the sync paths (used from dispatch threads)
+        self.sync_http_client: Optional[httpx.Client] = None
+        self._sync_client_lock = threading.Lock()
+
+        # Cache of reasoning results keyed on canonical signals + prompt version + model
+        self.inference_cache: Optional[LLMInferenceCache] = LLMInferenceCache.from_env()
+
+    def _new_async_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(http2=self.http2, limits=self.pool_limits)
+
+    async def startup(self):
+        """Create the pooled clients (called on FastAPI startup)"""
+        if self.http_client is None:
+            self.http_client = self._new_async_http_client()
+        self._sync_http_client()
+        if self.async_openai_client is None and self.openrouter_key:
+            self.async_openai_client = AsyncOpenAI(
+                base_url=self.openrouter_base_url,
+                api_key=self.openrouter_key,
+                http_client=self._new_async_http_client(),
+                max_retries=0,
+            )
+
+    async def shutdown(self):
+        """Close the pooled clients (called on FastAPI shutdown)"""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+        with self._sync_client_lock:
+            if self.sync_http_client is not None:
+                self.sync_http_client.close()
+                self.sync_http_client = None
+        if self.async_openai_client is not None:
+            await self.async_openai_client.close()
+            self.async_openai_client = None
+
+    def _sync_http_client(self) -> httpx.Client:
+        """Pooled sync client, created on first use when startup() was not called"""
+        with self._sync_client_lock:
+            if self.sync_http_client is None:
+                self.sync_http_client = httpx.Client(http2=self.http2, limits=self.pool_limits)
+            return self.sync_http_client
 
-        headers = {
+    async def _async_clients(self):
+        """Async clients, created on first use when startup() was not called"""
+        if self.http_client is None:
+            await self.startup()
+        return self.http_client, self.async_openai_client
+
+    def _perplexity_headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.perplexity_key}",
             "Content-Type": "application/json"
         }
-        
-        payload = {
-            "model": "sonar-pro",
+
+    def _web_intelligence_payload(self, query: str) -> Dict[str, Any]:
+        return {
+            "model": PERPLEXITY_MODEL,
             "messages": [
                 {
                     "role": "system",
@@ -59,27 +145,59 @@ class LLMService:
             ]
         }
 
+    def get_web_intelligence(self, query: str) -> str:
+        """
+        Get real-time web intelligence using Perplexity Sonar API
+        """
+        if not self.perplexity_key:
+            print("Warning: PERPLEXITY_API_KEY not set. Returning mock response.")
+            return WEB_CONTEXT_UNAVAILABLE
+
+        def attempt(timeout: float) -> httpx.Response:
+            with track_upstream("perplexity", "web_intelligence"):
+                response = self._sync_http_client().post(
+                    self.perplexity_url,
+                    json=self._web_intelligence_payload(query),
+                    headers=self._perplexity_headers(),
+                    timeout=timeout
+                )
+                response.raise_for_status()
+            return response
+
         try:
-            # Use httpx for synchronous request (can be asyncified if needed)
-            response = httpx.post(self.perplexity_url, json=payload, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
+            data = self.upstream.call("perplexity", "web_intelligence", attempt).json()
             return data["choices"][0]["message"]["content"]
         except Exception as e:
             print(f"Perplexity API Error: {e}")
-            return f"Error fetching web intelligence: {str(e)}"
+            return f"{WEB_CONTEXT_ERROR_PREFIX}{str(e)}"
 
-    def infer_user_profile_with_reasoning(self, signals: RawSignals, rules_context: str = "") -> Dict[str, Any]:
-        """
-        Use OpenRouter with reasoning to infer user profile from signals
-        """
-        if not self.openai_client:
-            return {
-                "error": "OpenRouter API Key not configured",
-                "user_need_state": "Default User",
-                "confidence": 0.0
-            }
+    async def aget_web_intelligence(self, query: str) -> str:
+        """Async version of get_web_intelligence over the pooled client"""
+        if not self.perplexity_key:
+            print("Warning: PERPLEXITY_API_KEY not set. Returning mock response.")
+            return WEB_CONTEXT_UNAVAILABLE
+
+        async def attempt(timeout: float) -> httpx.Response:
+            http_client, _ = await self._async_clients()
+            with track_upstream("perplexity", "web_intelligence"):
+                response = await http_client.post(
+                    self.perplexity_url,
+                    json=self._web_intelligence_payload(query),
+                    headers=self._perplexity_headers(),
+                    timeout=timeout
+                )
+                response.raise_for_status()
+            return response
+
+        try:
+            data = (await self.upstream.acall("perplexity", "web_intelligence", attempt)).json()
+            return data["choices"][0]["message"]["content"]
+        except Exception as e:
+            print(f"Perplexity API Error: {e}")
+            return f"{WEB_CONTEXT_ERROR_PREFIX}{str(e)}"
 
+    def _reasoning_messages(self, signals: RawSignals, rules_context: str) -> List[Dict[str, str]]:
+        """Build the OpenRouter messages for profile inference"""
         # Helper for JSON serialization
         def json_serial(obj):
             if isinstance(obj, (datetime, date)):
@@ -116,79 +234,175 @@ Here is the Signal Data for a user:
 
 Analyze this user and provide the inference.
 """
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+
+    def _reasoning_cache_key(self, signals: RawSignals) -> str:
+        return signal_fingerprint(signals, f"prompt:{REASONING_PROMPT_VERSION}", f"model:{REASONING_MODEL}")
 
+    def _cached_reasoning(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        if self.inference_cache is None:
+            return None
+        return self.inference_cache.get(cache_key)
+
+    def _store_reasoning(self, cache_key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache successful reasoning results; errors are never cached"""
+        if self.inference_cache is not None and "error" not in result:
+            self.inference_cache.set(cache_key, result)
+        return result
+
+    def _parse_reasoning_response(self, content: str) -> Dict[str, Any]:
         try:
-            # First API call with reasoning enabled
-            response = self.openai_client.chat.completions.create(
-                model="openai/gpt-5.1",  # As requested by user
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                extra_body={"reasoning": {"enabled": True}},
-                response_format={"type": "json_object"} 
-            )
-            
-            content = response.choices[0].message.content
-            try:
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError:
-                return {"error": "Failed to parse JSON response", "raw_content": content}
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return {"error": "Failed to parse JSON response", "raw_content": content}
+
+    def infer_user_profile_with_reasoning(self, signals: RawSignals, rules_context: str = "") -> Dict[str, Any]:
+        """
+        Use OpenRouter with reasoning to infer user profile from signals
+        """
+        if not self.openai_client:
+            return {
+                "error": "OpenRouter API Key not configured",
+                "user_need_state": "Default User",
+                "confidence": 0.0
+            }
+
+        cache_key = self._reasoning_cache_key(signals)
+        cached = self._cached_reasoning(cache_key)
+        if cached is not None:
+            return cached
+
+        def attempt(timeout: float):
+            # API call with reasoning enabled
+            with track_upstream("openrouter", "reasoning"):
+                return self.openai_client.chat.completions.create(
+                    model=REASONING_MODEL,
+                    messages=messages,
+                    extra_body={"reasoning": {"enabled": True}},
+                    response_format={"type": "json_object"},
+                    timeout=timeout
+                )
+
+        try:
+            messages = self._reasoning_messages(signals, rules_context)
+            response = self.upstream.call("openrouter", "reasoning", attempt)
+            return self._store_reasoning(cache_key, self._parse_reasoning_response(response.choices[0].message.content))
 
         except Exception as e:
             print(f"OpenRouter API Error: {e}")
             return {"error": str(e)}
 
-    def generate_feed_from_perplexity(self, user_need_state: str, language: str) -> List[Dict[str, Any]]:
-        """
-        Generate personalized feed items using Perplexity Sonar API
-        """
-        if not self.perplexity_key:
-            return []
+    async def ainfer_user_profile_with_reasoning(self, signals: RawSignals, rules_context: str = "") -> Dict[str, Any]:
+        """Async version of infer_user_profile_with_reasoning over the pooled client"""
+        _, async_openai_client = await self._async_clients()
+        if not async_openai_client:
+            return {
+                "error": "OpenRouter API Key not configured",
+                "user_need_state": "Default User",
+                "confidence": 0.0
+            }
+
+        cache_key = self._reasoning_cache_key(signals)
+        cached = self._cached_reasoning(cache_key)
+        if cached is not None:
+            return cached
+
+        async def attempt(timeout: float):
+            with track_upstream("openrouter", "reasoning"):
+                return await async_openai_client.chat.completions.create(
+                    model=REASONING_MODEL,
+                    messages=messages,
+                    extra_body={"reasoning": {"enabled": True}},
+                    response_format={"type": "json_object"},
+                    timeout=timeout
+                )
+
+        try:
+            messages = self._reasoning_messages(signals, rules_context)
+            response = await self.upstream.acall("openrouter", "reasoning", attempt)
+            return self._store_reasoning(cache_key, self._parse_reasoning_response(response.choices[0].message.content))
+
+        except Exception as e:
+            print(f"OpenRouter API Error: {e}")
+            return {"error": str(e)}
 
+    def _feed_payload(self, user_need_state: str, language: str) -> Dict[str, Any]:
         query = f"""
         Generate 3 specific, high-relevance news headlines or actionable tips for a user who is identified as '{user_need_state}' in India. 
         Focus on recent updates (finance, education, business, or local news depending on the persona).
         Return ONLY a JSON list of objects with these keys: 'id' (unique string), 'type' (news/insight), 'title', 'summary', 'source', 'time', 'tags' (list of strings).
         """
 
-        headers = {
-            "Authorization": f"Bearer {self.perplexity_key}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "sonar-pro",
+        return {
+            "model": PERPLEXITY_MODEL,
             "messages": [
                 {"role": "system", "content": "You are a content recommendation engine for Indian users. Output valid JSON only."},
                 {"role": "user", "content": query}
             ]
         }
 
+    def _parse_feed_content(self, content: str) -> List[Dict[str, Any]]:
+        # Clean up markdown code blocks if present
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
+
+        return json.loads(content)
+
+    def generate_feed_from_perplexity(self, user_need_state: str, language: str) -> List[Dict[str, Any]]:
+        """
+        Generate personalized feed items using Perplexity Sonar API
+        """
+        if not self.perplexity_key:
+            return []
+
+        def attempt(timeout: float) -> httpx.Response:
+            with track_upstream("perplexity", "feed"):
+                response = self._sync_http_client().post(
+                    self.perplexity_url,
+                    json=self._feed_payload(user_need_state, language),
+                    headers=self._perplexity_headers(),
+                    timeout=timeout
+                )
+                response.raise_for_status()
+            return response
+
         try:
-            response = httpx.post(self.perplexity_url, json=payload, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            content = response.json()["choices"][0]["message"]["content"]
-            
-            # Clean up markdown code blocks if present
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-                
-            return json.loads(content)
+            response = self.upstream.call("perplexity", "feed", attempt)
+            return self._parse_feed_content(response.json()["choices"][0]["message"]["content"])
         except Exception as e:
             print(f"Perplexity Feed Gen Error: {e}")
             return []
 
-    def chat_completion(self, messages: List[Dict[str, str]], context: str = "") -> str:
-        """
-        Chat with context using OpenRouter
-        """
-        if not self.openai_client:
-            return "Chat service unavailable (API Key missing)."
+    async def agenerate_feed_from_perplexity(self, user_need_state: str, language: str) -> List[Dict[str, Any]]:
+        """Async version of generate_feed_from_perplexity over the pooled client"""
+        if not self.perplexity_key:
+            return []
+
+        async def attempt(timeout: float) -> httpx.Response:
+            http_client, _ = await self._async_clients()
+            with track_upstream("perplexity", "feed"):
+                response = await http_client.post(
+                    self.perplexity_url,
+                    json=self._feed_payload(user_need_state, language),
+                    headers=self._perplexity_headers(),
+                    timeout=timeout
+                )
+                response.raise_for_status()
+            return response
+
+        try:
+            response = await self.upstream.acall("perplexity", "feed", attempt)
+            return self._parse_feed_content(response.json()["choices"][0]["message"]["content"])
+        except Exception as e:
+            print(f"Perplexity Feed Gen Error: {e}")
+            return []
 
+    def _chat_messages(self, messages: List[Dict[str, str]], context: str) -> List[Dict[str, str]]:
         system_prompt = f"""You are BharatAI, a helpful assistant for Indian users.
 Context regarding the current topic:
 {context}
@@ -196,18 +410,106 @@ Context regarding the current topic:
 Answer the user's question helpfully and concisely."""
 
         # Prepend system message
-        full_messages = [{"role": "system", "content": system_prompt}] + messages
+        return [{"role": "system", "content": system_prompt}] + messages
+
+    def chat_completion(self, messages: List[Dict[str, str]], context: str = "") -> str:
+        """
+        Chat with context using OpenRouter
+        """
+        if not self.openai_client:
+            return CHAT_UNAVAILABLE
+
+        def attempt(timeout: float):
+            with track_upstream("openrouter", "chat"):
+                return self.openai_client.chat.completions.create(
+                    model=CHAT_MODEL,
+                    messages=self._chat_messages(messages, context),
+                    timeout=timeout
+                )
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model="openai/gpt-5.1", # or use a cheaper/faster model for chat like gpt-4o-mini or llama-3
-                messages=full_messages
-            )
+            response = self.upstream.call("openrouter", "chat", attempt)
             return response.choices[0].message.content
         except Exception as e:
             print(f"Chat Completion Error: {e}")
             return f"Sorry, I encountered an error: {str(e)}"
 
+    async def achat_completion(self, messages: List[Dict[str, str]], context: str = "", strict: bool = False) -> str:
+        """
+        Async version of chat_completion over the pooled client
+        With strict=True failures raise (ChatUnavailableError without an API
+        key) instead of returning a placeholder reply.
+        """
+        _, async_openai_client = await self._async_clients()
+        if not async_openai_client:
+            if strict:
+                raise ChatUnavailableError(CHAT_UNAVAILABLE)
+            return CHAT_UNAVAILABLE
+
+        async def attempt(timeout: float):
+            with track_upstream("openrouter", "chat"):
+                return await async_openai_client.chat.completions.create(
+                    model=CHAT_MODEL,
+                    messages=self._chat_messages(messages, context),
+                    timeout=timeout
+                )
+
+        try:
+            response = await self.upstream.acall("openrouter", "chat", attempt)
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"Chat Completion Error: {e}")
+            if strict:
+                raise
+            return f"Sorry, I encountered an error: {str(e)}"
+
+    async def astream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        context: str = "",
+        strict: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Streaming version of achat_completion: yields content deltas as
+        OpenRouter produces them and records time-to-first-token
+        Raises:
+            Upstream errors (the caller reports them; partial text may have been yielded)
+            ChatUnavailableError without an API key when strict (otherwise a placeholder is yielded)
+        """
+        _, async_openai_client = await self._async_clients()
+        if not async_openai_client:
+            if strict:
+                raise ChatUnavailableError(CHAT_UNAVAILABLE)
+            yield CHAT_UNAVAILABLE
+            return
+
+        def attempt(timeout: float):
+            return async_openai_client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=self._chat_messages(messages, context),
+                stream=True,
+                timeout=timeout
+            )
+
+        timer = Timer()
+        first_token = True
+        with track_upstream("openrouter", "chat_stream"):
+            # Only opening the stream is retried; the timeout also bounds gaps between chunks
+            stream = await self.upstream.acall("openrouter", "chat_stream", attempt)
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if not content:
+                        continue
+                    if first_token:
+                        get_metrics().observe(CHAT_TTFT_SECONDS, timer.duration_ms / 1000, model=CHAT_MODEL)
+                        first_token = False
+                    yield content
+            finally:
+                await stream.close()
+
 # Singleton instance
 _llm_service = None
 
@@ -216,4 +518,3 @@ def get_llm_service():
     if _llm_service is None:
         _llm_service = LLMService()
     return _llm_service
-
@@ -3,13 +3,53 @@ Bharat Context-Adaptive Engine - FastAPI Application
 Main entry point for the inference service
 """
 
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
 
 from .router_inference import router as inference_router
-from .router_recommendations import router as recommendations_router
+from .router_recommendations import router as recommendations_router, warm_recommendations
+from .llm_service import get_llm_service
+from .inference_engine_enhanced import get_enhanced_inference_engine
+from .web_context_cache import likely_web_context_keys
+from .rules_watcher import get_rules_watcher
+from .batch_pool import get_batch_pool
+from .dispatch import shutdown_dispatcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown"""
+    # Long-lived pooled HTTP clients for OpenRouter and Perplexity
+    llm_service = get_llm_service()
+    await llm_service.startup()
+    # Scheduled stale-while-revalidate refresh of persona feeds
+    enhanced_engine = get_enhanced_inference_engine()
+    feed_cache = enhanced_engine.feed_cache
+    feed_cache.start()
+    # Web context preloaded for the rules' pattern sets, then kept warm
+    web_context_cache = enhanced_engine.web_intelligence.web_context_cache
+    if enhanced_engine.use_web_context:
+        web_context_cache.start(likely_web_context_keys(
+            enhanced_engine.rules, int(os.getenv("WEB_CONTEXT_PRELOAD_MAX", "32"))
+        ))
+    # Hot reload of rules.yaml
+    rules_watcher = get_rules_watcher()
+    rules_watcher.start()
+    # Precomputed Day-0/1/7 recommendation table
+    warm_recommendations()
+    yield
+    # Worker processes for batch scoring (BATCH_WORKERS), spawned on the first batch
+    get_batch_pool().shutdown()
+    shutdown_dispatcher()
+    await rules_watcher.stop()
+    await feed_cache.stop()
+    await web_context_cache.stop()
+    enhanced_engine.explanations.close()
+    await llm_service.shutdown()
 
 
 # Initialize FastAPI app
@@ -18,7 +58,8 @@ app = FastAPI(
     description="Inference Engine for Day-0 Cold Start Problem - Tier-2/3/4 Indian Users",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware for cross-origin requests
@@ -45,6 +86,7 @@ async def root():
         "endpoints": {
             "inference": "/v1/infer",
             "health": "/v1/health",
+            "metrics": "/v1/metrics",
             "rules": "/v1/rules",
             "recommendations": "/v1/recommendations/generate",
             "docs": "/docs"
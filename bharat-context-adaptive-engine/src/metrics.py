@@ -0,0 +1,263 @@
+"""
+Metrics for Bharat Context-Adaptive Engine
+Stage and upstream-call latency tracking with rolling quantiles and Prometheus export
+"""
+
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Awaitable, Callable
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Metric names
+INFERENCE_SECONDS = "bharat_inference_seconds"
+STAGE_SECONDS = "bharat_inference_stage_seconds"
+UPSTREAM_SECONDS = "bharat_upstream_request_seconds"
+DISPATCH_WAIT_SECONDS = "bharat_dispatch_wait_seconds"
+DISPATCH_QUEUE_DEPTH = "bharat_dispatch_queue_depth"
+DISPATCH_ACTIVE = "bharat_dispatch_active"
+DISPATCH_REJECTED = "bharat_dispatch_rejected_total"
+CHAT_TTFT_SECONDS = "bharat_chat_time_to_first_token_seconds"
+UPSTREAM_RETRIES = "bharat_upstream_retries_total"
+UPSTREAM_HEDGED = "bharat_upstream_hedged_total"
+UPSTREAM_SHORT_CIRCUITED = "bharat_upstream_short_circuited_total"
+UPSTREAM_CIRCUIT_STATE = "bharat_upstream_circuit_state"
+
+METRIC_HELP = {
+    INFERENCE_SECONDS: "End-to-end enhanced inference latency",
+    STAGE_SECONDS: "Enhanced inference pipeline stage latency",
+    UPSTREAM_SECONDS: "Outbound OpenRouter/Perplexity request latency",
+    DISPATCH_WAIT_SECONDS: "Time blocking calls waited for a dispatch thread",
+    DISPATCH_QUEUE_DEPTH: "Blocking calls waiting for a dispatch thread",
+    DISPATCH_ACTIVE: "Blocking calls running on dispatch threads",
+    DISPATCH_REJECTED: "Blocking calls rejected because the dispatch pool was saturated",
+    CHAT_TTFT_SECONDS: "Time from a streamed chat request to its first token",
+    UPSTREAM_RETRIES: "Upstream request attempts after the first",
+    UPSTREAM_HEDGED: "Hedged second requests sent after the p95 delay",
+    UPSTREAM_SHORT_CIRCUITED: "Upstream calls refused because the circuit breaker was open",
+    UPSTREAM_CIRCUIT_STATE: "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open)",
+}
+
+
+class RollingHistogram:
+    """Latency samples over a sliding window plus lifetime count and sum"""
+
+    def __init__(self, window: int = 1024):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.samples.append(value)
+            self.count += 1
+            self.sum += value
+
+    def quantiles(self, quantiles: Tuple[float, ...] = QUANTILES) -> Dict[float, float]:
+        """Nearest-rank quantiles over the window (empty dict if no samples)"""
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return {}
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(q * len(ordered)))] for q in quantiles}
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Named rolling histograms keyed by label sets"""
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._histograms: Dict[str, Dict[LabelKey, RollingHistogram]] = {}
+        # name -> (type, {labels: callback}) for values read at export time
+        self._gauges: Dict[str, Tuple[str, Dict[LabelKey, Callable[[], float]]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _label_key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def histogram(self, name: str, **labels) -> RollingHistogram:
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = RollingHistogram(self.window)
+            return histogram
+
+    def observe(self, name: str, seconds: float, **labels):
+        self.histogram(name, **labels).observe(seconds)
+
+    def quantile(self, name: str, q: float, **labels) -> Optional[float]:
+        """Rolling quantile in seconds, or None without samples"""
+        series = self._histograms.get(name, {})
+        histogram = series.get(self._label_key(labels))
+        if histogram is None:
+            return None
+        return histogram.quantiles((q,)).get(q)
+
+    def gauge(self, name: str, callback: Callable[[], float], kind: str = "gauge", **labels):
+        """
+        Register a value read when metrics are exported
+        Args:
+            callback: Returns the current value
+            kind: Prometheus type ("gauge" or "counter")
+        """
+        with self._lock:
+            self._gauges.setdefault(name, (kind, {}))[1][self._label_key(labels)] = callback
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator["Timer"]:
+        """Time a block and record it under name/labels"""
+        timer = Timer()
+        try:
+            yield timer
+        finally:
+            timer.stop()
+            self.observe(name, timer.seconds, **labels)
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """JSON-friendly view: count, sum and quantiles per series"""
+        with self._lock:
+            items = [(name, list(series.items())) for name, series in self._histograms.items()]
+            gauges = [(name, list(series.items())) for name, (_, series) in self._gauges.items()]
+        snapshot = {
+            name: [
+                {
+                    "labels": dict(key),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "quantiles": {str(q): v for q, v in histogram.quantiles().items()}
+                }
+                for key, histogram in series
+            ]
+            for name, series in items
+        }
+        for name, series in gauges:
+            snapshot[name] = [{"labels": dict(key), "value": callback()} for key, callback in series]
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (histograms as summaries)"""
+        lines = []
+        with self._lock:
+            items = sorted((name, list(series.items())) for name, series in self._histograms.items())
+        for name, series in items:
+            if name in METRIC_HELP:
+                lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+            lines.append(f"# TYPE {name} summary")
+            for key, histogram in series:
+                for q, value in histogram.quantiles().items():
+                    lines.append(f"{name}{_format_labels(key + (('quantile', str(q)),))} {value:.6f}")
+                lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        with self._lock:
+            gauges = sorted((name, kind, list(series.items())) for name, (kind, series) in self._gauges.items())
+        for name, kind, series in gauges:
+            if name in METRIC_HELP:
+                lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, callback in series:
+                lines.append(f"{name}{_format_labels(key)} {callback()}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    pairs = []
+    for name, value in key:
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Timer:
+    """High-resolution wall-clock timer"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds: Optional[float] = None
+
+    def stop(self) -> float:
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self.started
+        return self.seconds
+
+    @property
+    def duration_ms(self) -> float:
+        seconds = self.seconds if self.seconds is not None else time.perf_counter() - self.started
+        return seconds * 1000
+
+
+async def timed(awaitable: Awaitable[Any]) -> Tuple[Any, float]:
+    """Await and return (result, duration_ms)"""
+    timer = Timer()
+    result = await awaitable
+    timer.stop()
+    return result, timer.duration_ms
+
+
+# Upstream calls made while handling the current inference (see collect_upstream_calls)
+_upstream_calls: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("upstream_calls", default=None)
+
+
+@contextmanager
+def collect_upstream_calls() -> Iterator[List[Dict[str, Any]]]:
+    """Collect track_upstream records for calls made in this context (and tasks it spawns)"""
+    calls: List[Dict[str, Any]] = []
+    token = _upstream_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _upstream_calls.reset(token)
+
+
+@contextmanager
+def track_upstream(service: str, call: str) -> Iterator[None]:
+    """Time one outbound HTTP call into the upstream histogram"""
+    timer = Timer()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        timer.stop()
+        get_metrics().observe(UPSTREAM_SECONDS, timer.seconds, service=service, call=call, outcome=outcome)
+        calls = _upstream_calls.get()
+        if calls is not None:
+            calls.append({
+                "service": service,
+                "call": call,
+                "outcome": outcome,
+                "duration_ms": round(timer.duration_ms, 3)
+            })
+
+
+# Singleton instance
+_metrics_instance: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get or create the process-wide metrics registry"""
+    global _metrics_instance
+
+    if _metrics_instance is None:
+        _metrics_instance = MetricsRegistry()
+
+    return _metrics_instance
@@ -309,6 +309,9 @@ class InferenceOutput(BaseModel):
     matched_rule: Optional[str] = Field(None, description="Name of the matched rule")
     matched_signals: Optional[List[str]] = Field(None, description="Signals that contributed to inference")
     signal_count: Optional[int] = Field(None, description="Number of signals used")
+    applied_tiers: Optional[List[str]] = Field(None, description="Pipeline tiers applied (rules, enhanced, llm, web_context, feed)")
+    dropped_tiers: Optional[List[str]] = Field(None, description="Tiers skipped or cancelled to meet the latency budget")
+    ruleset_version: Optional[str] = Field(None, description="Version hash of the rules.yaml used")
     inference_timestamp: datetime = Field(default_factory=datetime.now)
 
 
@@ -339,5 +342,12 @@ class HealthCheck(BaseModel):
     version: str = Field(..., description="API version")
     rules_loaded: bool = Field(..., description="Whether rules are loaded")
     rules_count: Optional[int] = Field(None, description="Number of rules loaded")
+    ruleset_version: Optional[str] = Field(None, description="Version hash of the active rules.yaml")
+    explanation_store: Optional[Dict[str, Any]] = Field(None, description="Explanation store eviction/spill stats")
+    dispatch: Optional[Dict[str, Any]] = Field(None, description="Blocking-call thread pool load")
+    chat_sessions: Optional[Dict[str, Any]] = Field(None, description="Server-side chat session counts")
+    web_context_cache: Optional[Dict[str, Any]] = Field(None, description="Web context cache hit/miss/preload counts")
+    coalescing: Optional[Dict[str, Any]] = Field(None, description="Requests served by an identical in-flight inference")
+    upstreams: Optional[Dict[str, Any]] = Field(None, description="Circuit breaker state per upstream")
     timestamp: datetime = Field(default_factory=datetime.now)
 
@@ -3,13 +3,26 @@ Recommendation Engine for Bharat Context-Adaptive Engine
 Generates personalized content, delivery medium, and timing recommendations
 """
 
-from typing import Dict, List, Any, Optional
+import os
+import copy
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Iterable
 from datetime import datetime, timedelta
 from .models import InferenceOutput, UIMode, LanguagePreference
+from .responses import dumps
 
 
 class RecommendationEngine:
-    """Generates personalized content recommendations based on inference output"""
+    """
+    Generates personalized content recommendations based on inference output
+    
+    A day's recommendations only depend on a few fields of the inference
+    output (see _table_key), so they are built once per key and kept in a
+    table together with their JSON encoding; confidence is the only field
+    filled in per call. The JSON path splices the cached bytes directly;
+    generate_recommendations() returns a deep copy, so callers may mutate
+    the result without touching the table.
+    """
     
     # Content templates by user need state
     CONTENT_TEMPLATES = {
@@ -174,6 +187,102 @@ class RecommendationEngine:
         }
     }
     
+    def __init__(self, max_entries: Optional[int] = None):
+        if max_entries is None:
+            max_entries = int(os.getenv("RECOMMENDATION_TABLE_SIZE", "4096"))
+        self.max_entries = max_entries
+        self._table: Dict[Tuple, Tuple[Dict[str, Any], bytes]] = {}
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def _table_key(self, inference_output: InferenceOutput, day: int) -> Tuple:
+        """
+        The inference fields a day's recommendations depend on
+        
+        Recommended actions are only part of the key when the state's
+        templates fall back to them, and confidence only through the Day-0
+        personalization level.
+        """
+        user_need_state = inference_output.user_need_state
+        templates = self.CONTENT_TEMPLATES.get(user_need_state, {})
+        actions = tuple(inference_output.recommended_actions)
+        
+        if day == 0:
+            home_page = templates.get("day_0", {}).get("home_page", {})
+            uses_actions = "quick_actions" not in home_page or "example_prompts" not in home_page
+            return (
+                0, user_need_state,
+                inference_output.language_preference, inference_output.ui_mode,
+                actions if uses_actions else None,
+                inference_output.confidence >= 7.0
+            )
+        elif day == 1:
+            return (1, user_need_state)
+        elif day == 7:
+            uses_actions = not templates.get("day_7", {}).get("feature_suggestions")
+            return (7, user_need_state, actions if uses_actions else None)
+        else:
+            return ("ongoing", inference_output.language_preference, inference_output.ui_mode, actions)
+    
+    def _lookup(self, inference_output: InferenceOutput, day: int) -> Tuple[Dict[str, Any], bytes]:
+        """Table entry for this output and day, built on first use"""
+        key = self._table_key(inference_output, day)
+        with self._lock:
+            entry = self._table.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            self.misses += 1
+        
+        recommendations = self._build_recommendations(inference_output, day)
+        recommendations.pop("confidence")
+        # Encoded without the closing brace so confidence can be appended
+        fragment = dumps(recommendations)[:-1]
+        entry = (recommendations, fragment)
+        with self._lock:
+            if len(self._table) >= self.max_entries:
+                self._table.pop(next(iter(self._table)), None)
+            self._table[key] = entry
+        return entry
+    
+    def warm(self, profiles: Iterable[Tuple[str, List[str], UIMode]], days: Iterable[int] = (0, 1, 7)) -> int:
+        """
+        Precompute the table for the given (user_need_state, recommended_actions,
+        ui_mode) profiles in every language and confidence band
+        Returns:
+            Number of table entries
+        """
+        days = tuple(days)
+        for user_need_state, actions, ui_mode in profiles:
+            for language_preference in LanguagePreference:
+                for confidence in (0.0, 7.0):
+                    inference_output = InferenceOutput.model_construct(
+                        user_need_state=user_need_state,
+                        confidence=confidence,
+                        recommended_actions=list(actions),
+                        ui_mode=ui_mode,
+                        language_preference=language_preference
+                    )
+                    for day in days:
+                        self._lookup(inference_output, day)
+        return len(self._table)
+    
+    def generate_recommendations_json(self, inference_output: InferenceOutput, day: int = 0) -> bytes:
+        """Same as generate_recommendations, encoded as a JSON object"""
+        _, fragment = self._lookup(inference_output, day)
+        return fragment + b',"confidence":' + dumps(inference_output.confidence) + b"}"
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._table),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+    
     def generate_recommendations(
         self,
         inference_output: InferenceOutput,
@@ -191,6 +300,16 @@ class RecommendationEngine:
         Returns:
             Dictionary with content, delivery medium, and timing recommendations
         """
+        recommendations, _ = self._lookup(inference_output, day)
+        return {**copy.deepcopy(recommendations), "confidence": inference_output.confidence}
+    
+    def _build_recommendations(
+        self,
+        inference_output: InferenceOutput,
+        day: int = 0,
+        available_content: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Build recommendations from the templates (uncached)"""
         user_need_state = inference_output.user_need_state
         ui_mode = inference_output.ui_mode
         language_preference = inference_output.language_preference
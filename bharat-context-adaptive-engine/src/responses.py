@@ -0,0 +1,61 @@
+"""
+Responses for Bharat Context-Adaptive Engine
+Fast JSON encoding for the hot inference and recommendation endpoints
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """Types the encoders do not handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact UTF-8 JSON
+
+    Pydantic models are encoded by their compiled serializer; everything
+    else by orjson (datetimes, enums and numpy values included), or the
+    standard library when orjson is not installed.
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with dumps()
+
+    Return it from a route (instead of a model or dict) to also skip
+    FastAPI's response-model validation and jsonable_encoder pass, which
+    walk the whole payload in Python; response_model still documents the
+    shape in OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
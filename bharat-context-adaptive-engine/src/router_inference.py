@@ -3,87 +3,245 @@ FastAPI router for inference endpoints
 """
 
 import time
-from typing import Dict, Any, Optional, List
-from fastapi import APIRouter, HTTPException, status, Query, Body
-from fastapi.responses import JSONResponse
+from typing import Dict, Any, Optional, List, AsyncIterator
+from fastapi import APIRouter, HTTPException, status, Query, Body, Header, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 
-from .models import InferenceRequest, InferenceResponse, HealthCheck
+from .models import InferenceResponse, HealthCheck
 from .inference_engine import get_inference_engine, InferenceEngine
 from .inference_engine_enhanced import get_enhanced_inference_engine, EnhancedInferenceEngine
+from .batch_scoring import get_batch_scorer
+from .batch_pool import get_batch_pool, BatchRowsInvalid
 from .explanation_models import InferenceExplanation
+from .llm_service import get_llm_service, ChatUnavailableError
+from .chat_sessions import ChatSession, get_chat_session_store
+from .metrics import Timer, get_metrics
+from .dispatch import get_dispatcher, run_blocking
+from .latency_budget import LatencyBudget
+from .rules_watcher import get_rules_watcher
+from .sparse_signals import SparseInferenceRequest
+from .streaming import DuplexStreamingResponse
+from .responses import FastJSONResponse, dumps
+from .bulk_scoring import (
+    get_bulk_scorer, ascore_bulk, aiter_ndjson_rows, aread_arrow_body, iter_arrow_rows, NDJSONEncoder, ArrowEncoder,
+    BulkInputTooLarge, ARROW_AVAILABLE, ARROW_MEDIA_TYPE, NDJSON_MEDIA_TYPE, DEFAULT_CHUNK_SIZE
+)
 
 
 router = APIRouter(prefix="/v1", tags=["inference"])
 
 
-@router.post("/chat")
-async def chat_with_context(
-    messages: List[Dict[str, str]] = Body(..., description="Chat history"),
-    context: str = Body("", description="Context for the chat")
-) -> Dict[str, Any]:
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+async def _chat_events(
+    messages: List[Dict[str, str]],
+    context: str,
+    session: Optional[ChatSession] = None,
+    message: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Chat with the AI assistant using specific context
+    Chat stream as events: {"type": "token", "content"} per delta, then
+    {"type": "done", "response", ttft_ms, duration_ms} or {"type": "error", "error"}
+
+    With a session, the user message and the finished reply are added to
+    its history only once the reply is done (a failed reply leaves the
+    history untouched), and both final events carry the session_id.
     """
+    extra = {"session_id": session.session_id} if session is not None else {}
+    service = get_llm_service()
+    timer = Timer()
+    ttft_ms = None
+    parts = []
     try:
-        service = get_llm_service()
-        response = service.chat_completion(messages, context)
-        return {
-            "success": True,
-            "response": response
-        }
+        async for content in service.astream_chat_completion(messages, context, strict=session is not None):
+            if ttft_ms is None:
+                ttft_ms = timer.duration_ms
+            parts.append(content)
+            yield {"type": "token", "content": content}
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+        yield {"type": "error", "success": False, "error": str(e), "partial_response": "".join(parts), **extra}
+        return
+    response = "".join(parts)
+    if session is not None:
+        _record_exchange(session, message, response)
+    yield {
+        "type": "done",
+        "success": True,
+        "response": response,
+        "ttft_ms": ttft_ms,
+        "duration_ms": timer.duration_ms,
+        **extra
+    }
 
-@router.post("/chat")
-async def chat_with_context(
-    messages: List[Dict[str, str]] = Body(..., description="Chat history"),
-    context: str = Body("", description="Context for the chat")
-) -> Dict[str, Any]:
+
+def _sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async def encode():
+        async for event in events:
+            yield b"event: " + event["type"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+    return encode()
+
+
+def _ndjson(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async def encode():
+        async for event in events:
+            yield dumps(event) + b"\n"
+    return encode()
+
+
+def _chat_session(
+    session_id: Optional[str],
+    messages: Optional[List[Dict[str, str]]],
+    context: str,
+    context_ref: Optional[str]
+) -> ChatSession:
     """
-    Chat with the AI assistant using specific context
+    Continue a session, or start one grounded in context / context_ref
+    The new user message is not stored yet (see _record_exchange).
     """
-    try:
-        service = get_llm_service()
-        response = service.chat_completion(messages, context)
-        return {
-            "success": True,
-            "response": response
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    store = get_chat_session_store()
+    if session_id:
+        session = store.get(session_id)
+        if session is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Chat session {session_id} not found or expired"
+            )
+    else:
+        if context_ref:
+            item = get_enhanced_inference_engine().feed_cache.find_item(context_ref)
+            if item is not None:
+                context = (
+                    f'Context: User is asking about "{item.get("title", "")}". '
+                    f'Summary: {item.get("summary", "")}. Source: {item.get("source", "BharatAI")}.'
+                )
+        session = store.create(context, context_ref, messages)
+    return session
+
+
+def _record_exchange(session: ChatSession, message: str, response: str):
+    """Add a user message and its successful reply to the session history"""
+    store = get_chat_session_store()
+    store.append(session, "user", message)
+    store.append(session, "assistant", response)
+
+
+def _chat_error_status(error: Exception) -> int:
+    if isinstance(error, ChatUnavailableError):
+        return status.HTTP_503_SERVICE_UNAVAILABLE
+    return status.HTTP_502_BAD_GATEWAY
+
 
 @router.post("/chat")
 async def chat_with_context(
-    messages: List[Dict[str, str]] = Body(..., description="Chat history"),
-    context: str = Body("", description="Context for the chat")
-) -> Dict[str, Any]:
+    messages: Optional[List[Dict[str, str]]] = Body(None, description="Chat history"),
+    context: str = Body("", description="Context for the chat"),
+    message: Optional[str] = Body(None, description="New user message, for server-side sessions"),
+    session_id: Optional[str] = Body(None, description="Chat session to continue"),
+    context_ref: Optional[str] = Body(None, description="Feed item id to ground a new session in"),
+    stream: bool = Body(False, description="Stream the reply token by token"),
+    accept: Optional[str] = Header(None)
+):
     """
     Chat with the AI assistant using specific context
+    
+    Send either the whole history as messages (stateless), or only the new
+    message: without session_id a server-side session is started (seeded
+    with messages, if given, and grounded in context or the cached feed
+    item context_ref), and its session_id is returned; later turns send
+    session_id and message only. Unknown or expired sessions get a 404.
+    
+    With stream=true (or Accept: text/event-stream) the reply is sent as
+    Server-Sent Events while OpenRouter generates it: a "token" event per
+    content delta, then one "done" event with the full response, ttft_ms
+    and duration_ms, or an "error" event. Accept: application/x-ndjson
+    streams the same events as JSON lines. Otherwise the whole reply is
+    returned as {"success", "response"}.
+    
+    In a session a turn is stored only when its reply succeeds; a failed
+    reply gets a 502 (503 without an API key) with {"success": false,
+    "error", "session_id"}, or an "error" event when streaming, and the
+    message can simply be sent again.
     """
+    session = None
+    if message is not None:
+        session = _chat_session(session_id, messages, context, context_ref)
+        messages = session.messages + [{"role": "user", "content": message}]
+        context = session.prompt_context()
+    elif messages is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Either messages or message is required"
+        )
+    headers = {"X-Chat-Session-Id": session.session_id} if session is not None else {}
+    
+    accept = accept or ""
+    if NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(_ndjson(_chat_events(list(messages), context, session, message)),
+                                 media_type=NDJSON_MEDIA_TYPE,
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **headers})
+    if stream or SSE_MEDIA_TYPE in accept:
+        return StreamingResponse(_sse(_chat_events(list(messages), context, session, message)),
+                                 media_type=SSE_MEDIA_TYPE,
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **headers})
+    
+    if session is None:
+        try:
+            service = get_llm_service()
+            response = await service.achat_completion(list(messages), context)
+            return {
+                "success": True,
+                "response": response
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
     try:
-        service = get_llm_service()
-        response = service.chat_completion(messages, context)
-        return {
-            "success": True,
-            "response": response
-        }
+        response = await get_llm_service().achat_completion(list(messages), context, strict=True)
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+        return JSONResponse(
+            {"success": False, "error": str(e), "session_id": session.session_id},
+            status_code=_chat_error_status(e),
+            headers=headers
+        )
+    _record_exchange(session, message, response)
+    return JSONResponse({"success": True, "response": response, "session_id": session.session_id}, headers=headers)
+
+
+@router.get("/chat/sessions/{session_id}")
+async def get_chat_session(session_id: str):
+    """History, summary and token count of a live chat session"""
+    session = get_chat_session_store().get(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Chat session {session_id} not found or expired"
+        )
+    return session.to_dict()
+
+
+@router.delete("/chat/sessions/{session_id}")
+async def delete_chat_session(session_id: str):
+    """End a chat session"""
+    if not get_chat_session_store().delete(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Chat session {session_id} not found or expired"
+        )
+    return {"success": True, "session_id": session_id}
+
 
 @router.post("/infer", response_model=InferenceResponse)
 async def infer_user_need_state(
-    request: InferenceRequest, 
-    enhanced: bool = Query(True, description="Use enhanced inference engine with web intelligence, app context, and LLM reasoning")
-) -> InferenceResponse:
+    request: SparseInferenceRequest, 
+    enhanced: bool = Query(True, description="Use enhanced inference engine with web intelligence, app context, and LLM reasoning"),
+    x_latency_budget_ms: Optional[float] = Header(None, gt=0, description="Latency budget; enhanced tiers that do not fit are dropped")
+) -> FastJSONResponse:
     """
     Infer user need state from implicit signals
     
@@ -102,8 +260,12 @@ async def infer_user_need_state(
     - Detailed explanation logging
     
     Args:
-        request: InferenceRequest containing raw signals
+        request: InferenceRequest containing raw signals (only the signals
+            present are validated; see SparseSignals)
         enhanced: Use enhanced inference engine (default: True)
+        x_latency_budget_ms: X-Latency-Budget-Ms header. Drops the feed, web
+            context, LLM override and enhanced reasoning (in that order) until
+            the pipeline fits; data.applied_tiers/dropped_tiers report the result
         
     Returns:
         InferenceResponse with inference results
@@ -120,16 +282,15 @@ async def infer_user_need_state(
         # Extract signals from request
         signals = request.signals
         
-        # Run inference
-        inference_output = engine.infer(signals)
-        
-        # Get inference ID if enhanced engine
+        # Run inference (enhanced engine awaits its upstream calls concurrently)
         inference_id = None
-        if enhanced and hasattr(engine, 'explanations'):
-            # Find the most recent explanation
-            if engine.explanations:
-                inference_id = max(engine.explanations.keys(), 
-                                 key=lambda k: engine.explanations[k].timestamp)
+        if enhanced:
+            budget = LatencyBudget(x_latency_budget_ms) if x_latency_budget_ms else None
+            result = await engine.ainfer_with_explanation(signals, budget)
+            inference_output = result.output
+            inference_id = result.inference_id
+        else:
+            inference_output = await run_blocking(engine.infer, signals)
         
         # Calculate processing time
         processing_time_ms = (time.time() - start_time) * 1000
@@ -138,22 +299,24 @@ async def infer_user_need_state(
         if inference_id:
             inference_output.explanation += f"\n\n[Inference ID: {inference_id}]"
         
-        return InferenceResponse(
+        return FastJSONResponse(InferenceResponse(
             success=True,
             data=inference_output,
             error=None,
             processing_time_ms=processing_time_ms
-        )
+        ))
     
+    except HTTPException:
+        raise
     except Exception as e:
         processing_time_ms = (time.time() - start_time) * 1000
         
-        return InferenceResponse(
+        return FastJSONResponse(InferenceResponse(
             success=False,
             data=None,
             error=str(e),
             processing_time_ms=processing_time_ms
-        )
+        ))
 
 
 @router.get("/health", response_model=HealthCheck)
@@ -165,12 +328,20 @@ async def health_check() -> HealthCheck:
     """
     try:
         engine = get_inference_engine()
+        enhanced_engine = get_enhanced_inference_engine()
         
         return HealthCheck(
             status="healthy",
             version="1.0.0",
             rules_loaded=True,
-            rules_count=len(engine.rules)
+            rules_count=len(engine.rules),
+            ruleset_version=engine.ruleset_version,
+            explanation_store=enhanced_engine.explanations.stats(),
+            dispatch=get_dispatcher().stats(),
+            chat_sessions=get_chat_session_store().stats(),
+            web_context_cache=enhanced_engine.web_intelligence.web_context_cache.stats(),
+            coalescing=enhanced_engine.coalescing_stats(),
+            upstreams=get_llm_service().upstream.stats()
         )
     
     except Exception as e:
@@ -182,6 +353,20 @@ async def health_check() -> HealthCheck:
         )
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Latency metrics in Prometheus text format
+    
+    Rolling p50/p95/p99 per enhanced pipeline stage, per outbound
+    OpenRouter/Perplexity call and end to end
+    """
+    return PlainTextResponse(
+        get_metrics().render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @router.get("/rules")
 async def list_rules() -> Dict[str, Any]:
     """
@@ -203,6 +388,7 @@ async def list_rules() -> Dict[str, Any]:
         
         return {
             "total_rules": len(engine.rules),
+            "ruleset_version": engine.ruleset_version,
             "rules": rules_info,
             "scoring_method": engine.scoring_config.get("method", "weighted_sum"),
             "default_rule": engine.default_rule.get("user_need_state", "Unknown")
@@ -215,6 +401,41 @@ async def list_rules() -> Dict[str, Any]:
         )
 
 
+@router.post("/rules/reload")
+async def reload_rules(
+    force: bool = Query(False, description="Rebuild even if rules.yaml is unchanged"),
+    x_rules_reload_token: Optional[str] = Header(None, description="Must match RULES_RELOAD_TOKEN")
+) -> Dict[str, Any]:
+    """
+    Reload rules.yaml
+    
+    The new file is validated and compiled off the event loop, then swapped
+    in atomically; in-flight requests finish on the previous version. An
+    invalid file is rejected and the current rules stay active.
+    
+    Disabled (403) unless RULES_RELOAD_TOKEN is set; the X-Rules-Reload-Token
+    header must match it (401 otherwise).
+    """
+    watcher = get_rules_watcher()
+    if not watcher.reload_token:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Rules reload over HTTP is disabled; set RULES_RELOAD_TOKEN to enable it"
+        )
+    if not watcher.authorize(x_rules_reload_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing X-Rules-Reload-Token"
+        )
+    result = await run_blocking(watcher.reload, force)
+    if result["error"]:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Rules not reloaded: {result['error']}"
+        )
+    return {"success": True, **result, "watcher": watcher.stats()}
+
+
 @router.get("/infer/explanation/{inference_id}")
 async def get_inference_explanation(inference_id: str) -> Dict[str, Any]:
     """
@@ -230,7 +451,8 @@ async def get_inference_explanation(inference_id: str) -> Dict[str, Any]:
     """
     try:
         engine = get_enhanced_inference_engine()
-        explanation = engine.get_explanation(inference_id)
+        # May read the on-disk spill
+        explanation = await run_blocking(engine.get_explanation, inference_id)
         
         if not explanation:
             return {
@@ -245,6 +467,8 @@ async def get_inference_explanation(inference_id: str) -> Dict[str, Any]:
             "human_readable": explanation.generate_human_readable()
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         return {
             "success": False,
@@ -263,7 +487,7 @@ async def log_inference_explanation(inference_id: str, file_path: Optional[str]
     """
     try:
         engine = get_enhanced_inference_engine()
-        engine.log_explanation(inference_id, file_path)
+        await run_blocking(engine.log_explanation, inference_id, file_path)
         
         return {
             "success": True,
@@ -271,6 +495,8 @@ async def log_inference_explanation(inference_id: str, file_path: Optional[str]
             "file_path": file_path or f"explanations/{inference_id}.log"
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         return {
             "success": False,
@@ -278,49 +504,201 @@ async def log_inference_explanation(inference_id: str, file_path: Optional[str]
         }
 
 
-@router.post("/infer/batch")
-async def infer_batch(requests: list[InferenceRequest]) -> Dict[str, Any]:
+async def _read_batch_json(request: Request) -> List[Any]:
+    """
+    Parse a JSON array body (422 if it is not one, like a typed body)
+    The rows themselves are validated while they are scored (see BatchPool).
+    """
+    try:
+        return _batch_adapter.validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body",) + tuple(error["loc"])} for error in e.errors()])
+
+
+def _invalid_rows_error(error: BatchRowsInvalid, offset: int) -> RequestValidationError:
+    """422 for the invalid rows of a JSON batch chunk starting at row offset"""
+    return RequestValidationError([
+        {**detail, "loc": ("body", offset + detail["loc"][0]) + tuple(detail["loc"][1:])}
+        for detail in error.errors
+    ])
+
+
+async def _list_chunks(rows: List[Any], chunk_size: int) -> AsyncIterator[List[Any]]:
+    for offset in range(0, len(rows), chunk_size):
+        yield rows[offset:offset + chunk_size]
+
+
+async def _ndjson_chunks(request: Request, chunk_size: int) -> AsyncIterator[List[Any]]:
+    """Rows of an NDJSON body, read as a stream and grouped into chunks"""
+    chunk = []
+    async for row in aiter_ndjson_rows(request.stream()):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+_batch_adapter = TypeAdapter(List[Any])
+
+
+@router.post(
+    "/infer/batch",
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/InferenceRequest"}}},
+        NDJSON_MEDIA_TYPE: {"schema": {"$ref": "#/components/schemas/InferenceRequest"}}
+    }}}
+)
+async def infer_batch(
+    request: Request,
+    content_type: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None)
+):
     """
     Batch inference endpoint for multiple signals
     
-    Processes multiple inference requests in a single call
+    Processes multiple inference requests in a single call. Rule scoring runs
+    vectorized (see BatchScorer) in chunks, off the event loop: sharded across
+    worker processes when BATCH_WORKERS is set (see BatchPool).
+    
+    The body is a JSON array of InferenceRequest objects, or NDJSON (one
+    request per line, Content-Type: application/x-ndjson) which is read as a
+    stream. Rows are validated in the scoring chunks: an invalid row of a
+    JSON array fails the whole batch (422), while with NDJSON input or
+    output it fails only its own row. With Accept:
+    application/x-ndjson results are streamed as they are scored, one
+    {"index", "success", "data", "error"} line per request and then a summary
+    line, so memory stays flat regardless of batch size.
     """
     start_time = time.time()
-    results = []
+    pool = get_batch_pool()
     
-    try:
-        engine = get_inference_engine()
-        
-        for request in requests:
+    ndjson_body = NDJSON_MEDIA_TYPE in (content_type or "")
+    if ndjson_body:
+        chunks = _ndjson_chunks(request, pool.chunk_size)
+    else:
+        chunks = _list_chunks(await _read_batch_json(request), pool.chunk_size)
+    
+    if NDJSON_MEDIA_TYPE in (accept or ""):
+        async def stream():
+            index = 0
+            summary = {"success": True}
             try:
-                inference_output = engine.infer(request.signals)
-                results.append({
-                    "success": True,
-                    "data": inference_output.dict(),
-                    "error": None
-                })
+                async for chunk_results in pool.map_chunks(chunks):
+                    for result in chunk_results:
+                        yield dumps({"index": index, **result}) + b"\n"
+                        index += 1
             except Exception as e:
-                results.append({
-                    "success": False,
-                    "data": None,
-                    "error": str(e)
-                })
+                summary = {"success": False, "error": str(e)}
+            summary["total_processed"] = index
+            summary["processing_time_ms"] = (time.time() - start_time) * 1000
+            yield dumps(summary) + b"\n"
+        
+        return DuplexStreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
+    
+    results = []
+    
+    try:
+        async for chunk_results in pool.map_chunks(chunks, strict=not ndjson_body):
+            results.extend(chunk_results)
         
         processing_time_ms = (time.time() - start_time) * 1000
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "results": results,
-            "total_processed": len(requests),
+            "total_processed": len(results),
             "processing_time_ms": processing_time_ms
-        }
+        })
     
+    except BatchRowsInvalid as e:
+        raise _invalid_rows_error(e, offset=len(results))
+    except BulkInputTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except Exception as e:
-        return {
+        return FastJSONResponse({
             "success": False,
             "results": [],
             "total_processed": 0,
             "error": str(e),
             "processing_time_ms": (time.time() - start_time) * 1000
-        }
+        })
 
+
+@router.post("/infer/bulk")
+async def infer_bulk(
+    request: Request,
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=65536, description="Rows scored per vectorized pass"),
+    content_type: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None)
+) -> DuplexStreamingResponse:
+    """
+    Bulk rule scoring for offline rescoring
+    
+    The body is a stream of signal rows: NDJSON (one signals object per line,
+    the default) or an Arrow IPC stream (Content-Type:
+    application/vnd.apache.arrow.stream, requires pyarrow). Rows are scored
+    by the rule engine only, in chunks, and streamed back as columns of codes
+    (rule_id, need_state_id, confidence, ui_mode, language) in the format
+    asked for by Accept (default: the request format).
+    
+    NDJSON output: a header line with the code dictionaries, one line of
+    column arrays per chunk, then a summary line. Arrow output: one record
+    batch per chunk, dictionaries in the schema metadata. rule_id -1 is the
+    default rule, -2 an invalid row (NDJSON chunk lines list the errors).
+    
+    NDJSON input is read as it arrives, and lines over BULK_MAX_LINE_BYTES
+    are refused (413 while scoring the first chunk, an error summary line
+    afterwards). Arrow input is buffered whole first, so bodies over
+    BULK_MAX_ARROW_BYTES get a 413.
+    """
+    arrow_in = ARROW_MEDIA_TYPE in (content_type or "")
+    arrow_out = ARROW_MEDIA_TYPE in (accept or "") or (arrow_in and NDJSON_MEDIA_TYPE not in (accept or ""))
+    if (arrow_in or arrow_out) and not ARROW_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Arrow IPC is not available on this server (pyarrow not installed); use NDJSON"
+        )
+    
+    bulk = get_bulk_scorer()
+    if arrow_in:
+        try:
+            rows = iter_arrow_rows(await aread_arrow_body(request.stream()))
+        except BulkInputTooLarge as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid Arrow stream: {e}")
+    else:
+        rows = aiter_ndjson_rows(request.stream())
+    encoder = ArrowEncoder(bulk) if arrow_out else NDJSONEncoder(bulk)
+    
+    # Score the first chunk before responding, so an oversized line there is
+    # still answered with a 413; later ones end the stream with an error
+    chunks = ascore_bulk(rows, chunk_size, bulk)
+    first, first_error = [], None
+    try:
+        first.append(await chunks.__anext__())
+    except StopAsyncIteration:
+        pass
+    except BulkInputTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except Exception as e:
+        first_error = str(e)
+    
+    async def body():
+        yield encoder.header()
+        if first_error is not None:
+            yield encoder.close(error=first_error)
+            return
+        try:
+            for chunk in first:
+                yield encoder.encode(chunk)
+            async for chunk in chunks:
+                yield encoder.encode(chunk)
+        except Exception as e:
+            yield encoder.close(error=str(e))
+            return
+        yield encoder.close()
+    
+    return DuplexStreamingResponse(body(), media_type=encoder.media_type)
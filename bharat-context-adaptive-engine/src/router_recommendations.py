@@ -4,15 +4,53 @@ FastAPI router for recommendation endpoints
 
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import Response
 from .models import InferenceRequest, InferenceOutput
 from .inference_engine_enhanced import get_enhanced_inference_engine
 from .recommendation_engine import RecommendationEngine
+from .dispatch import run_blocking
+from .responses import dumps
 
 router = APIRouter(prefix="/v1/recommendations", tags=["recommendations"])
 
 recommendation_engine = RecommendationEngine()
 
 
+def warm_recommendations() -> int:
+    """
+    Precompute the recommendation table for every rule of the current rule set
+    Returns:
+        Number of table entries
+    """
+    from .inference_engine import get_inference_engine
+    engine = get_inference_engine()
+    default_state = engine.default_rule.get("user_need_state", "First-time AI Explorer")
+    
+    profiles = []
+    rule_states = [(rule.name, rule.output.get("user_need_state", default_state)) for rule in engine.rules]
+    for rule_name, user_need_state in rule_states + [("default", default_state)]:
+        actions, ui_mode, _ = engine.generate_recommendations(user_need_state, rule_name, None)
+        profiles.append((user_need_state, actions, ui_mode))
+    return recommendation_engine.warm(profiles)
+
+
+def _recommendations_response(inference_output: InferenceOutput, recommendations: bytes, **extra: Any) -> Response:
+    """
+    JSON response with pre-encoded recommendations spliced in, so the
+    cached content is not re-encoded per request
+    """
+    inference = dumps({
+        "user_need_state": inference_output.user_need_state,
+        "confidence": inference_output.confidence,
+        "ui_mode": inference_output.ui_mode.value,
+        "language_preference": inference_output.language_preference.value
+    })
+    body = b'{"success":true,"inference":' + inference + b',"recommendations":' + recommendations
+    for key, value in extra.items():
+        body += b',"' + key.encode() + b'":' + dumps(value)
+    return Response(content=body + b"}", media_type="application/json")
+
+
 @router.post("/generate")
 async def generate_recommendations(
     request: InferenceRequest,
@@ -39,30 +77,19 @@ async def generate_recommendations(
         # Step 1: Run inference engine
         if enhanced:
             engine = get_enhanced_inference_engine()
+            inference_output = await engine.ainfer(request.signals)
         else:
             from .inference_engine import get_inference_engine
             engine = get_inference_engine()
+            inference_output = await run_blocking(engine.infer, request.signals)
         
-        inference_output = engine.infer(request.signals)
+        # Step 2: Generate recommendations (table lookup, cheap enough for the event loop)
+        recommendations = recommendation_engine.generate_recommendations_json(inference_output, day=day)
         
-        # Step 2: Generate recommendations
-        recommendations = recommendation_engine.generate_recommendations(
-            inference_output=inference_output,
-            day=day
-        )
-        
-        return {
-            "success": True,
-            "inference": {
-                "user_need_state": inference_output.user_need_state,
-                "confidence": inference_output.confidence,
-                "ui_mode": inference_output.ui_mode.value,
-                "language_preference": inference_output.language_preference.value
-            },
-            "recommendations": recommendations,
-            "day": day
-        }
+        return _recommendations_response(inference_output, recommendations, day=day)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -84,32 +111,23 @@ async def generate_all_days_recommendations(
         # Run inference
         if enhanced:
             engine = get_enhanced_inference_engine()
+            inference_output = await engine.ainfer(request.signals)
         else:
             from .inference_engine import get_inference_engine
             engine = get_inference_engine()
-        
-        inference_output = engine.infer(request.signals)
+            inference_output = await run_blocking(engine.infer, request.signals)
         
         # Generate for all days
-        day_0 = recommendation_engine.generate_recommendations(inference_output, day=0)
-        day_1 = recommendation_engine.generate_recommendations(inference_output, day=1)
-        day_7 = recommendation_engine.generate_recommendations(inference_output, day=7)
+        day_0, day_1, day_7 = [
+            recommendation_engine.generate_recommendations_json(inference_output, day=day) for day in (0, 1, 7)
+        ]
         
-        return {
-            "success": True,
-            "inference": {
-                "user_need_state": inference_output.user_need_state,
-                "confidence": inference_output.confidence,
-                "ui_mode": inference_output.ui_mode.value,
-                "language_preference": inference_output.language_preference.value
-            },
-            "recommendations": {
-                "day_0": day_0,
-                "day_1": day_1,
-                "day_7": day_7
-            }
-        }
+        return _recommendations_response(
+            inference_output, b'{"day_0":' + day_0 + b',"day_1":' + day_1 + b',"day_7":' + day_7 + b"}"
+        )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,154 @@
+"""
+Rules Watcher for Bharat Context-Adaptive Engine
+Hot reload of rules.yaml with validation and an atomic engine swap
+"""
+
+import os
+import hmac
+import asyncio
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .inference_engine import RuleSet, get_inference_engine, set_inference_engine
+from . import inference_engine_enhanced
+from .batch_scoring import BatchScorer, set_batch_scorer
+
+
+class RulesWatcher:
+    """
+    Reloads rules.yaml when it changes
+
+    A reload parses, validates and compiles the new file into a RuleSet,
+    builds engine copies (and the batch scorer) on it, and only then swaps
+    the shared instances. Requests already holding an engine finish on the
+    old rules. An invalid file leaves the current rules in place.
+
+    Reloads over HTTP need reload_token; without one they are disabled.
+    """
+
+    def __init__(self, rules_path: Optional[Path] = None, poll_interval: float = 5.0,
+                 reload_token: Optional[str] = None):
+        self.rules_path = Path(rules_path) if rules_path else get_inference_engine().rules_path
+        self.poll_interval = poll_interval
+        self.reload_token = reload_token
+        self._lock = threading.Lock()
+        self._task: Optional["asyncio.Task"] = None
+        self._mtime = self._current_mtime()
+
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_reload: Optional[datetime] = None
+
+    @classmethod
+    def from_env(cls) -> "RulesWatcher":
+        """
+        Watch the shared engine's rules file every RULES_WATCH_INTERVAL seconds (0 disables);
+        RULES_RELOAD_TOKEN enables POST /v1/rules/reload
+        """
+        return cls(
+            poll_interval=float(os.getenv("RULES_WATCH_INTERVAL", "5")),
+            reload_token=os.getenv("RULES_RELOAD_TOKEN") or None
+        )
+
+    def authorize(self, token: Optional[str]) -> bool:
+        """Whether token matches reload_token (always False when none is set)"""
+        if not self.reload_token or token is None:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.reload_token.encode("utf-8"))
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return self.rules_path.stat().st_mtime
+        except OSError:
+            return None
+
+    def reload(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Load and swap in the rules file if its content changed
+        Args:
+            force: Rebuild even if the version hash is unchanged
+        Returns:
+            Status dict with the active version
+        """
+        with self._lock:
+            self._mtime = self._current_mtime()
+            current = get_inference_engine()
+            try:
+                ruleset = RuleSet.load(self.rules_path)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                print(f"Rules reload failed, keeping version {current.ruleset_version}: {e}")
+                return {"reloaded": False, "version": current.ruleset_version, "error": self.last_error}
+
+            if ruleset.version == current.ruleset_version and not force:
+                return {"reloaded": False, "version": current.ruleset_version, "error": None}
+
+            # Build everything first, then swap
+            engine = current.with_ruleset(ruleset)
+            scorer = BatchScorer(engine)
+            enhanced = inference_engine_enhanced._enhanced_engine_instance
+            enhanced = enhanced.with_ruleset(ruleset) if enhanced is not None else None
+
+            set_inference_engine(engine)
+            set_batch_scorer(scorer)
+            if enhanced is not None:
+                inference_engine_enhanced.set_enhanced_inference_engine(enhanced)
+
+            self.reloads += 1
+            self.last_error = None
+            self.last_reload = datetime.now()
+            print(f"Rules reloaded: version {current.ruleset_version} -> {ruleset.version}")
+            return {"reloaded": True, "version": ruleset.version, "error": None}
+
+    def changed(self) -> bool:
+        return self._current_mtime() != self._mtime
+
+    async def _watch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self.changed():
+                # Parsing and compiling run off the event loop
+                await loop.run_in_executor(None, self.reload)
+
+    def start(self):
+        """Start polling the rules file (no-op if poll_interval <= 0)"""
+        if self.poll_interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rules_path": str(self.rules_path),
+            "version": get_inference_engine().ruleset_version,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_reload": self.last_reload.isoformat() if self.last_reload else None
+        }
+
+
+# Singleton instance
+_rules_watcher_instance: Optional[RulesWatcher] = None
+
+
+def get_rules_watcher() -> RulesWatcher:
+    """Get or create the rules watcher"""
+    global _rules_watcher_instance
+
+    if _rules_watcher_instance is None:
+        _rules_watcher_instance = RulesWatcher.from_env()
+
+    return _rules_watcher_instance
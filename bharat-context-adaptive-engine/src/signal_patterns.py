@@ -0,0 +1,340 @@
+"""
+Signal Patterns for Bharat Context-Adaptive Engine
+Shared heuristic patterns evaluated once per request
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union
+
+
+def _value(signal: Any) -> Any:
+    """Enum signals compare on their value"""
+    return getattr(signal, "value", signal)
+
+
+def _any_items(name: str) -> Callable[[Any], bool]:
+    def predicate(signals) -> bool:
+        value = getattr(signals, name)
+        return bool(value) and isinstance(value, list) and len(value) > 0
+    return predicate
+
+
+def _equals(name: str, expected: Any) -> Callable[[Any], bool]:
+    return lambda signals: getattr(signals, name) == expected
+
+
+def _value_in(name: str, expected: Tuple) -> Callable[[Any], bool]:
+    def predicate(signals) -> bool:
+        value = getattr(signals, name)
+        return bool(value) and _value(value) in expected
+    return predicate
+
+
+def _hour_between(low: int, high: int) -> Callable[[Any], bool]:
+    def predicate(signals) -> bool:
+        hour = signals.hour_of_day
+        return bool(hour) and low <= hour <= high
+    return predicate
+
+
+def _financial_apps_diverse(signals) -> bool:
+    count = 0
+    if signals.payment_apps_installed:
+        count += 1
+    if signals.banking_apps == "yes":
+        count += 1
+    if signals.investment_apps and isinstance(signals.investment_apps, list):
+        count += len(signals.investment_apps)
+    return count >= 3
+
+
+def _regional_language(signals) -> bool:
+    return bool(signals.system_language) and signals.system_language not in ["hi", "en"]
+
+
+def _keyboard_differs(signals) -> bool:
+    return bool(signals.keyboard_language) and signals.keyboard_language != signals.system_language
+
+
+def _payment_apps_multiple(signals) -> bool:
+    apps = signals.payment_apps_installed
+    return bool(apps) and isinstance(apps, list) and len(apps) >= 2
+
+
+# Atomic predicates over one signal (or a fixed combination of a few)
+PREDICATES: Dict[str, Callable[[Any], bool]] = {
+    "business_apps:any": _any_items("business_apps"),
+    "education_apps:any": _any_items("education_apps"),
+    "ecommerce_apps:any": _any_items("ecommerce_apps"),
+    "payment_apps_installed:any": lambda signals: bool(signals.payment_apps_installed),
+    "payment_apps_installed:2+": _payment_apps_multiple,
+    "financial_apps:3+": _financial_apps_diverse,
+    "otp_message_frequency=high": _equals("otp_message_frequency", "high"),
+    "banking_sms_presence=yes": _equals("banking_sms_presence", "yes"),
+    "business_hours_sms=yes": _equals("business_hours_sms", "yes"),
+    "whatsapp_installed=yes": _equals("whatsapp_installed", "yes"),
+    "whatsapp_business_usage=yes": _equals("whatsapp_business_usage", "yes"),
+    "whatsapp_group_activity=high": _equals("whatsapp_group_activity", "high"),
+    "whatsapp_notification_frequency=high": _equals("whatsapp_notification_frequency", "high"),
+    "notification_response_rate=high": _equals("notification_response_rate", "high"),
+    "ecommerce_notifications=high": _equals("ecommerce_notifications", "high"),
+    "total_notification_volume=low": _equals("total_notification_volume", "low"),
+    "device_class=low_end": _value_in("device_class", ("low_end",)),
+    "device_class=high_end": _value_in("device_class", ("high_end",)),
+    "network_type:slow": _value_in("network_type", ("2g", "3g")),
+    "network_type:fast": _value_in("network_type", ("wifi", "4g")),
+    "city_tier:small": lambda signals: signals.city_tier in ["tier3", "tier4", "rural"],
+    "system_language=hi": _equals("system_language", "hi"),
+    "system_language:regional": _regional_language,
+    "keyboard_language:differs": _keyboard_differs,
+    "sms_language_mix=hindi_only": _equals("sms_language_mix", "hindi_only"),
+    "messaging_language=hindi": _equals("messaging_language", "hindi"),
+    "state:hindi_belt": lambda signals: signals.state in ["UP", "MP", "BH", "RJ"],
+    "time_of_day:morning": _value_in("time_of_day", ("early_morning", "morning")),
+    "time_of_day=evening": _value_in("time_of_day", ("evening",)),
+    "time_of_day:afternoon_evening": _value_in("time_of_day", ("afternoon", "evening")),
+    "hour_of_day:5-9": _hour_between(5, 9),
+    "hour_of_day:18-22": _hour_between(18, 22),
+    "session_duration=short": _equals("session_duration", "short"),
+    "session_duration=long": _equals("session_duration", "long"),
+    "text_input_length=none": _equals("text_input_length", "none"),
+    "text_input_length=long": _equals("text_input_length", "long"),
+    "abandonment_indicators:any": lambda signals: bool(signals.abandonment_indicators),
+    "return_user=yes": _equals("return_user", "yes"),
+    "first_action=voice": _equals("first_action", "voice"),
+    "voice_button_tapped=yes": _equals("voice_button_tapped", "yes"),
+    "microphone_permission=granted": _equals("microphone_permission", "granted"),
+    "first_prompt_attempted=no": _equals("first_prompt_attempted", "no"),
+    "tutorial_started=yes": _equals("tutorial_started", "yes"),
+    "example_prompts_viewed=yes": _equals("example_prompts_viewed", "yes"),
+}
+
+
+# A term is a predicate/pattern name, or a tuple of names of which any may hold
+Term = Union[str, Tuple[str, ...]]
+
+# Heuristic patterns: every term of "when" must hold. "family" groups the
+# output of one consumer (None for helper nodes); within a family, matches
+# are reported in declaration order. A pattern may use earlier patterns.
+PATTERNS: Dict[str, Dict[str, Any]] = {
+    # WebIntelligence.SIGNAL_PATTERNS
+    "business_apps_present": {"family": "web", "when": ["business_apps:any"]},
+    "education_apps_present": {"family": "web", "when": ["education_apps:any"]},
+    "financial_apps_diverse": {"family": "web", "when": ["financial_apps:3+"]},
+    "high_otp_frequency": {"family": "web", "when": ["otp_message_frequency=high"]},
+    "banking_sms_present": {"family": "web", "when": ["banking_sms_presence=yes"]},
+    "business_hours_sms": {"family": "web", "when": ["business_hours_sms=yes"]},
+    "whatsapp_business_usage": {"family": "web", "when": ["whatsapp_business_usage=yes"]},
+    "whatsapp_group_activity_high": {"family": "web", "when": ["whatsapp_group_activity=high"]},
+    "whatsapp_notification_frequency_high": {"family": "web", "when": ["whatsapp_notification_frequency=high"]},
+    "high_notification_response_rate": {"family": "web", "when": ["notification_response_rate=high"]},
+    "ecommerce_notifications_high": {"family": "web", "when": ["ecommerce_notifications=high"]},
+    "low_end_device_slow_network": {"family": "web", "when": ["device_class=low_end", "network_type:slow"]},
+    "high_end_device_fast_network": {"family": "web", "when": ["device_class=high_end", "network_type:fast"]},
+    "hindi_dominant_signals": {
+        "family": "web",
+        "when": ["system_language=hi", ("sms_language_mix=hindi_only", "messaging_language=hindi")]
+    },
+    "regional_language_signals": {"family": "web", "when": ["system_language:regional"]},
+    "morning_activity_pattern": {"family": "web", "when": ["time_of_day:morning", "hour_of_day:5-9"]},
+    "evening_activity_pattern": {"family": "web", "when": ["time_of_day=evening", "hour_of_day:18-22"]},
+
+    # AppContext.CHATGPT_CONTEXT
+    "voice_button_with_microphone": {
+        "family": None,
+        "when": ["voice_button_tapped=yes", "microphone_permission=granted"]
+    },
+    "first_time_user": {
+        "family": "behaviour",
+        "when": ["first_prompt_attempted=no", ("tutorial_started=yes", "example_prompts_viewed=yes")]
+    },
+    "voice_preference": {"family": "behaviour", "when": [("first_action=voice", "voice_button_with_microphone")]},
+    "low_engagement": {
+        "family": "behaviour",
+        "when": ["session_duration=short", "text_input_length=none", "abandonment_indicators:any"]
+    },
+    "high_engagement": {
+        "family": "behaviour",
+        "when": ["session_duration=long", "return_user=yes", "text_input_length=long"]
+    },
+    "voice_input": {"family": None, "when": [("first_action=voice", "voice_button_tapped=yes")]},
+    "hindi_system_language": {"family": None, "when": ["system_language=hi"]},
+
+    # AppContext.INDIAN_USE_CASES
+    "devotional": {
+        "family": "use_case",
+        "when": ["time_of_day:morning", "system_language=hi", "first_action=voice"]
+    },
+    "business_accounting": {
+        "family": "use_case",
+        "when": ["business_apps:any", "payment_apps_installed:any", "time_of_day=evening"]
+    },
+    "student_help": {
+        "family": "use_case",
+        "when": ["education_apps:any", "session_duration=long", "text_input_length=long"]
+    },
+    "shopping_assistance": {"family": "use_case", "when": ["ecommerce_apps:any", "ecommerce_notifications=high"]},
+    "language_translation": {"family": "use_case", "when": ["system_language:regional", "keyboard_language:differs"]},
+
+    # LLMReasoning.WORLD_KNOWLEDGE
+    "indian_business_culture": {
+        "family": "knowledge",
+        "when": ["business_apps:any", "whatsapp_business_usage=yes", "time_of_day=evening"]
+    },
+    "indian_education_system": {
+        "family": "knowledge",
+        "when": ["education_apps:any", "time_of_day:afternoon_evening", "session_duration=long"]
+    },
+    "indian_digital_payment_adoption": {
+        "family": "knowledge",
+        "when": ["otp_message_frequency=high", "payment_apps_installed:2+", "banking_sms_presence=yes"]
+    },
+    "indian_language_preferences": {"family": "knowledge", "when": ["system_language=hi", "state:hindi_belt"]},
+    "indian_device_constraints": {"family": "knowledge", "when": ["low_end_device_slow_network", "city_tier:small"]},
+    "indian_social_communication": {
+        "family": "knowledge",
+        "when": ["whatsapp_installed=yes", "whatsapp_group_activity=high", "whatsapp_notification_frequency=high"]
+    },
+
+    # LLMReasoning.SIGNAL_CORRELATIONS
+    "business_user_strong": {
+        "family": "correlation",
+        "when": ["indian_business_culture", "payment_apps_installed:2+"]
+    },
+    "student_strong": {"family": "correlation", "when": ["student_help", "total_notification_volume=low"]},
+
+    # EnhancedInferenceEngine.SIGNAL_CORRELATIONS
+    "business_payments": {
+        "family": "engine_correlation",
+        "when": ["business_apps:any", "whatsapp_business_usage=yes", "payment_apps_installed:any"]
+    },
+    "student_sessions": {"family": "engine_correlation", "when": ["student_help"]},
+    "active_transactions": {
+        "family": "engine_correlation",
+        "when": ["otp_message_frequency=high", "banking_sms_presence=yes", "payment_apps_installed:any"]
+    },
+
+    # EnhancedInferenceEngine.DECISION_SIGNALS
+    "business_apps_factor": {"family": "decision_factor", "when": ["business_apps:any"]},
+    "whatsapp_business_factor": {"family": "decision_factor", "when": ["whatsapp_business_usage=yes"]},
+    "high_otp_factor": {"family": "decision_factor", "when": ["otp_message_frequency=high"]},
+    "education_apps_factor": {"family": "decision_factor", "when": ["education_apps:any"]},
+}
+
+
+class PatternMatch:
+    """Result of evaluating the pattern DAG on one set of signals"""
+
+    __slots__ = ("_dag", "_results")
+
+    def __init__(self, dag: "PatternDAG", results: Tuple[bool, ...]):
+        self._dag = dag
+        self._results = results
+
+    def __contains__(self, name: str) -> bool:
+        index = self._dag.pattern_index.get(name)
+        return index is not None and self._results[index]
+
+    @property
+    def matched(self) -> List[str]:
+        """All matched patterns, in declaration order"""
+        names = self._dag.pattern_names
+        return [names[index] for index, holds in enumerate(self._results) if holds]
+
+    def family(self, family: str) -> List[str]:
+        """Matched patterns of a family, in declaration order"""
+        names, results = self._dag.pattern_names, self._results
+        return [names[index] for index in self._dag.family_index.get(family, ()) if results[index]]
+
+
+class PatternDAG:
+    """
+    Patterns resolved into index lists and evaluated in declaration order
+
+    Each pattern is a list of clauses, each clause a tuple of alternatives
+    referring to a predicate or an earlier pattern by index. Predicates are
+    evaluated lazily into a per-request list, so each runs at most once per
+    request (and not at all if no pattern gets that far); clauses and their
+    alternatives short-circuit like "and"/"or".
+    """
+
+    def __init__(
+        self,
+        predicates: Optional[Dict[str, Callable[[Any], bool]]] = None,
+        patterns: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        predicates = PREDICATES if predicates is None else predicates
+        patterns = PATTERNS if patterns is None else patterns
+
+        self.predicate_names = list(predicates)
+        self._predicates = [predicates[name] for name in self.predicate_names]
+        predicate_index = {name: index for index, name in enumerate(self.predicate_names)}
+
+        self.pattern_names: List[str] = []
+        self.pattern_index: Dict[str, int] = {}
+        self.family_index: Dict[str, List[int]] = {}
+        # Per pattern: clauses of (is_pattern, index) alternatives
+        self._plan: List[Tuple[Tuple[Tuple[bool, int], ...], ...]] = []
+
+        def resolve(pattern: str, name: str) -> Tuple[bool, int]:
+            if name in predicate_index:
+                return False, predicate_index[name]
+            if name in self.pattern_index:
+                return True, self.pattern_index[name]
+            raise ValueError(f"Pattern '{pattern}' uses unknown or later-declared '{name}'")
+
+        for name, spec in patterns.items():
+            if name in predicate_index or name in self.pattern_index:
+                raise ValueError(f"Duplicate pattern name '{name}'")
+            clauses = []
+            for term in spec["when"]:
+                alternatives = (term,) if isinstance(term, str) else tuple(term)
+                clauses.append(tuple(resolve(name, alternative) for alternative in alternatives))
+            index = len(self.pattern_names)
+            self._plan.append(tuple(clauses))
+            self.pattern_index[name] = index
+            self.pattern_names.append(name)
+            if spec.get("family"):
+                self.family_index.setdefault(spec["family"], []).append(index)
+        self.families = sorted(self.family_index)
+
+    def match(self, signals: Any) -> PatternMatch:
+        """Evaluate every pattern against signals (RawSignals or SparseSignals)"""
+        predicates = self._predicates
+        values: List[Optional[bool]] = [None] * len(predicates)
+        results: List[bool] = []
+        for clauses in self._plan:
+            holds = True
+            for alternatives in clauses:
+                for is_pattern, index in alternatives:
+                    if is_pattern:
+                        value = results[index]
+                    else:
+                        value = values[index]
+                        if value is None:
+                            value = values[index] = bool(predicates[index](signals))
+                    if value:
+                        break
+                else:
+                    holds = False
+                    break
+            results.append(holds)
+        return PatternMatch(self, tuple(results))
+
+
+# Singleton instance
+_pattern_dag_instance: Optional[PatternDAG] = None
+
+
+def get_pattern_dag() -> PatternDAG:
+    """Get or create the shared pattern DAG"""
+    global _pattern_dag_instance
+
+    if _pattern_dag_instance is None:
+        _pattern_dag_instance = PatternDAG()
+
+    return _pattern_dag_instance
+
+
+def match_patterns(signals: Any, match: Optional[PatternMatch] = None) -> PatternMatch:
+    """Reuse a match already computed for this request, or evaluate one"""
+    return match if match is not None else get_pattern_dag().match(signals)
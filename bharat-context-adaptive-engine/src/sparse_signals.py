@@ -0,0 +1,218 @@
+"""
+Sparse Signals for Bharat Context-Adaptive Engine
+Compact container holding only the signals a client actually sent
+"""
+
+import sys
+from typing import Dict, List, Any, Optional, FrozenSet, Tuple, Callable
+
+from typing_extensions import Annotated
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from pydantic_core import core_schema
+
+from .models import RawSignals
+
+
+_FIELDS = RawSignals.model_fields
+
+# Fields that are not None when absent (e.g. timestamp, signal_version)
+_DEFAULTS: Dict[str, Tuple[Any, Optional[Callable[[], Any]]]] = {
+    name: (field.default if field.default_factory is None else None, field.default_factory)
+    for name, field in _FIELDS.items()
+    if field.default_factory is not None or field.default is not None
+}
+
+# Per-field validators, built on first use
+_ADAPTERS: Dict[str, TypeAdapter] = {}
+
+# Validated (and interned) results of repeated scalar inputs, per field
+_VALUE_CACHE: Dict[Tuple[str, type, Any], Any] = {}
+_VALUE_CACHE_MAX = 65536
+
+
+class SignalValidationError(ValueError):
+    """Invalid signal values; errors use pydantic's error dict format"""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        details = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in errors
+        )
+        super().__init__(f"{len(errors)} invalid signal(s): {details}")
+
+
+def _adapter(name: str) -> TypeAdapter:
+    adapter = _ADAPTERS.get(name)
+    if adapter is None:
+        field = _FIELDS[name]
+        # Constraints such as ge/le live in the field metadata, not the annotation
+        annotation = Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+        adapter = _ADAPTERS[name] = TypeAdapter(annotation)
+    return adapter
+
+
+def _intern(value: Any) -> Any:
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is list:
+        return [sys.intern(v) if type(v) is str else v for v in value]
+    return value
+
+
+def _validate_field(name: str, value: Any) -> Any:
+    """Validate one signal, reusing results for repeated scalar and string-list values"""
+    if value is None:
+        return None
+
+    if isinstance(value, (str, int, float, bool)):
+        key = (name, type(value), value)
+    elif type(value) is list and all(type(v) is str for v in value):
+        key = (name, list, tuple(value))
+    else:
+        return _intern(_adapter(name).validate_python(value))
+
+    cached = _VALUE_CACHE.get(key, _VALUE_CACHE)
+    if cached is _VALUE_CACHE:
+        cached = _intern(_adapter(name).validate_python(value))
+        if len(_VALUE_CACHE) >= _VALUE_CACHE_MAX:
+            _VALUE_CACHE.clear()
+        _VALUE_CACHE[key] = cached
+    # Lists are mutable: hand out a copy
+    return list(cached) if type(cached) is list else cached
+
+
+class SparseSignals:
+    """
+    Signals with only the keys the client sent
+
+    Reads like RawSignals: every RawSignals field is an attribute (None or
+    its default when absent), and model_fields_set / model_dump behave the
+    same, so the rule engine, WebIntelligence and AppContext accept either.
+    Only present keys are validated; unknown keys are ignored as in RawSignals.
+    """
+
+    __slots__ = ("_values", "_fields_set")
+
+    def __init__(self, values: Dict[str, Any], fields_set: Optional[FrozenSet[str]] = None):
+        """Wrap already-validated values (use from_payload for client input)"""
+        self._values = values
+        self._fields_set = frozenset(values) if fields_set is None else fields_set
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "SparseSignals":
+        """
+        Validate the present keys of a raw signals dict
+        Raises:
+            SignalValidationError: with one pydantic-style error per bad value
+        """
+        if not isinstance(payload, dict):
+            raise SignalValidationError([{
+                "type": "dict_type", "loc": (), "msg": "Input should be a valid dictionary", "input": payload
+            }])
+
+        values = {}
+        errors = []
+        for name, value in payload.items():
+            if name not in _FIELDS:
+                continue
+            try:
+                values[name] = _validate_field(name, value)
+            except ValidationError as e:
+                for error in e.errors(include_url=False):
+                    error["loc"] = (name,) + tuple(error["loc"])
+                    errors.append(error)
+
+        if errors:
+            raise SignalValidationError(errors)
+        return cls(values)
+
+    @classmethod
+    def from_raw_signals(cls, signals: RawSignals) -> "SparseSignals":
+        fields_set = frozenset(signals.model_fields_set)
+        return cls({name: getattr(signals, name) for name in fields_set}, fields_set)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for names that are not slots: i.e. signal fields
+        if name.startswith("_"):
+            raise AttributeError(name)
+        values = self._values
+        if name in values:
+            return values[name]
+        if name in _DEFAULTS:
+            default, factory = _DEFAULTS[name]
+            if factory is not None:
+                # Materialize once, like RawSignals does at construction
+                default = values[name] = factory()
+            return default
+        if name in _FIELDS:
+            return None
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name: str, value: Any):
+        if name in self.__slots__:
+            object.__setattr__(self, name, value)
+        elif name in _FIELDS:
+            self._values[name] = value
+            self._fields_set = self._fields_set | {name}
+        else:
+            raise AttributeError(f"'{type(self).__name__}' object has no field '{name}'")
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SparseSignals):
+            return self._fields_set == other._fields_set and all(
+                self._values[name] == other._values[name] for name in self._fields_set
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        present = ", ".join(f"{name}={self._values[name]!r}" for name in sorted(self._fields_set))
+        return f"SparseSignals({present})"
+
+    @property
+    def model_fields_set(self) -> FrozenSet[str]:
+        return self._fields_set
+
+    def to_raw_signals(self) -> RawSignals:
+        """Full RawSignals model (no re-validation)"""
+        for name in _DEFAULTS:
+            getattr(self, name)
+        return RawSignals.model_construct(_fields_set=set(self._fields_set), **self._values)
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        """Same as RawSignals.model_dump (accepts the same arguments)"""
+        return self.to_raw_signals().model_dump(**kwargs)
+
+    def model_copy(self, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "SparseSignals":
+        values = dict(self._values)
+        fields_set = self._fields_set
+        if update:
+            values.update(update)
+            fields_set = fields_set | frozenset(update)
+        return SparseSignals(values, fields_set)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler) -> core_schema.CoreSchema:
+        """Use as a pydantic field type: dicts validate via from_payload"""
+        return core_schema.no_info_plain_validator_function(cls._coerce)
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema: core_schema.CoreSchema, handler) -> Dict[str, Any]:
+        # Documented exactly like RawSignals
+        return handler(RawSignals.__pydantic_core_schema__)
+
+    @classmethod
+    def _coerce(cls, value: Any) -> "SparseSignals":
+        if isinstance(value, SparseSignals):
+            return value
+        if isinstance(value, RawSignals):
+            return cls.from_raw_signals(value)
+        return cls.from_payload(value)
+
+
+class SparseInferenceRequest(BaseModel):
+    """InferenceRequest with sparsely validated signals (hot path of /v1/infer)"""
+
+    signals: SparseSignals = Field(..., description="Raw signals from client")
+    user_id: Optional[str] = Field(None, description="Optional anonymous user ID")
+    session_id: Optional[str] = Field(None, description="Optional session ID")
@@ -0,0 +1,24 @@
+"""
+Streaming helpers for Bharat Context-Adaptive Engine
+Responses that stream while the request body is still being read
+"""
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body generator reads the request body
+
+    StreamingResponse listens for client disconnects by calling receive(),
+    which would steal the request body chunks from Request.stream() while the
+    response is already being produced. Here the generator owns receive();
+    Request.stream() raises ClientDisconnect if the client goes away.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
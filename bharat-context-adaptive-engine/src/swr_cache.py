@@ -0,0 +1,281 @@
+"""
+Stale-While-Revalidate Cache for Bharat Context-Adaptive Engine
+Keyed upstream-result cache with single-flight loads, background refresh and preload
+"""
+
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable, Iterable, Hashable
+
+
+class CacheEntry:
+    """Cached upstream result for one key"""
+
+    def __init__(self, value: Any, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class SWRCache:
+    """
+    Keyed cache of upstream results with stale-while-revalidate refresh
+
+    - Fresh entries (up to fresh_seconds old) are served directly.
+    - Stale entries (up to max_stale_seconds old) are served immediately and
+      refreshed in the background: as a task when an event loop is running,
+      otherwise on a daemon thread with sync_loader. Older entries are dropped.
+    - Misses wait for the upstream call; concurrent misses for the same key
+      share one in-flight call (single-flight).
+    - preload() fills the cache ahead of traffic, and start() refreshes every
+      cached key on a schedule.
+
+    Every lookup reports {key, status, age_seconds}. Results that fail
+    is_cacheable() (empty feeds, placeholder answers) are returned but never
+    cached, so they never replace a good entry. Subclasses set the key and
+    loader shape and may override is_cacheable(), _prepare() (applied once
+    when storing) and _copy() (applied to everything handed to callers).
+    """
+
+    label = "Cache"  # for log messages
+
+    def __init__(
+        self,
+        loader: Callable[[Hashable], Awaitable[Any]],
+        sync_loader: Optional[Callable[[Hashable], Any]] = None,
+        fresh_seconds: float = 900.0,
+        max_stale_seconds: float = 86400.0,
+        refresh_interval: float = 300.0,
+        max_entries: int = 256,
+        preload_concurrency: int = 4
+    ):
+        self.loader = loader
+        self.sync_loader = sync_loader
+        self.fresh_seconds = fresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.refresh_interval = refresh_interval
+        self.max_entries = max_entries
+        self.preload_concurrency = preload_concurrency
+
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}  # event loop thread only
+        self._sync_refreshing: set = set()
+        self._refresh_task: Optional["asyncio.Task"] = None
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+        self.preloaded = 0
+
+    def is_cacheable(self, value: Any) -> bool:
+        return bool(value)
+
+    def _prepare(self, value: Any) -> Any:
+        return value
+
+    def _copy(self, value: Any) -> Any:
+        return value
+
+    @staticmethod
+    def _info(key: Hashable, status: str, age: Optional[float] = None) -> Dict[str, Any]:
+        return {
+            "key": list(key) if isinstance(key, tuple) else key,
+            "status": status,
+            "age_seconds": round(age, 1) if age is not None else None
+        }
+
+    def _live_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.age() > self.max_stale_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: Hashable, value: Any) -> Optional[Any]:
+        """Cache a loaded value; returns the stored value (None if not cacheable)"""
+        if not self.is_cacheable(value):
+            return None
+        value = self._prepare(value)
+        with self._lock:
+            self._entries[key] = CacheEntry(value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _fallback(self, key: Hashable, value: Any) -> Any:
+        """Keep serving a good cached entry over an uncacheable or failed load"""
+        entry = self._live_entry(key)
+        return entry.value if entry is not None else value
+
+    def lookup(self, key: Hashable) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """
+        Cached value without waiting on upstream
+        Returns (value, info) on a hit, None on a miss. A stale hit is
+        refreshed in the background.
+        """
+        entry = self._live_entry(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        age = entry.age()
+        if age <= self.fresh_seconds:
+            self.hits += 1
+            return self._copy(entry.value), self._info(key, "hit", age)
+
+        self.stale_hits += 1
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._refresh_in_thread(key)
+        else:
+            self._refresh(key)
+        return self._copy(entry.value), self._info(key, "stale_hit", age)
+
+    async def fetch(self, key: Hashable) -> Tuple[Any, Dict[str, Any]]:
+        """Load a key from upstream (joining any in-flight call) after a lookup miss"""
+        # shield: a cancelled caller must not cancel the shared upstream call
+        return self._copy(await asyncio.shield(self._refresh(key))), self._info(key, "miss")
+
+    async def get(self, key: Hashable) -> Tuple[Any, Dict[str, Any]]:
+        """Value for a key, serving stale content while revalidating"""
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached
+        return await self.fetch(key)
+
+    def get_sync(self, key: Hashable) -> Tuple[Any, Dict[str, Any]]:
+        """Blocking variant for the sync pipeline: only a miss waits for upstream"""
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached
+        if self.sync_loader is None:
+            return self._copy(None), self._info(key, "miss")
+        self.upstream_calls += 1
+        value = self.sync_loader(key)
+        stored = self._store(key, value)
+        return self._copy(stored if stored is not None else value), self._info(key, "miss")
+
+    def _refresh(self, key: Hashable) -> "asyncio.Future":
+        """Start (or join) the single in-flight upstream call for a key"""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return inflight
+
+        async def load() -> Any:
+            try:
+                self.upstream_calls += 1
+                value = await self.loader(key)
+                stored = self._store(key, value)
+                return stored if stored is not None else self._fallback(key, value)
+            except Exception as e:
+                print(f"{self.label} refresh failed for {key}: {e}")
+                return self._fallback(key, None)
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(load())
+        self._inflight[key] = task
+        return task
+
+    def _refresh_in_thread(self, key: Hashable):
+        """Refresh a stale key with sync_loader on a daemon thread (one per key at a time)"""
+        if self.sync_loader is None:
+            return
+        with self._lock:
+            if key in self._sync_refreshing:
+                return
+            self._sync_refreshing.add(key)
+
+        def refresh():
+            try:
+                self.upstream_calls += 1
+                self._store(key, self.sync_loader(key))
+            except Exception as e:
+                print(f"{self.label} refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._sync_refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="swr-cache-refresh", daemon=True).start()
+
+    async def preload(self, keys: Iterable[Hashable]) -> int:
+        """
+        Load keys ahead of traffic, preload_concurrency at a time
+        Keys that are already fresh are skipped. Returns the number cached.
+        """
+        semaphore = asyncio.Semaphore(self.preload_concurrency)
+
+        async def load(key: Hashable) -> bool:
+            entry = self._live_entry(key)
+            if entry is not None and entry.age() <= self.fresh_seconds:
+                return False
+            async with semaphore:
+                value = await asyncio.shield(self._refresh(key))
+            return self.is_cacheable(value)
+
+        loaded = await asyncio.gather(*(load(key) for key in dict.fromkeys(keys)))
+        count = sum(loaded)
+        self.preloaded += count
+        return count
+
+    async def _refresh_loop(self, preload_keys: List[Hashable]):
+        if preload_keys:
+            await self.preload(preload_keys)
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            with self._lock:
+                due = [key for key, entry in self._entries.items() if entry.age() > self.fresh_seconds]
+            await self.preload(due)
+
+    def start(self, preload_keys: Optional[Iterable[Hashable]] = None):
+        """
+        Preload keys in the background, then refresh cached keys on a schedule
+        (needs a running event loop)
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop(list(preload_keys or [])))
+
+    async def stop(self):
+        """Stop background refresh and cancel in-flight upstream calls"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        for task in list(self._inflight.values()):
+            task.cancel()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "fresh_seconds": self.fresh_seconds,
+            "max_stale_seconds": self.max_stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "upstream_calls": self.upstream_calls,
+            "preloaded": self.preloaded,
+            "inflight": len(self._inflight)
+        }
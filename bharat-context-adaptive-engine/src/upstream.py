@@ -0,0 +1,331 @@
+"""
+Upstream Calls for Bharat Context-Adaptive Engine
+Deadlines, jittered retries, hedging and circuit breakers for OpenRouter and Perplexity
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple, TypeVar
+
+import httpx
+import openai
+
+from .metrics import (
+    get_metrics,
+    UPSTREAM_SECONDS, UPSTREAM_RETRIES, UPSTREAM_HEDGED, UPSTREAM_SHORT_CIRCUITED, UPSTREAM_CIRCUIT_STATE
+)
+
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+    def __init__(self, service: str):
+        super().__init__(f"{service} circuit breaker is open")
+        self.service = service
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether another attempt could succeed: timeouts, connection failures,
+    429 and 5xx responses. Other errors mean the upstream answered.
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code is None and isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    return isinstance(error, (
+        TimeoutError, asyncio.TimeoutError, httpx.TransportError, openai.APIConnectionError
+    ))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream
+
+    After failure_threshold failed calls in a row the breaker opens and
+    calls are refused for reset_seconds. It then lets a single trial call
+    through (half-open): success closes it, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.opens = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims the half-open trial)"""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.OPEN or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self.opens += 1
+            self._trial = False
+
+    def release(self):
+        """Give up a claimed trial without an outcome (e.g. the caller was cancelled)"""
+        with self._lock:
+            self._trial = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "opens": self.opens}
+
+
+class UpstreamPolicy:
+    """Deadline, retry and hedging settings for one upstream call"""
+
+    def __init__(
+        self,
+        deadline_seconds: float = 30.0,
+        max_attempts: int = 2,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        hedge: bool = False,
+        hedge_after: float = 2.0
+    ):
+        self.deadline_seconds = deadline_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_after = hedge_after  # hedge delay until the call has a p95
+
+    @classmethod
+    def from_env(cls, call: str, **defaults) -> "UpstreamPolicy":
+        """Defaults overridden by UPSTREAM_<CALL>_* environment variables"""
+        prefix = f"UPSTREAM_{call.upper()}_"
+        policy = cls(**defaults)
+        policy.deadline_seconds = float(os.getenv(prefix + "DEADLINE_SECONDS", str(policy.deadline_seconds)))
+        policy.max_attempts = int(os.getenv(prefix + "MAX_ATTEMPTS", str(policy.max_attempts)))
+        policy.hedge = os.getenv(prefix + "HEDGE", str(policy.hedge)).lower() == "true"
+        return policy
+
+    def backoff(self, retry: int) -> float:
+        """Exponential backoff with full jitter before retry number retry (0-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** retry)))
+
+
+# Per-call defaults: Perplexity lookups are idempotent reads and may be hedged;
+# chat_stream covers opening the stream only (tokens are never retried)
+DEFAULT_POLICIES: Dict[str, Dict[str, Any]] = {
+    "reasoning": {"deadline_seconds": 20.0, "max_attempts": 2},
+    "chat": {"deadline_seconds": 30.0, "max_attempts": 2},
+    "chat_stream": {"deadline_seconds": 30.0, "max_attempts": 2},
+    "web_intelligence": {"deadline_seconds": 15.0, "max_attempts": 3, "hedge": True},
+    "feed": {"deadline_seconds": 20.0, "max_attempts": 2, "hedge": True},
+}
+
+
+class UpstreamClient:
+    """
+    Runs outbound calls under their policy and their upstream's breaker
+
+    Each call gets one deadline across all its attempts; every attempt is
+    passed the time left so the HTTP client enforces it. Retryable errors
+    (see is_retryable) are retried with jittered exponential backoff while
+    the deadline allows. A hedged call sends a second copy if the first has
+    not answered after the call's observed p95 and takes whichever answers
+    first (async only). With the breaker open the call fails immediately
+    with CircuitOpenError, so callers fall back without waiting.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, UpstreamPolicy]] = None,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0
+    ):
+        self.policies = policies if policies is not None else {
+            call: UpstreamPolicy(**defaults) for call, defaults in DEFAULT_POLICIES.items()
+        }
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.counters: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "UpstreamClient":
+        """Build with UPSTREAM_* environment variable settings"""
+        return cls(
+            policies={call: UpstreamPolicy.from_env(call, **defaults) for call, defaults in DEFAULT_POLICIES.items()},
+            failure_threshold=int(os.getenv("UPSTREAM_BREAKER_FAILURES", "5")),
+            reset_seconds=float(os.getenv("UPSTREAM_BREAKER_RESET_SECONDS", "30"))
+        )
+
+    def policy(self, call: str) -> UpstreamPolicy:
+        return self.policies.get(call) or UpstreamPolicy()
+
+    def breaker(self, service: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self.breakers.get(service)
+            if breaker is None:
+                breaker = self.breakers[service] = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+                get_metrics().gauge(
+                    UPSTREAM_CIRCUIT_STATE, lambda: CircuitBreaker.STATE_VALUES[breaker.state], service=service
+                )
+            return breaker
+
+    def is_open(self, service: str) -> bool:
+        return self.breaker(service).state == CircuitBreaker.OPEN
+
+    def _count(self, metric: str, service: str, call: str):
+        key = (metric, service, call)
+        with self._lock:
+            if key not in self.counters:
+                self.counters[key] = 0
+                get_metrics().gauge(metric, lambda: self.counters[key], kind="counter", service=service, call=call)
+            self.counters[key] += 1
+
+    def count(self, metric: str, service: str, call: str) -> int:
+        return self.counters.get((metric, service, call), 0)
+
+    def _admit(self, service: str, call: str) -> CircuitBreaker:
+        breaker = self.breaker(service)
+        if not breaker.allow():
+            self._count(UPSTREAM_SHORT_CIRCUITED, service, call)
+            raise CircuitOpenError(service)
+        return breaker
+
+    def _next_backoff(self, breaker: CircuitBreaker, policy: UpstreamPolicy, error: Exception,
+                      retry: int, remaining: float) -> Optional[float]:
+        """Backoff before another attempt, or None when the error is final"""
+        if not is_retryable(error):
+            # The upstream answered; the error is the caller's to handle
+            breaker.record_success()
+            raise error
+        if retry + 1 >= policy.max_attempts:
+            return None
+        backoff = policy.backoff(retry)
+        return backoff if backoff < remaining else None
+
+    async def acall(self, service: str, call: str, attempt: Callable[[float], Awaitable[T]]) -> T:
+        """
+        Await attempt(timeout_seconds) under the call's policy
+        Raises:
+            CircuitOpenError: The upstream's breaker is open
+            The last attempt's error once retries or the deadline run out
+        """
+        policy = self.policy(call)
+        breaker = self._admit(service, call)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.deadline_seconds
+
+        try:
+            retry = 0
+            while True:
+                remaining = deadline - loop.time()
+                try:
+                    if policy.hedge:
+                        result = await asyncio.wait_for(self._hedged(service, call, attempt, deadline), remaining)
+                    else:
+                        result = await asyncio.wait_for(attempt(remaining), remaining)
+                except Exception as e:
+                    backoff = self._next_backoff(breaker, policy, e, retry, deadline - loop.time())
+                    if backoff is None:
+                        breaker.record_failure()
+                        raise
+                    await asyncio.sleep(backoff)
+                    retry += 1
+                    self._count(UPSTREAM_RETRIES, service, call)
+                    continue
+                breaker.record_success()
+                return result
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+
+    async def _hedged(self, service: str, call: str, attempt: Callable[[float], Awaitable[T]],
+                      deadline: float) -> T:
+        """One attempt, raced against a second copy sent after the call's p95"""
+        loop = asyncio.get_running_loop()
+        tasks = {asyncio.ensure_future(attempt(deadline - loop.time()))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(service, call))
+            if not done:
+                self._count(UPSTREAM_HEDGED, service, call)
+                tasks.add(asyncio.ensure_future(attempt(deadline - loop.time())))
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def hedge_delay(self, service: str, call: str) -> float:
+        """When to hedge: the call's observed p95 (policy default until there is one)"""
+        p95 = get_metrics().quantile(UPSTREAM_SECONDS, 0.95, service=service, call=call, outcome="ok")
+        return p95 if p95 is not None else self.policy(call).hedge_after
+
+    def call(self, service: str, call: str, attempt: Callable[[float], T]) -> T:
+        """
+        Blocking variant of acall for the sync pipeline (no hedging: a second
+        copy would need another thread)
+        """
+        policy = self.policy(call)
+        breaker = self._admit(service, call)
+        deadline = time.monotonic() + policy.deadline_seconds
+
+        retry = 0
+        while True:
+            try:
+                result = attempt(deadline - time.monotonic())
+            except Exception as e:
+                backoff = self._next_backoff(breaker, policy, e, retry, deadline - time.monotonic())
+                if backoff is None:
+                    breaker.record_failure()
+                    raise
+                time.sleep(backoff)
+                retry += 1
+                self._count(UPSTREAM_RETRIES, service, call)
+                continue
+            breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {service: breaker.stats() for service, breaker in self.breakers.items()}
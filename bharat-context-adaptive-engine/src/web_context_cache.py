@@ -0,0 +1,146 @@
+"""
+Web Context Cache for Bharat Context-Adaptive Engine
+Perplexity web-context lookups cached by detected-pattern set, with preload
+"""
+
+import os
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
+
+from pydantic import ValidationError
+
+from .models import RawSignals
+from .llm_service import WEB_CONTEXT_UNAVAILABLE, WEB_CONTEXT_ERROR_PREFIX
+from .signal_patterns import get_pattern_dag
+from .swr_cache import SWRCache
+
+
+# The web query names at most this many detected patterns
+WEB_QUERY_PATTERNS = 3
+
+WebContextKey = Tuple[str, ...]  # detected web patterns the query is built from
+
+
+def web_context_key(detected_patterns: List[str]) -> Optional[WebContextKey]:
+    """
+    Normalized cache key for detected web patterns (None if nothing detected)
+
+    Patterns come out of the DAG in declaration order, so the same signals
+    always give the same tuple; only the patterns the query uses are kept.
+    """
+    return tuple(detected_patterns[:WEB_QUERY_PATTERNS]) or None
+
+
+def is_cacheable(web_context: Optional[str]) -> bool:
+    """False for empty results and the placeholders LLMService returns on failure"""
+    return bool(web_context) and not (
+        web_context == WEB_CONTEXT_UNAVAILABLE or web_context.startswith(WEB_CONTEXT_ERROR_PREFIX)
+    )
+
+
+class WebContextCache(SWRCache):
+    """
+    Web context keyed on the detected-pattern tuple
+
+    Perplexity answers the same question for every user showing the same
+    patterns, so one lookup serves all of them. Serving, refresh and
+    single-flight work as in SWRCache (entries expire after ttl_seconds);
+    preload() fills the cache ahead of traffic. Every lookup reports
+    {key, status, age_seconds} so the explanation shows whether the web
+    context came from the cache. Placeholder results (missing API key,
+    upstream error) are returned but never cached.
+    """
+
+    label = "Web context"
+
+    def __init__(
+        self,
+        loader: Callable[[WebContextKey], Awaitable[str]],
+        sync_loader: Optional[Callable[[WebContextKey], str]] = None,
+        fresh_seconds: float = 21600.0,
+        ttl_seconds: float = 86400.0,
+        refresh_interval: float = 900.0,
+        max_entries: int = 512,
+        preload_concurrency: int = 4
+    ):
+        super().__init__(
+            loader,
+            sync_loader,
+            fresh_seconds=fresh_seconds,
+            max_stale_seconds=ttl_seconds,
+            refresh_interval=refresh_interval,
+            max_entries=max_entries,
+            preload_concurrency=preload_concurrency
+        )
+
+    @classmethod
+    def from_env(cls, loader, sync_loader=None) -> "WebContextCache":
+        """Build with WEB_CONTEXT_CACHE_* environment variable settings"""
+        return cls(
+            loader,
+            sync_loader,
+            fresh_seconds=float(os.getenv("WEB_CONTEXT_CACHE_FRESH_SECONDS", "21600")),
+            ttl_seconds=float(os.getenv("WEB_CONTEXT_CACHE_TTL_SECONDS", "86400")),
+            refresh_interval=float(os.getenv("WEB_CONTEXT_CACHE_REFRESH_INTERVAL", "900")),
+            max_entries=int(os.getenv("WEB_CONTEXT_CACHE_MAX_ENTRIES", "512")),
+            preload_concurrency=int(os.getenv("WEB_CONTEXT_PRELOAD_CONCURRENCY", "4"))
+        )
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self.max_stale_seconds
+
+    def is_cacheable(self, web_context: Optional[str]) -> bool:
+        return is_cacheable(web_context)
+
+
+def _persona_value(condition) -> Any:
+    """A signal value satisfying a rule condition (None if there is no obvious one)"""
+    value = condition.value
+    if condition.operator in ("equals", "in", "contains"):
+        return value
+    if condition.operator == "between" and isinstance(value, list) and len(value) == 2:
+        return value[0]
+    if condition.operator == "greater_than" and isinstance(value, (int, float)):
+        return value + 1
+    if condition.operator == "less_than" and isinstance(value, (int, float)):
+        return value - 1
+    return None
+
+
+def _persona_signals(rule) -> Dict[str, Any]:
+    """Signal payload of a user matching every positive condition of a rule"""
+    payload = {}
+    for condition in rule.conditions:
+        value = _persona_value(condition)
+        if value is None:
+            continue
+        # List values are either app lists or a set of choices; a single app
+        # may need wrapping in a list
+        candidates = [value, value[0]] if isinstance(value, list) and value else [value, [value]]
+        for candidate in candidates:
+            try:
+                RawSignals(**{condition.signal: candidate})
+            except ValidationError:
+                continue
+            payload[condition.signal] = candidate
+            break
+    return payload
+
+
+def likely_web_context_keys(rules: List[Any], limit: Optional[int] = None) -> List[WebContextKey]:
+    """
+    Pattern sets worth preloading: those detected for each rule's persona
+
+    Each rule is turned into the signals of a user matching its conditions
+    and run through the pattern DAG. Keys are de-duplicated in rule order.
+    """
+    dag = get_pattern_dag()
+    keys: Dict[WebContextKey, None] = {}
+    for rule in rules:
+        payload = _persona_signals(rule)
+        if not payload:
+            continue
+        key = web_context_key(dag.match(RawSignals(**payload)).family("web"))
+        if key is not None:
+            keys[key] = None
+    return list(keys)[:limit] if limit is not None else list(keys)
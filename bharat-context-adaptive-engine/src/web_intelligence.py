@@ -6,6 +6,8 @@ Provides contextual knowledge about signals based on web intelligence and resear
 from typing import Dict, List, Any, Optional
 from .models import RawSignals
 from .llm_service import get_llm_service
+from .signal_patterns import PatternMatch, match_patterns
+from .web_context_cache import WebContextCache, web_context_key, WEB_QUERY_PATTERNS
 
 
 class WebIntelligence:
@@ -17,18 +19,21 @@ class WebIntelligence:
         "business_apps_present": {
             "meaning": "User likely runs a small business or shop",
             "context": "Apps like Khatabook, OkCredit indicate small business operations",
+            "insight": "Business apps detected - user likely runs small business",
             "confidence_boost": 0.5,
             "related_signals": ["payment_apps_installed", "whatsapp_business_usage"]
         },
         "education_apps_present": {
             "meaning": "User is likely a student or parent of student",
             "context": "Education apps indicate learning-focused user",
+            "insight": "Education apps detected - user likely student or parent",
             "confidence_boost": 0.4,
             "related_signals": ["session_duration", "text_input_length"]
         },
         "financial_apps_diverse": {
             "meaning": "User is financially active and tech-savvy",
             "context": "Multiple financial apps indicate active financial management",
+            "insight": "Diverse financial app ecosystem - user is financially active",
             "confidence_boost": 0.3,
             "related_signals": ["banking_apps", "investment_apps"]
         },
@@ -37,18 +42,21 @@ class WebIntelligence:
         "high_otp_frequency": {
             "meaning": "User is actively transacting (payments, logins, verifications)",
             "context": "High OTP frequency indicates frequent digital transactions",
+            "insight": "High OTP frequency - user actively transacting",
             "confidence_boost": 0.6,
             "related_signals": ["banking_sms_presence", "ecommerce_sms_presence", "payment_apps_installed"]
         },
         "banking_sms_present": {
             "meaning": "User has active banking relationship",
             "context": "Banking SMS indicates financial activity and trust in digital banking",
+            "insight": "Banking SMS present - active banking relationship",
             "confidence_boost": 0.4,
             "related_signals": ["banking_apps", "upi_apps"]
         },
         "business_hours_sms": {
             "meaning": "User likely engaged in business activities during work hours",
             "context": "SMS during business hours suggests professional/business use",
+            "insight": "Business hours SMS activity - likely business user",
             "confidence_boost": 0.3,
             "related_signals": ["business_apps", "whatsapp_business_usage"]
         },
@@ -57,18 +65,21 @@ class WebIntelligence:
         "whatsapp_business_usage": {
             "meaning": "User uses WhatsApp for business communication",
             "context": "WhatsApp Business usage is common among small businesses in India",
+            "insight": "WhatsApp Business usage - small business owner",
             "confidence_boost": 0.7,
             "related_signals": ["business_apps", "payment_apps_installed", "business_hours_sms"]
         },
         "whatsapp_group_activity_high": {
             "meaning": "User is socially active, likely part of communities/families",
             "context": "High group activity indicates social engagement",
+            "insight": "High WhatsApp group activity - socially engaged",
             "confidence_boost": 0.3,
             "related_signals": ["social_media_apps", "communication_apps"]
         },
         "whatsapp_notification_frequency_high": {
             "meaning": "User is highly engaged with messaging",
             "context": "High notification frequency indicates active communication",
+            "insight": "High WhatsApp notification frequency - active communicator",
             "confidence_boost": 0.2,
             "related_signals": ["total_notification_volume", "notification_response_rate"]
         },
@@ -77,12 +88,14 @@ class WebIntelligence:
         "high_notification_response_rate": {
             "meaning": "User is highly engaged and responsive",
             "context": "High response rate indicates active user who values notifications",
+            "insight": "High notification response rate - engaged user",
             "confidence_boost": 0.3,
             "related_signals": ["immediate_open_rate", "notification_to_app_launch"]
         },
         "ecommerce_notifications_high": {
             "meaning": "User is active online shopper",
             "context": "High e-commerce notifications indicate shopping activity",
+            "insight": "High e-commerce notifications - active shopper",
             "confidence_boost": 0.4,
             "related_signals": ["ecommerce_apps", "shopping_app_count"]
         },
@@ -91,12 +104,14 @@ class WebIntelligence:
         "low_end_device_slow_network": {
             "meaning": "User has resource constraints, needs lite experience",
             "context": "Low-end device + slow network requires optimized experience",
+            "insight": "Low-end device with slow network - needs lite experience",
             "confidence_boost": 0.5,
             "related_signals": ["device_class", "network_type", "network_speed"]
         },
         "high_end_device_fast_network": {
             "meaning": "User has premium device, can handle rich experiences",
             "context": "High-end device + fast network enables advanced features",
+            "insight": "High-end device with fast network - can handle rich features",
             "confidence_boost": 0.3,
             "related_signals": ["device_class", "network_type", "ram_size"]
         },
@@ -105,12 +120,14 @@ class WebIntelligence:
         "hindi_dominant_signals": {
             "meaning": "User prefers Hindi language interface",
             "context": "Hindi is dominant language in North India, indicates regional preference",
+            "insight": "Hindi-dominant signals - North Indian user",
             "confidence_boost": 0.4,
             "related_signals": ["system_language", "sms_language_mix", "messaging_language"]
         },
         "regional_language_signals": {
             "meaning": "User from non-Hindi speaking region",
             "context": "Regional language preference indicates cultural context",
+            "insight": "Regional language preference - non-Hindi speaking region",
             "confidence_boost": 0.4,
             "related_signals": ["system_language", "state", "language_region"]
         },
@@ -119,12 +136,14 @@ class WebIntelligence:
         "morning_activity_pattern": {
             "meaning": "User active in morning, likely routine-based",
             "context": "Morning activity often indicates devotional or work routines",
+            "insight": "Morning activity pattern - likely routine-based",
             "confidence_boost": 0.3,
             "related_signals": ["time_of_day", "hour_of_day", "whatsapp_notification_time_distribution"]
         },
         "evening_activity_pattern": {
             "meaning": "User active in evening, likely work/business related",
             "context": "Evening activity often indicates business accounting or family time",
+            "insight": "Evening activity pattern - likely work/business related",
             "confidence_boost": 0.3,
             "related_signals": ["time_of_day", "hour_of_day", "business_hours_sms"]
         }
@@ -142,6 +161,11 @@ class WebIntelligence:
     
     def __init__(self):
         self.llm_service = get_llm_service()
+        # Resolve llm_service at call time so a swapped service is honoured
+        self.web_context_cache = WebContextCache.from_env(
+            lambda key: self.llm_service.aget_web_intelligence(self.build_web_query(list(key))),
+            lambda key: self.llm_service.get_web_intelligence(self.build_web_query(list(key)))
+        )
 
     # App Ecosystem Knowledge
     APP_ECOSYSTEM_INSIGHTS = {
@@ -165,49 +189,20 @@ class WebIntelligence:
         }
     }
     
-    def analyze_signals(self, signals: RawSignals, use_perplexity: bool = False) -> Dict[str, Any]:
+    def analyze_signals(self, signals: RawSignals, use_perplexity: bool = False,
+                        match: Optional[PatternMatch] = None) -> Dict[str, Any]:
         """
         Analyze signals using web intelligence and contextual knowledge
         Returns insights and confidence adjustments
+        Args:
+            match: Pattern match already computed for these signals
         """
-        insights = []
         confidence_adjustments = {}
-        detected_patterns = []
         
-        # Analyze app ecosystem
-        app_insights = self._analyze_app_ecosystem(signals)
-        insights.extend(app_insights.get("insights", []))
-        detected_patterns.extend(app_insights.get("patterns", []))
-        
-        # Analyze SMS patterns
-        sms_insights = self._analyze_sms_patterns(signals)
-        insights.extend(sms_insights.get("insights", []))
-        detected_patterns.extend(sms_insights.get("patterns", []))
-        
-        # Analyze WhatsApp patterns
-        whatsapp_insights = self._analyze_whatsapp_patterns(signals)
-        insights.extend(whatsapp_insights.get("insights", []))
-        detected_patterns.extend(whatsapp_insights.get("patterns", []))
-        
-        # Analyze notification patterns
-        notification_insights = self._analyze_notification_patterns(signals)
-        insights.extend(notification_insights.get("insights", []))
-        detected_patterns.extend(notification_insights.get("patterns", []))
-        
-        # Analyze device/network patterns
-        device_insights = self._analyze_device_network_patterns(signals)
-        insights.extend(device_insights.get("insights", []))
-        detected_patterns.extend(device_insights.get("patterns", []))
-        
-        # Analyze language patterns
-        language_insights = self._analyze_language_patterns(signals)
-        insights.extend(language_insights.get("insights", []))
-        detected_patterns.extend(language_insights.get("patterns", []))
-        
-        # Analyze temporal patterns
-        temporal_insights = self._analyze_temporal_patterns(signals)
-        insights.extend(temporal_insights.get("insights", []))
-        detected_patterns.extend(temporal_insights.get("patterns", []))
+        # App ecosystem, SMS, WhatsApp, notification, device/network,
+        # language and temporal patterns (see signal_patterns.PATTERNS)
+        detected_patterns = match_patterns(signals, match).family("web")
+        insights = [self.SIGNAL_PATTERNS[pattern]["insight"] for pattern in detected_patterns]
         
         # Calculate confidence adjustments
         for pattern in detected_patterns:
@@ -215,154 +210,38 @@ class WebIntelligence:
                 pattern_info = self.SIGNAL_PATTERNS[pattern]
                 confidence_adjustments[pattern] = pattern_info.get("confidence_boost", 0.0)
         
-        # Perplexity Integration for deeper context
-        web_context = None
-        if use_perplexity and detected_patterns:
-            # Construct a query based on detected patterns
-            patterns_str = ", ".join(detected_patterns[:3])
-            query = f"What are the typical digital behaviors and needs of an Indian user showing these patterns: {patterns_str}?"
-            web_context = self.llm_service.get_web_intelligence(query)
-            if web_context:
-                insights.append(f"Web Intelligence: {web_context[:200]}...")
-
-        return {
+        result = {
             "insights": insights,
             "detected_patterns": detected_patterns,
             "confidence_adjustments": confidence_adjustments,
             "web_intelligence_applied": True,
-            "web_context": web_context
+            "web_context": None,
+            "web_context_cache": None
         }
-    
-    def _analyze_app_ecosystem(self, signals: RawSignals) -> Dict[str, Any]:
-        """Analyze installed app ecosystem"""
-        insights = []
-        patterns = []
-        
-        # Business apps
-        if signals.business_apps and isinstance(signals.business_apps, list) and len(signals.business_apps) > 0:
-            insights.append("Business apps detected - user likely runs small business")
-            patterns.append("business_apps_present")
-        
-        # Education apps
-        if signals.education_apps and isinstance(signals.education_apps, list) and len(signals.education_apps) > 0:
-            insights.append("Education apps detected - user likely student or parent")
-            patterns.append("education_apps_present")
-        
-        # Financial apps diversity
-        financial_count = 0
-        if signals.payment_apps_installed:
-            financial_count += 1
-        if signals.banking_apps == "yes":
-            financial_count += 1
-        if signals.investment_apps and isinstance(signals.investment_apps, list):
-            financial_count += len(signals.investment_apps)
-        
-        if financial_count >= 3:
-            insights.append("Diverse financial app ecosystem - user is financially active")
-            patterns.append("financial_apps_diverse")
-        
-        return {"insights": insights, "patterns": patterns}
-    
-    def _analyze_sms_patterns(self, signals: RawSignals) -> Dict[str, Any]:
-        """Analyze SMS patterns"""
-        insights = []
-        patterns = []
-        
-        if signals.otp_message_frequency == "high":
-            insights.append("High OTP frequency - user actively transacting")
-            patterns.append("high_otp_frequency")
-        
-        if signals.banking_sms_presence == "yes":
-            insights.append("Banking SMS present - active banking relationship")
-            patterns.append("banking_sms_present")
-        
-        if signals.business_hours_sms == "yes":
-            insights.append("Business hours SMS activity - likely business user")
-            patterns.append("business_hours_sms")
-        
-        return {"insights": insights, "patterns": patterns}
-    
-    def _analyze_whatsapp_patterns(self, signals: RawSignals) -> Dict[str, Any]:
-        """Analyze WhatsApp patterns"""
-        insights = []
-        patterns = []
-        
-        if signals.whatsapp_business_usage == "yes":
-            insights.append("WhatsApp Business usage - small business owner")
-            patterns.append("whatsapp_business_usage")
         
-        if signals.whatsapp_group_activity == "high":
-            insights.append("High WhatsApp group activity - socially engaged")
-            patterns.append("whatsapp_group_activity_high")
-        
-        if signals.whatsapp_notification_frequency == "high":
-            insights.append("High WhatsApp notification frequency - active communicator")
-            patterns.append("whatsapp_notification_frequency_high")
-        
-        return {"insights": insights, "patterns": patterns}
-    
-    def _analyze_notification_patterns(self, signals: RawSignals) -> Dict[str, Any]:
-        """Analyze notification patterns"""
-        insights = []
-        patterns = []
-        
-        if signals.notification_response_rate == "high":
-            insights.append("High notification response rate - engaged user")
-            patterns.append("high_notification_response_rate")
-        
-        if signals.ecommerce_notifications == "high":
-            insights.append("High e-commerce notifications - active shopper")
-            patterns.append("ecommerce_notifications_high")
-        
-        return {"insights": insights, "patterns": patterns}
-    
-    def _analyze_device_network_patterns(self, signals: RawSignals) -> Dict[str, Any]:
-        """Analyze device and network patterns"""
-        insights = []
-        patterns = []
-        
-        if (signals.device_class and signals.device_class.value == "low_end" and 
-            signals.network_type and signals.network_type.value in ["2g", "3g"]):
-            insights.append("Low-end device with slow network - needs lite experience")
-            patterns.append("low_end_device_slow_network")
-        
-        if (signals.device_class and signals.device_class.value == "high_end" and
-            signals.network_type and signals.network_type.value in ["wifi", "4g"]):
-            insights.append("High-end device with fast network - can handle rich features")
-            patterns.append("high_end_device_fast_network")
-        
-        return {"insights": insights, "patterns": patterns}
+        # Perplexity Integration for deeper context, cached per pattern set
+        key = web_context_key(detected_patterns)
+        if use_perplexity and key:
+            self.apply_web_context(result, *self.web_context_cache.get_sync(key))
+
+        return result
     
-    def _analyze_language_patterns(self, signals: RawSignals) -> Dict[str, Any]:
-        """Analyze language patterns"""
-        insights = []
-        patterns = []
-        
-        if signals.system_language == "hi":
-            if signals.sms_language_mix == "hindi_only" or signals.messaging_language == "hindi":
-                insights.append("Hindi-dominant signals - North Indian user")
-                patterns.append("hindi_dominant_signals")
-        
-        if signals.system_language and signals.system_language not in ["hi", "en"]:
-            insights.append("Regional language preference - non-Hindi speaking region")
-            patterns.append("regional_language_signals")
-        
-        return {"insights": insights, "patterns": patterns}
+    def build_web_query(self, detected_patterns: List[str]) -> Optional[str]:
+        """Construct the Perplexity query for detected patterns (None if nothing detected)"""
+        if not detected_patterns:
+            return None
+        patterns_str = ", ".join(detected_patterns[:WEB_QUERY_PATTERNS])
+        return f"What are the typical digital behaviors and needs of an Indian user showing these patterns: {patterns_str}?"
     
-    def _analyze_temporal_patterns(self, signals: RawSignals) -> Dict[str, Any]:
-        """Analyze temporal patterns"""
-        insights = []
-        patterns = []
-        
-        if signals.time_of_day and signals.time_of_day.value in ["early_morning", "morning"]:
-            if signals.hour_of_day and 5 <= signals.hour_of_day <= 9:
-                insights.append("Morning activity pattern - likely routine-based")
-                patterns.append("morning_activity_pattern")
-        
-        if signals.time_of_day and signals.time_of_day.value == "evening":
-            if signals.hour_of_day and 18 <= signals.hour_of_day <= 22:
-                insights.append("Evening activity pattern - likely work/business related")
-                patterns.append("evening_activity_pattern")
-        
-        return {"insights": insights, "patterns": patterns}
-
+    def apply_web_context(self, result: Dict[str, Any], web_context: Optional[str],
+                          cache_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Attach a Perplexity web context to an analyze_signals result
+        Args:
+            cache_info: Web context cache lookup (key, hit/miss status, age)
+        """
+        result["web_context"] = web_context
+        result["web_context_cache"] = cache_info
+        if web_context:
+            result["insights"].append(f"Web Intelligence: {web_context[:200]}...")
+        return result
@@ -0,0 +1,24 @@
+"""
+Shared fixtures for the test suite
+"""
+
+import pytest
+
+
+def comparable_output(output, exclude=()):
+    """
+    InferenceOutput as a dict without per-call values (inference timestamp,
+    feed item times), so outputs from different code paths compare equal
+    Args:
+        exclude: Further InferenceOutput fields to leave out
+    """
+    data = output.model_dump(exclude={"inference_timestamp", *exclude})
+    for item in data.get("feed") or []:
+        item.pop("time", None)
+    return data
+
+
+@pytest.fixture
+def comparable():
+    """comparable_output, for tests comparing inference outputs"""
+    return comparable_output
@@ -0,0 +1,199 @@
+"""
+Test cases for the async enhanced inference pipeline
+"""
+
+import asyncio
+import time
+import pytest
+from src.models import RawSignals, TimeOfDay
+from src.inference_engine import RuleSet
+from src.inference_engine_enhanced import EnhancedInferenceEngine
+
+
+class StubLLMService:
+    """LLMService stand-in whose upstream calls each take `delay` seconds"""
+
+    def __init__(self, delay: float = 0.2, llm_state: str = None):
+        self.delay = delay
+        self.llm_state = llm_state
+        self.feed_requests = []
+
+    def _llm_output(self):
+        if not self.llm_state:
+            return {"error": "OpenRouter API Key not configured"}
+        return {
+            "user_need_state": self.llm_state,
+            "confidence": 9.0,
+            "recommended_actions": ["GST Calc", "Invoice", "Profit Calc"],
+            "language_preference": "hindi"
+        }
+
+    def _feed(self, user_need_state, language):
+        self.feed_requests.append((user_need_state, language))
+        return [{"id": "1", "type": "news", "title": f"For {user_need_state}", "summary": language}]
+
+    def infer_user_profile_with_reasoning(self, signals, rules_context=""):
+        time.sleep(self.delay)
+        return self._llm_output()
+
+    def get_web_intelligence(self, query):
+        time.sleep(self.delay)
+        return "SMBs in India use WhatsApp for business."
+
+    def generate_feed_from_perplexity(self, user_need_state, language):
+        time.sleep(self.delay)
+        return self._feed(user_need_state, language)
+
+    async def ainfer_user_profile_with_reasoning(self, signals, rules_context=""):
+        await asyncio.sleep(self.delay)
+        return self._llm_output()
+
+    async def aget_web_intelligence(self, query):
+        await asyncio.sleep(self.delay)
+        return "SMBs in India use WhatsApp for business."
+
+    async def agenerate_feed_from_perplexity(self, user_need_state, language):
+        await asyncio.sleep(self.delay)
+        return self._feed(user_need_state, language)
+
+
+def _engine(service: StubLLMService) -> EnhancedInferenceEngine:
+    engine = EnhancedInferenceEngine(use_web_context=True)
+    engine.llm_service = service
+    engine.llm_reasoning.llm_service = service
+    engine.web_intelligence.llm_service = service
+    return engine
+
+
+class TestAsyncInference:
+    """Test suite for EnhancedInferenceEngine.ainfer"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.signals = RawSignals(
+            business_apps=["khatabook"],
+            whatsapp_business_usage="yes",
+            payment_apps_installed=["paytm", "phonepe"],
+            time_of_day=TimeOfDay.EVENING,
+            hour_of_day=19,
+            system_language="hi"
+        )
+
+    def test_ainfer_matches_infer(self, comparable):
+        """Async and sync pipelines produce the same decision"""
+        engine = _engine(StubLLMService(delay=0.0, llm_state="Evening Ledger / Khatabook Mode User"))
+
+        sync_output = engine.infer(self.signals)
+        async_output = asyncio.run(engine.ainfer(self.signals))
+
+        assert comparable(async_output, exclude={"explanation"}) == comparable(sync_output, exclude={"explanation"})
+
+    def test_upstream_calls_run_concurrently(self):
+        """Wall-clock latency tracks the slowest call, not the sum"""
+        service = StubLLMService(delay=0.2)
+        engine = _engine(service)
+
+        start = time.perf_counter()
+        output = asyncio.run(engine.ainfer(self.signals))
+        elapsed = time.perf_counter() - start
+
+        # LLM, web context and feed would take 0.6s serially
+        assert elapsed < 0.45
+        assert len(service.feed_requests) == 1
+        assert output.feed[0].title == f"For {output.user_need_state}"
+
+    def test_llm_override_refetches_feed(self):
+        """Feed is re-requested when the LLM changes the need state"""
+        service = StubLLMService(delay=0.0, llm_state="LLM Persona")
+        engine = _engine(service)
+
+        output = asyncio.run(engine.ainfer(self.signals))
+
+        assert output.user_need_state == "LLM Persona"
+        assert output.feed[0].title == "For LLM Persona"
+
+    def test_concurrent_inference_ids(self):
+        """Each concurrent request gets its own inference ID and explanation"""
+        engine = _engine(StubLLMService(delay=0.05))
+        signals_list = [
+            self.signals,
+            RawSignals(education_apps=["byjus"], hour_of_day=16, system_language="en"),
+            RawSignals(payment_apps_installed=["paytm"], hour_of_day=8)
+        ] * 4
+
+        async def run():
+            return await asyncio.gather(*[engine.ainfer_with_explanation(s) for s in signals_list])
+
+        results = asyncio.run(run())
+
+        assert len({result.inference_id for result in results}) == len(results)
+        for result in results:
+            assert result.explanation.inference_id == result.inference_id
+            assert result.explanation.final_user_need_state == result.output.user_need_state
+            assert engine.get_explanation(result.inference_id) is result.explanation
+
+
+    def test_identical_requests_coalesced(self):
+        """Concurrent identical requests share one pipeline run"""
+        service = StubLLMService(delay=0.1, llm_state="LLM Persona")
+        llm_calls = []
+        original = service.ainfer_user_profile_with_reasoning
+
+        async def counting_llm(signals, rules_context=""):
+            llm_calls.append(signals)
+            return await original(signals, rules_context)
+
+        service.ainfer_user_profile_with_reasoning = counting_llm
+        engine = _engine(service)
+
+        async def run():
+            return await asyncio.gather(*[
+                engine.ainfer_with_explanation(self.signals.model_copy()) for _ in range(10)
+            ])
+
+        results = asyncio.run(run())
+
+        assert len(llm_calls) == 1
+        assert len({result.inference_id for result in results}) == 10
+        assert len({id(result.explanation) for result in results}) == 10
+        leader_id = results[0].inference_id
+        for result in results[1:]:
+            assert result.explanation.coalesced_from == leader_id
+            assert result.output.user_need_state == "LLM Persona"
+            assert result.inference_id in result.output.explanation
+            assert engine.get_explanation(result.inference_id) is result.explanation
+        assert engine.coalesced_requests == 9
+        assert not engine._inflight
+
+    def test_ruleset_copy_has_own_inflight_and_shared_counter(self):
+        """A reloaded engine coalesces separately but counts into the same stats"""
+        service = StubLLMService(delay=0.1)
+        engine = _engine(service)
+        reloaded = engine.with_ruleset(RuleSet(engine.ruleset.config, "reloaded", engine.rules_path))
+
+        async def run():
+            return await asyncio.gather(*[
+                target.ainfer_with_explanation(self.signals.model_copy())
+                for target in (engine, engine, reloaded, reloaded)
+            ])
+
+        asyncio.run(run())
+
+        assert reloaded._inflight is not engine._inflight
+        assert engine.coalesced_requests == reloaded.coalesced_requests == 2
+        assert reloaded.coalescing_stats() == {"coalesced_requests": 2, "inflight": 0}
+
+    def test_sequential_requests_not_coalesced(self):
+        """Coalescing only covers requests that overlap in time"""
+        service = StubLLMService(delay=0.0, llm_state="LLM Persona")
+        engine = _engine(service)
+
+        first = asyncio.run(engine.ainfer_with_explanation(self.signals))
+        second = asyncio.run(engine.ainfer_with_explanation(self.signals))
+
+        assert second.explanation.coalesced_from is None
+        assert first.inference_id != second.inference_id
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
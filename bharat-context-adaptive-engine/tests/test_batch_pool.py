@@ -0,0 +1,149 @@
+"""
+Test cases for process-pool batch scoring
+"""
+
+import os
+import asyncio
+import threading
+
+import pytest
+
+from src import inference_engine, batch_pool
+from src.inference_engine import RuleSet, get_inference_engine
+from src.batch_scoring import get_batch_scorer
+from src.batch_pool import BatchPool, BatchRowsInvalid, score_request_rows
+
+
+ROWS = [
+    {"signals": {"time_of_day": "morning", "hour_of_day": 7, "system_language": "hi", "first_action": "voice"}},
+    {"signals": {"device_class": "low_end", "network_type": "3g", "data_saver_mode": "enabled"}},
+    {"signals": {"hour_of_day": 99}},
+    {"signals": {}},
+] * 5
+
+
+def _chunks(rows, size):
+    async def generate():
+        for offset in range(0, len(rows), size):
+            yield rows[offset:offset + size]
+    return generate()
+
+
+def _score(pool, rows, size, strict=False):
+    async def collect():
+        return [result async for chunk in pool.map_chunks(_chunks(rows, size), strict) for result in chunk]
+    return asyncio.run(collect())
+
+
+def _strip(results):
+    for result in results:
+        if result["data"]:
+            result["data"].pop("inference_timestamp")
+    return results
+
+
+class TestBatchPool:
+    """Test suite for BatchPool"""
+
+    def test_in_process(self):
+        """workers=0 scores on a thread with the shared scorer"""
+        pool = BatchPool(workers=0, chunk_size=3)
+        results = _score(pool, ROWS, pool.chunk_size)
+
+        assert _strip(results) == _strip(score_request_rows(get_batch_scorer(), ROWS))
+        assert pool.chunks_scored == 7
+
+    def test_worker_processes_match_in_process(self):
+        """Sharded results equal the in-process results, in input order"""
+        pool = BatchPool(workers=2, chunk_size=3)
+        try:
+            pool.start()
+            results = _score(pool, ROWS, pool.chunk_size)
+        finally:
+            pool.shutdown()
+
+        expected = score_request_rows(get_batch_scorer(), ROWS)
+        assert _strip(results) == _strip(expected)
+        assert [result["success"] for result in results] == [True, True, False, True] * 5
+
+    def test_restarts_on_rules_reload(self, monkeypatch):
+        """A new ruleset version replaces the worker pool"""
+        engine = get_inference_engine()
+        pool = BatchPool(workers=1, chunk_size=8)
+        try:
+            first = pool._ensure_executor()
+            assert pool._ensure_executor() is first
+
+            reloaded = engine.with_ruleset(RuleSet(engine.ruleset.config, "reloaded", engine.rules_path))
+            monkeypatch.setattr(inference_engine, "_engine_instance", reloaded)
+            results = _score(pool, ROWS[:4], pool.chunk_size)
+
+            assert pool._executor is not first
+            assert pool.restarts == 1
+            assert results[0]["data"]["ruleset_version"] == "reloaded"
+        finally:
+            pool.shutdown()
+
+    def test_worker_processes_are_opt_in(self, monkeypatch):
+        monkeypatch.delenv("BATCH_WORKERS", raising=False)
+        monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+        assert BatchPool().workers == 0
+        assert BatchPool.from_env().workers == 0
+        assert BatchPool.from_env()._ensure_executor() is None
+
+        monkeypatch.setenv("BATCH_WORKERS", "auto")
+        monkeypatch.setattr(os, "cpu_count", lambda: 8)
+        assert BatchPool.from_env().workers == 8
+        monkeypatch.setenv("WEB_CONCURRENCY", "4")
+        assert BatchPool.from_env().workers == 2
+        monkeypatch.setenv("WEB_CONCURRENCY", "16")
+        assert BatchPool.from_env().workers == 1
+
+    def test_strict_chunks_raise_for_invalid_rows(self):
+        """Strict validation runs in the worker and reports chunk-relative rows"""
+        pool = BatchPool(workers=1, chunk_size=4)
+        try:
+            with pytest.raises(BatchRowsInvalid) as raised:
+                _score(pool, ROWS[:4], pool.chunk_size, strict=True)
+        finally:
+            pool.shutdown()
+
+        assert [error["loc"] for error in raised.value.errors] == [[2, "signals"]]
+        assert _score(BatchPool(workers=0), ROWS[:2], 2, strict=True)[0]["success"] is True
+
+    def test_early_stop_cancels_pending_chunks(self, monkeypatch):
+        """Chunks still queued when the consumer stops are cancelled"""
+        release = threading.Event()
+
+        def score(scorer, rows, strict=False):
+            if rows[0] is not ROWS[0]:
+                release.wait(5)
+            return [{"success": True, "data": None, "error": None}] * len(rows)
+
+        monkeypatch.setattr(batch_pool, "score_request_rows", score)
+        pool = BatchPool(workers=2, chunk_size=1)
+        monkeypatch.setattr(pool, "_ensure_executor", lambda: None)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            futures = []
+            submit = loop.run_in_executor
+
+            def spy(*args):
+                futures.append(submit(*args))
+                return futures[-1]
+
+            monkeypatch.setattr(loop, "run_in_executor", spy)
+            results = pool.map_chunks(_chunks(ROWS, 1))
+            first = await results.__anext__()
+            await results.aclose()
+            return first, futures
+
+        try:
+            first, futures = asyncio.run(run())
+        finally:
+            release.set()
+
+        assert first[0]["success"] is True
+        assert len(futures) == pool.max_inflight
+        assert all(future.cancelled() for future in futures[1:])
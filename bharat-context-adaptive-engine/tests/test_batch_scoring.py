@@ -0,0 +1,152 @@
+"""
+Test cases for vectorized batch scoring
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.models import RawSignals, DeviceClass, NetworkType, TimeOfDay
+from src.inference_engine import InferenceEngine
+from src.batch_scoring import BatchScorer
+
+
+class TestBatchScorer:
+    """Test suite for BatchScorer"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.engine = InferenceEngine()
+        self.scorer = BatchScorer(self.engine)
+        self.signals = [
+            RawSignals(
+                time_of_day=TimeOfDay.MORNING,
+                hour_of_day=7,
+                system_language="hi",
+                first_action="voice",
+                festival_day="diwali"
+            ),
+            RawSignals(
+                time_of_day=TimeOfDay.EVENING,
+                hour_of_day=19,
+                day_of_week="monday",
+                payment_apps_installed=["paytm", "phonepe"],
+                city_tier="tier3",
+                text_input_length="medium"
+            ),
+            RawSignals(
+                network_type=NetworkType.THREE_G,
+                network_speed="slow",
+                device_class=DeviceClass.LOW_END,
+                ram_size="2GB",
+                connection_stability="unstable",
+                data_saver_mode="enabled"
+            ),
+            RawSignals(device_class=DeviceClass.MID_RANGE),
+            RawSignals()
+        ]
+
+    def test_score_matrix_matches_rule_scores(self):
+        """N x R score matrix equals per-row rule scoring"""
+        batch = self.scorer.score(self.signals)
+
+        assert batch.scores.shape == (len(self.signals), len(self.engine.rules))
+        for row_index, signals in enumerate(self.signals):
+            for rule_index, (_, score, _, _) in enumerate(self.engine.plan.score(signals)):
+                assert batch.scores[row_index, rule_index] == score
+
+    def test_infer_matches_engine(self, comparable):
+        """Batch outputs are identical to InferenceEngine.infer"""
+        outputs = self.scorer.infer(self.signals)
+
+        assert len(outputs) == len(self.signals)
+        for output, signals in zip(outputs, self.signals):
+            assert comparable(output) == comparable(self.engine.infer(signals))
+
+    def test_default_rule_fallback(self):
+        """Rows without qualifying rules fall back to the default rule"""
+        batch = self.scorer.score([RawSignals()])
+
+        assert batch.winners[0] == -1
+        assert self.scorer.need_state(batch, 0)[2] == "default"
+
+    def test_empty_batch(self):
+        """Empty batches score without error"""
+        assert self.scorer.infer([]) == []
+
+
+class TestBatchEndpoint:
+    """Test suite for /v1/infer/batch (JSON and NDJSON modes)"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        from src.router_inference import router
+
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+        self.requests = [
+            {"signals": {"time_of_day": "morning", "hour_of_day": 7, "system_language": "hi", "first_action": "voice"}},
+            {"signals": {"device_class": "low_end", "network_type": "3g", "data_saver_mode": "enabled"}},
+            {"signals": {}},
+        ] * 3
+
+    def test_json_batch(self):
+        """JSON array in, JSON out"""
+        response = self.client.post("/v1/infer/batch", json=self.requests)
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["success"] is True
+        assert body["total_processed"] == len(self.requests)
+        assert all(result["success"] for result in body["results"])
+
+    def test_json_batch_invalid_body(self):
+        """Invalid JSON batches are rejected as a whole"""
+        response = self.client.post("/v1/infer/batch", json=[{"signals": {"hour_of_day": 99}}])
+        assert response.status_code == 422
+
+        response = self.client.post("/v1/infer/batch", json=self.requests + [{"signals": {"hour_of_day": 99}}])
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", len(self.requests), "signals"]
+
+    def test_ndjson_streaming(self):
+        """NDJSON in, NDJSON out; invalid lines fail only their row"""
+        lines = [json.dumps(request) for request in self.requests]
+        lines.insert(1, json.dumps({"signals": {"hour_of_day": 99}}))
+        response = self.client.post(
+            "/v1/infer/batch",
+            content="\n".join(lines),
+            headers={"Content-Type": "application/x-ndjson", "Accept": "application/x-ndjson"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        results, summary = rows[:-1], rows[-1]
+        assert [row["index"] for row in results] == list(range(len(lines)))
+        assert [row["success"] for row in results] == [True, False] + [True] * (len(lines) - 2)
+        assert summary["success"] is True
+        assert summary["total_processed"] == len(lines)
+
+        json_results = self.client.post("/v1/infer/batch", json=self.requests).json()["results"]
+        streamed = [row["data"] for row in results if row["success"]]
+        for streamed_data, result in zip(streamed, json_results):
+            streamed_data.pop("inference_timestamp")
+            result["data"].pop("inference_timestamp")
+            assert streamed_data == result["data"]
+
+    def test_json_body_streamed_response(self):
+        """JSON array in, NDJSON out"""
+        response = self.client.post("/v1/infer/batch", json=self.requests,
+                                    headers={"Accept": "application/x-ndjson"})
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == len(self.requests) + 1
+        assert rows[-1]["total_processed"] == len(self.requests)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,165 @@
+"""
+Test cases for columnar bulk scoring
+"""
+
+import json
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.models import RawSignals
+from src.inference_engine import InferenceEngine
+from src.batch_scoring import BatchScorer
+from src.bulk_scoring import (
+    BulkScorer, BulkInputTooLarge, score_bulk, iter_ndjson_rows, aiter_ndjson_rows,
+    NDJSON_MEDIA_TYPE, ARROW_MEDIA_TYPE, DEFAULT_RULE_ID, INVALID_ROW_ID
+)
+
+
+ROWS = [
+    {"time_of_day": "morning", "hour_of_day": 7, "system_language": "hi",
+     "first_action": "voice", "festival_day": "diwali"},
+    {"time_of_day": "evening", "hour_of_day": 19, "day_of_week": "monday",
+     "payment_apps_installed": ["paytm", "phonepe"], "city_tier": "tier3", "text_input_length": "medium"},
+    {"device_class": "low_end", "network_type": "2g", "data_saver_mode": "on"},
+    {},
+]
+
+
+@pytest.fixture
+def bulk():
+    return BulkScorer(BatchScorer(InferenceEngine()))
+
+
+def _decode(bulk, chunks):
+    tables = bulk.dictionaries()
+    decoded = []
+    for chunk in chunks:
+        for i in range(len(chunk)):
+            rule_id = int(chunk.columns["rule_id"][i])
+            decoded.append({
+                "matched_rule": tables["rules"][rule_id] if rule_id >= 0 else rule_id,
+                "user_need_state": tables["need_states"][chunk.columns["need_state_id"][i]],
+                "confidence": round(float(chunk.columns["confidence"][i]), 4),
+                "ui_mode": tables["ui_modes"][chunk.columns["ui_mode"][i]],
+                "language_preference": tables["languages"][chunk.columns["language"][i]],
+            })
+    return decoded
+
+
+class TestBulkScorer:
+    """Test suite for BulkScorer"""
+
+    def test_matches_engine(self, bulk):
+        engine = bulk.scorer.engine
+        decoded = _decode(bulk, score_bulk(ROWS * 3, chunk_size=5, scorer=bulk))
+
+        assert len(decoded) == len(ROWS) * 3
+        for row, result in zip(ROWS * 3, decoded):
+            output = engine.infer(RawSignals(**row))
+            matched_rule = output.matched_rule if output.matched_rule != "default" else DEFAULT_RULE_ID
+            assert result == {
+                "matched_rule": matched_rule,
+                "user_need_state": output.user_need_state,
+                "confidence": round(output.confidence, 4),
+                "ui_mode": output.ui_mode.value,
+                "language_preference": output.language_preference.value,
+            }
+
+    def test_invalid_rows_reported(self, bulk):
+        lines = [json.dumps(ROWS[0]), "not json", json.dumps({"hour_of_day": 99}), json.dumps({"signals": ROWS[1]})]
+        chunks = list(score_bulk(iter_ndjson_rows(lines), chunk_size=10, scorer=bulk))
+
+        assert len(chunks) == 1
+        assert chunks[0].columns["rule_id"].tolist()[1:3] == [INVALID_ROW_ID, INVALID_ROW_ID]
+        assert chunks[0].columns["rule_id"][3] >= 0
+        assert [row for row, _ in chunks[0].errors] == [1, 2]
+
+    def test_ndjson_endpoint(self):
+        from src.router_inference import router
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+
+        body = "\n".join(json.dumps(row) for row in ROWS * 2)
+        response = client.post("/v1/infer/bulk?chunk_size=3", content=body,
+                               headers={"Content-Type": NDJSON_MEDIA_TYPE})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(NDJSON_MEDIA_TYPE)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        header, chunks, summary = lines[0], lines[1:-1], lines[-1]
+        assert header["columns"] == ["rule_id", "need_state_id", "confidence", "ui_mode", "language"]
+        assert [chunk["offset"] for chunk in chunks] == [0, 3, 6]
+        assert summary == {"total_processed": len(ROWS) * 2, "invalid": 0}
+
+    def test_ndjson_stream_lines_split_across_chunks(self):
+        async def chunks(*parts):
+            for part in parts:
+                yield part
+
+        async def rows(*parts, max_line_bytes=None):
+            return [row async for row in aiter_ndjson_rows(chunks(*parts), max_line_bytes)]
+
+        assert asyncio.run(rows(b'{"a": 1}\n{"b"', b': 2}\n\n', b'{"c"', b": 3}", b"\n{not json}")) == [
+            {"a": 1}, {"b": 2}, {"c": 3}, "{not json}"
+        ]
+        assert asyncio.run(rows(b'{"a": 1}\n', b'{"b": 2}', max_line_bytes=8)) == [{"a": 1}, {"b": 2}]
+        with pytest.raises(BulkInputTooLarge):
+            asyncio.run(rows(b'{"a": 1}\n', b'{"b": ', b'"long"}\n', max_line_bytes=8))
+        with pytest.raises(BulkInputTooLarge):
+            asyncio.run(rows(b"x" * 16, max_line_bytes=8))
+
+    def test_ndjson_line_too_long(self, monkeypatch):
+        from src import bulk_scoring
+        from src.router_inference import router
+
+        app = FastAPI()
+        app.include_router(router)
+        monkeypatch.setattr(bulk_scoring, "MAX_NDJSON_LINE_BYTES", 64)
+        body = json.dumps(ROWS[0]).encode() + b"\n"
+
+        response = TestClient(app).post("/v1/infer/bulk", content=body * 2,
+                                        headers={"Content-Type": NDJSON_MEDIA_TYPE})
+        assert response.status_code == 413
+
+    def test_arrow_round_trip(self, bulk):
+        pa = pytest.importorskip("pyarrow")
+        from src.router_inference import router
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+
+        table = pa.Table.from_pylist([{"hour_of_day": 7, "system_language": "hi", "first_action": "voice"},
+                                      {"hour_of_day": 19, "system_language": "en", "first_action": "text"}])
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        response = client.post("/v1/infer/bulk", content=sink.getvalue().to_pybytes(),
+                               headers={"Content-Type": ARROW_MEDIA_TYPE})
+
+        assert response.status_code == 200
+        result = pa.ipc.open_stream(response.content).read_all()
+        assert result.num_rows == 2
+        assert result.column_names == ["rule_id", "need_state_id", "confidence", "ui_mode", "language"]
+        assert b"bharat.dictionaries" in result.schema.metadata
+
+    def test_arrow_body_size_capped(self, monkeypatch):
+        pytest.importorskip("pyarrow")
+        from src import bulk_scoring
+        from src.router_inference import router
+
+        app = FastAPI()
+        app.include_router(router)
+        monkeypatch.setattr(bulk_scoring, "MAX_ARROW_BODY_BYTES", 16)
+
+        response = TestClient(app).post("/v1/infer/bulk", content=b"x" * 64,
+                                        headers={"Content-Type": ARROW_MEDIA_TYPE})
+
+        assert response.status_code == 413
+        assert "16 bytes" in response.json()["detail"]
@@ -0,0 +1,123 @@
+"""
+Test cases for /v1/chat and streamed chat completions
+"""
+
+import json
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from openai import AsyncOpenAI
+
+from src import router_inference
+from src.llm_service import LLMService
+from src.metrics import get_metrics, CHAT_TTFT_SECONDS
+
+
+TOKENS = ["नमस्ते", "! GST", " 18%", " है।"]
+
+
+def _sse_chunks(tokens):
+    lines = []
+    for token in tokens:
+        chunk = {
+            "id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "m",
+            "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+        }
+        lines.append(f"data: {json.dumps(chunk)}\n\n")
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode("utf-8")
+
+
+class FakeChatService:
+    """Stands in for LLMService in the router"""
+
+    def __init__(self, tokens, fail_after=None):
+        self.tokens = tokens
+        self.fail_after = fail_after
+
+    async def astream_chat_completion(self, messages, context="", strict=False):
+        for index, token in enumerate(self.tokens):
+            if index == self.fail_after:
+                raise RuntimeError("upstream reset")
+            await asyncio.sleep(0)
+            yield token
+
+    async def achat_completion(self, messages, context="", strict=False):
+        return "".join(self.tokens)
+
+
+def _client(monkeypatch, service):
+    monkeypatch.setattr(router_inference, "get_llm_service", lambda: service)
+    app = FastAPI()
+    app.include_router(router_inference.router)
+    return TestClient(app)
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestChat:
+    """Test suite for the chat endpoint"""
+
+    def test_stream_chat_completion(self):
+        """Deltas are yielded as they arrive and time-to-first-token is recorded"""
+        service = LLMService()
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, content=_sse_chunks(TOKENS), headers={"content-type": "text/event-stream"})
+
+        service.async_openai_client = AsyncOpenAI(
+            api_key="mock_key", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        service.http_client = httpx.AsyncClient()
+        before = get_metrics().histogram(CHAT_TTFT_SECONDS, model="openai/gpt-5.1").count
+
+        async def run():
+            tokens = [token async for token in service.astream_chat_completion([{"role": "user", "content": "GST?"}])]
+            await service.shutdown()
+            return tokens
+
+        assert asyncio.run(run()) == TOKENS
+        assert requests[0]["stream"] is True
+        assert get_metrics().histogram(CHAT_TTFT_SECONDS, model="openai/gpt-5.1").count == before + 1
+
+    def test_sse_endpoint(self, monkeypatch):
+        client = _client(monkeypatch, FakeChatService(TOKENS))
+        response = client.post("/v1/chat", json={"messages": [{"role": "user", "content": "GST?"}], "stream": True})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _events(response.text)
+        assert [data["content"] for name, data in events if name == "token"] == TOKENS
+        name, done = events[-1]
+        assert name == "done" and done["response"] == "".join(TOKENS)
+        assert done["ttft_ms"] <= done["duration_ms"]
+
+    def test_ndjson_and_error(self, monkeypatch):
+        client = _client(monkeypatch, FakeChatService(TOKENS, fail_after=2))
+        response = client.post(
+            "/v1/chat", json={"messages": [{"role": "user", "content": "GST?"}]},
+            headers={"Accept": "application/x-ndjson"}
+        )
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["type"] for line in lines] == ["token", "token", "error"]
+        assert lines[-1]["error"] == "upstream reset"
+        assert lines[-1]["partial_response"] == "".join(TOKENS[:2])
+
+    def test_json_endpoint(self, monkeypatch):
+        client = _client(monkeypatch, FakeChatService(TOKENS))
+        response = client.post("/v1/chat", json={"messages": [{"role": "user", "content": "GST?"}], "context": "GST"})
+
+        assert response.json() == {"success": True, "response": "".join(TOKENS)}
+        routes = [route for route in router_inference.router.routes if route.path == "/v1/chat"]
+        assert len(routes) == 1
@@ -0,0 +1,176 @@
+"""
+Test cases for server-side chat sessions
+"""
+
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src import router_inference, chat_sessions
+from src.chat_sessions import ChatSessionStore, estimate_tokens
+from src.llm_service import ChatUnavailableError
+
+
+class RecordingChatService:
+    """Stands in for LLMService, recording what the router sends upstream"""
+
+    def __init__(self, reply="ठीक है"):
+        self.reply = reply
+        self.calls = []
+
+    async def astream_chat_completion(self, messages, context="", strict=False):
+        self.calls.append((messages, context))
+        for token in self.reply.split(" "):
+            yield token + " "
+
+    async def achat_completion(self, messages, context="", strict=False):
+        self.calls.append((messages, context))
+        return self.reply
+
+
+class FailingChatService(RecordingChatService):
+    """Upstream that fails every call after a first partial token"""
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    async def astream_chat_completion(self, messages, context="", strict=False):
+        self.calls.append((messages, context))
+        yield "partial "
+        raise self.error
+
+    async def achat_completion(self, messages, context="", strict=False):
+        self.calls.append((messages, context))
+        raise self.error
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = ChatSessionStore(max_sessions=10, ttl_seconds=60, token_budget=500, keep_messages=2)
+    monkeypatch.setattr(chat_sessions, "_chat_session_store_instance", store)
+    return store
+
+
+def _client(monkeypatch, service):
+    monkeypatch.setattr(router_inference, "get_llm_service", lambda: service)
+    app = FastAPI()
+    app.include_router(router_inference.router)
+    return TestClient(app)
+
+
+class TestChatSessionStore:
+    """Test suite for ChatSessionStore"""
+
+    def test_compacts_old_turns_under_budget(self, store):
+        session = store.create(context="GST help")
+        for turn in range(10):
+            store.append(session, "user", f"Question {turn} " + "about invoices " * 20)
+            store.append(session, "assistant", f"Answer {turn} " + "फ़ाइल करें " * 20)
+
+        assert len(session.messages) >= store.keep_messages
+        assert session.messages[-1]["content"].startswith("Answer 9")
+        assert session.tokens() <= store.token_budget
+        assert session.compacted_turns == 20 - len(session.messages)
+        assert session.prompt_context().startswith("GST help\n\nEarlier in this conversation:")
+        assert estimate_tokens("\n".join(session.summary)) <= store.token_budget // 4
+        assert store.stats()["compactions"] > 0
+
+    def test_keeps_recent_messages_over_budget(self, store):
+        session = store.create()
+        store.append(session, "user", "x" * 8000)
+
+        assert session.messages == [{"role": "user", "content": "x" * 8000}]
+        assert session.summary == []
+
+    def test_ttl_and_lru_eviction(self, store):
+        session = store.create(context="a")
+        session.last_used = time.time() - 120
+
+        assert store.get(session.session_id) is None
+        assert store.stats()["expirations"] == 1
+
+        ids = [store.create().session_id for _ in range(11)]
+        assert store.get(ids[0]) is None
+        assert store.get(ids[-1]) is not None
+        assert store.stats()["evictions"] == 1
+
+
+class TestChatSessionEndpoint:
+    """Test suite for /v1/chat with session_id and message"""
+
+    def test_client_sends_only_new_message(self, monkeypatch, store):
+        service = RecordingChatService()
+        client = _client(monkeypatch, service)
+
+        first = client.post("/v1/chat", json={"message": "GST kya hai?", "context": "Tax news"}).json()
+        session_id = first["session_id"]
+        assert first["success"] is True and first["response"] == "ठीक है"
+
+        second = client.post("/v1/chat", json={"session_id": session_id, "message": "Aur rate?"})
+        assert second.headers["X-Chat-Session-Id"] == session_id
+
+        messages, context = service.calls[-1]
+        assert [m["content"] for m in messages] == ["GST kya hai?", "ठीक है", "Aur rate?"]
+        assert context == "Tax news"
+        history = client.get(f"/v1/chat/sessions/{session_id}").json()
+        assert len(history["messages"]) == 4
+
+    def test_streamed_reply_is_stored(self, monkeypatch, store):
+        client = _client(monkeypatch, RecordingChatService("नमस्ते दोस्त"))
+        response = client.post("/v1/chat", json={"message": "hi"}, headers={"Accept": "application/x-ndjson"})
+
+        done = [json.loads(line) for line in response.text.splitlines()][-1]
+        assert done["type"] == "done"
+        session = store.get(done["session_id"])
+        assert session.messages[-1] == {"role": "assistant", "content": "नमस्ते दोस्त "}
+
+    def test_context_ref_and_unknown_session(self, monkeypatch, store):
+        service = RecordingChatService()
+        client = _client(monkeypatch, service)
+        item = {"id": "feed-1", "title": "GST rate cut", "summary": "Rates fall to 5%", "source": "PIB"}
+
+        class FeedCache:
+            def find_item(self, item_id):
+                return item if item_id == "feed-1" else None
+
+        class Engine:
+            feed_cache = FeedCache()
+
+        monkeypatch.setattr(router_inference, "get_enhanced_inference_engine", lambda: Engine())
+
+        client.post("/v1/chat", json={"message": "Explain", "context_ref": "feed-1"})
+        assert 'asking about "GST rate cut"' in service.calls[-1][1]
+
+        assert client.post("/v1/chat", json={"session_id": "gone", "message": "hi"}).status_code == 404
+        assert client.post("/v1/chat", json={"context": "no messages"}).status_code == 422
+        assert client.delete("/v1/chat/sessions/gone").status_code == 404
+
+    def test_failed_reply_leaves_history_untouched(self, monkeypatch, store):
+        service = RecordingChatService()
+        client = _client(monkeypatch, service)
+        session_id = client.post("/v1/chat", json={"message": "GST kya hai?"}).json()["session_id"]
+
+        monkeypatch.setattr(router_inference, "get_llm_service", lambda: FailingChatService(RuntimeError("upstream reset")))
+        failed = client.post("/v1/chat", json={"session_id": session_id, "message": "Aur rate?"})
+        assert failed.status_code == 502
+        assert failed.json() == {"success": False, "error": "upstream reset", "session_id": session_id}
+
+        streamed = client.post(
+            "/v1/chat",
+            json={"session_id": session_id, "message": "Aur rate?"},
+            headers={"Accept": "application/x-ndjson"}
+        )
+        assert [json.loads(line) for line in streamed.text.splitlines()][-1]["type"] == "error"
+
+        monkeypatch.setattr(router_inference, "get_llm_service", lambda: FailingChatService(ChatUnavailableError("no key")))
+        assert client.post("/v1/chat", json={"session_id": session_id, "message": "Aur rate?"}).status_code == 503
+
+        assert [m["content"] for m in store.get(session_id).messages] == ["GST kya hai?", "ठीक है"]
+
+        monkeypatch.setattr(router_inference, "get_llm_service", lambda: service)
+        client.post("/v1/chat", json={"session_id": session_id, "message": "Aur rate?"})
+        assert [m["role"] for m in store.get(session_id).messages] == ["user", "assistant", "user", "assistant"]
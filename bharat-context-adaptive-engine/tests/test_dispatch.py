@@ -0,0 +1,107 @@
+"""
+Test cases for the blocking-call dispatcher
+"""
+
+import time
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src import dispatch
+from src.dispatch import Dispatcher, DispatchOverloaded
+from src.metrics import get_metrics, collect_upstream_calls, track_upstream
+
+
+class TestDispatcher:
+    """Test suite for Dispatcher"""
+
+    def test_runs_off_event_loop(self):
+        dispatcher = Dispatcher(max_workers=2, max_queue=2, name="test-thread")
+
+        async def main():
+            loop_thread = threading.current_thread()
+            worker_thread = await dispatcher.run(threading.current_thread)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = asyncio.run(main())
+        assert worker_thread is not loop_thread
+        assert worker_thread.name.startswith("dispatch-test-thread")
+        dispatcher.shutdown()
+
+    def test_blocking_calls_overlap(self):
+        """Blocking calls no longer serialize the event loop"""
+        dispatcher = Dispatcher(max_workers=4, max_queue=0, name="test-overlap")
+
+        async def main():
+            started = time.perf_counter()
+            await asyncio.gather(*(dispatcher.run(time.sleep, 0.2) for _ in range(4)))
+            return time.perf_counter() - started
+
+        assert asyncio.run(main()) < 0.6
+        assert dispatcher.completed == 4
+        dispatcher.shutdown()
+
+    def test_admission_control(self):
+        """Calls beyond max_workers + max_queue are rejected with 429"""
+        dispatcher = Dispatcher(max_workers=1, max_queue=1, name="test-admission")
+        release = threading.Event()
+
+        async def main():
+            running = asyncio.ensure_future(dispatcher.run(release.wait, 5))
+            queued = asyncio.ensure_future(dispatcher.run(release.wait, 5))
+            await asyncio.sleep(0.05)
+            assert dispatcher.active == 1
+            assert dispatcher.queue_depth == 1
+
+            with pytest.raises(DispatchOverloaded) as exc:
+                await dispatcher.run(release.wait, 5)
+            assert exc.value.status_code == 429
+            assert exc.value.headers["Retry-After"] == "1"
+
+            release.set()
+            await asyncio.gather(running, queued)
+
+        asyncio.run(main())
+        assert dispatcher.rejected == 1
+        assert dispatcher.stats()["queue_depth"] == 0
+
+        exported = get_metrics().render_prometheus()
+        assert 'bharat_dispatch_rejected_total{pool="test-admission"} 1' in exported
+        assert 'bharat_dispatch_queue_depth{pool="test-admission"} 0' in exported
+        dispatcher.shutdown()
+
+    def test_context_carried_to_thread(self):
+        """Upstream calls made on a dispatch thread reach the request's collector"""
+        dispatcher = Dispatcher(max_workers=1, max_queue=0, name="test-context")
+
+        def upstream():
+            with track_upstream("openrouter", "chat"):
+                pass
+
+        async def main():
+            with collect_upstream_calls() as calls:
+                await dispatcher.run(upstream)
+            return calls
+
+        calls = asyncio.run(main())
+        assert [call["call"] for call in calls] == ["chat"]
+        dispatcher.shutdown()
+
+    def test_endpoint_returns_429(self, monkeypatch):
+        from src.router_inference import router
+
+        saturated = Dispatcher(max_workers=1, max_queue=0, name="test-endpoint")
+        saturated.pending = 1
+        monkeypatch.setattr(dispatch, "_dispatcher_instance", saturated)
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+
+        response = client.post("/v1/infer?enhanced=false", json={"signals": {"hour_of_day": 7}})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
+        saturated.shutdown()
@@ -0,0 +1,134 @@
+"""
+Test cases for the bounded explanation store
+"""
+
+import time
+import threading
+from src.explanation_models import InferenceExplanation, ExplanationEvent, ExplanationEventType
+from src.explanation_store import ExplanationStore
+
+
+def _explanation(inference_id: str, payload_size: int = 10) -> InferenceExplanation:
+    explanation = InferenceExplanation(inference_id=inference_id, final_user_need_state="Student")
+    explanation.add_event(ExplanationEvent(
+        event_type=ExplanationEventType.SIGNAL_EXTRACTION,
+        step=1,
+        description="Extracted signals",
+        input_signals={"blob": "x" * payload_size}
+    ))
+    return explanation
+
+
+class TestExplanationStore:
+    """Test suite for ExplanationStore"""
+
+    def test_mapping_protocol(self):
+        store = ExplanationStore()
+        store["a"] = _explanation("a")
+
+        assert "a" in store
+        assert "b" not in store
+        assert store["a"].inference_id == "a"
+        assert store.get("b") is None
+        assert list(store.keys()) == ["a"]
+        assert len(store) == 1
+
+    def test_count_cap_evicts_lru(self):
+        store = ExplanationStore(max_entries=2)
+        store["a"] = _explanation("a")
+        store["b"] = _explanation("b")
+        store.get("a")  # a becomes most recently used
+        store["c"] = _explanation("c")
+
+        assert store.keys() == ["a", "c"]
+        assert store.stats()["evictions"] == 1
+
+    def test_byte_cap(self):
+        store = ExplanationStore(max_entries=100, max_bytes=5000)
+        for i in range(10):
+            store[str(i)] = _explanation(str(i), payload_size=1000)
+
+        assert store.bytes <= 5000
+        assert len(store) < 10
+        assert "9" in store
+
+    def test_ttl_expiry(self):
+        store = ExplanationStore(ttl_seconds=0.01)
+        store["a"] = _explanation("a")
+        time.sleep(0.02)
+
+        assert store.get("a") is None
+        assert store.stats()["expirations"] == 1
+
+    def test_spill_serves_evicted_entries(self, tmp_path):
+        store = ExplanationStore(max_entries=2, spill_dir=str(tmp_path))
+        for i in range(5):
+            store[str(i)] = _explanation(str(i))
+        store.flush()
+
+        assert len(store) == 2
+        assert "0" in store
+        restored = store["0"]
+        assert restored.inference_id == "0"
+        assert restored.final_user_need_state == "Student"
+        assert restored.events[0].input_signals == {"blob": "x" * 10}
+        stats = store.stats()
+        assert stats["spilled"] == 3
+        assert stats["disk_hits"] == 1
+        store.close()
+
+    def test_spill_size_bound_drops_oldest_segments(self, tmp_path):
+        store = ExplanationStore(max_entries=1, spill_dir=str(tmp_path), spill_max_bytes=4000)
+        store.spill.segment_bytes = 1000
+        for i in range(20):
+            store[str(i)] = _explanation(str(i), payload_size=500)
+        store.flush()
+
+        assert store.spill.total_bytes() <= 4000 + 1000
+        assert "0" not in store
+        assert "18" in store
+        assert store.stats()["spill_dropped"] > 0
+        store.close()
+
+    def test_spill_adopts_segments_from_earlier_runs(self, tmp_path):
+        store = ExplanationStore(max_entries=1, spill_dir=str(tmp_path))
+        for i in range(4):
+            store[str(i)] = _explanation(str(i), payload_size=500)
+        store.close()
+        with open(tmp_path / "00000000.jsonl", "ab") as f:
+            f.write(b'{"inference_id":"torn","events":[')
+
+        restarted = ExplanationStore(max_entries=1, spill_dir=str(tmp_path))
+        assert "0" in restarted and "torn" not in restarted
+        assert restarted["0"].events[0].input_signals == {"blob": "x" * 500}
+        assert restarted.stats()["spill_adopted"] == 3
+        assert restarted.spill.total_bytes() == (tmp_path / "00000000.jsonl").stat().st_size
+        restarted.close()
+
+        bounded = ExplanationStore(max_entries=1, spill_dir=str(tmp_path), spill_max_bytes=1000)
+        bounded.spill.segment_bytes = 1000
+        for i in range(4, 8):
+            bounded[str(i)] = _explanation(str(i), payload_size=500)
+        bounded.flush()
+        assert "0" not in bounded and "6" in bounded
+        assert bounded.spill.total_bytes() <= 1000 + 1000
+        assert not (tmp_path / "00000000.jsonl").exists()
+        bounded.close()
+
+    def test_spill_writes_happen_off_the_caller_thread(self, tmp_path, monkeypatch):
+        serialized_on = []
+        serialize = ExplanationStore._serialize
+
+        def recording_serialize(explanation):
+            serialized_on.append(threading.current_thread().name)
+            return serialize(explanation)
+
+        monkeypatch.setattr(ExplanationStore, "_serialize", staticmethod(recording_serialize))
+        store = ExplanationStore(max_entries=1, spill_dir=str(tmp_path))
+        for i in range(3):
+            store[str(i)] = _explanation(str(i))
+        assert store["0"].inference_id == "0"  # readable while the write is pending
+        store.close()
+
+        assert serialized_on == ["explanation-spill", "explanation-spill"]
+        assert store.stats()["spilled"] == 2 and store.stats()["spill_pending"] == 0
@@ -0,0 +1,193 @@
+"""
+Test cases for the persona-keyed feed cache
+"""
+
+import asyncio
+import time
+from src.feed_cache import FeedCache
+
+
+class CountingLoader:
+    """Feed loader stand-in that records upstream calls"""
+
+    def __init__(self, delay: float = 0.05, items=None):
+        self.delay = delay
+        self.items = items
+        self.calls = []
+
+    def _feed(self, user_need_state, language):
+        self.calls.append((user_need_state, language))
+        if self.items is not None:
+            return list(self.items)
+        return [{"id": str(len(self.calls)), "title": f"{user_need_state}/{language}"}]
+
+    async def __call__(self, user_need_state, language):
+        await asyncio.sleep(self.delay)
+        return self._feed(user_need_state, language)
+
+    def sync(self, user_need_state, language):
+        return self._feed(user_need_state, language)
+
+
+class TestFeedCache:
+    """Test suite for FeedCache"""
+
+    def test_fresh_hit_skips_upstream(self):
+        loader = CountingLoader()
+        cache = FeedCache(loader, fresh_seconds=60)
+
+        async def run():
+            first = await cache.get("Small Business Owner", "hindi")
+            second = await cache.get("Small Business Owner", "hindi")
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first == second
+        assert loader.calls == [("Small Business Owner", "hindi")]
+        assert cache.stats()["hits"] == 1
+
+    def test_keys_are_per_persona(self):
+        loader = CountingLoader()
+        cache = FeedCache(loader)
+
+        async def run():
+            await cache.get("Student", "hindi")
+            await cache.get("Student", "english")
+            await cache.get("Farmer", "hindi")
+
+        asyncio.run(run())
+        assert len(loader.calls) == 3
+
+    def test_concurrent_misses_share_one_call(self):
+        loader = CountingLoader(delay=0.1)
+        cache = FeedCache(loader)
+
+        async def run():
+            return await asyncio.gather(*[cache.get("Student", "hindi") for _ in range(20)])
+
+        results = asyncio.run(run())
+        assert len(loader.calls) == 1
+        assert all(result == results[0] for result in results)
+
+    def test_stale_served_while_revalidating(self):
+        loader = CountingLoader(delay=0.05)
+        cache = FeedCache(loader, fresh_seconds=0.01, max_stale_seconds=60)
+
+        async def run():
+            first = await cache.get("Student", "hindi")
+            await asyncio.sleep(0.02)
+            start = time.perf_counter()
+            stale = await cache.get("Student", "hindi")
+            elapsed = time.perf_counter() - start
+            await asyncio.sleep(0.1)
+            refreshed = await cache.get("Student", "hindi")
+            return first, stale, elapsed, refreshed
+
+        first, stale, elapsed, refreshed = asyncio.run(run())
+        assert stale == first
+        assert elapsed < 0.05
+        assert refreshed[0]["upstream_id"] == "2"
+        assert cache.stats()["stale_hits"] >= 1
+
+    def test_empty_result_keeps_previous_feed(self):
+        loader = CountingLoader(delay=0)
+        cache = FeedCache(loader, fresh_seconds=0, max_stale_seconds=60)
+
+        async def run():
+            good = await cache.get("Student", "hindi")
+            loader.items = []
+            await asyncio.sleep(0.01)
+            await cache.get("Student", "hindi")
+            await asyncio.sleep(0.01)
+            return good, await cache.get("Student", "hindi")
+
+        good, later = asyncio.run(run())
+        assert later == good
+
+    def test_cancelled_caller_still_warms_cache(self):
+        loader = CountingLoader(delay=0.05)
+        cache = FeedCache(loader)
+
+        async def run():
+            task = asyncio.ensure_future(cache.get("Student", "hindi"))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.sleep(0.1)
+            return await cache.get("Student", "hindi")
+
+        feed = asyncio.run(run())
+        assert feed
+        assert len(loader.calls) == 1
+
+    def test_background_refresh(self):
+        loader = CountingLoader(delay=0)
+        cache = FeedCache(loader, fresh_seconds=0, refresh_interval=0.02)
+
+        async def run():
+            await cache.get("Student", "hindi")
+            cache.start()
+            await asyncio.sleep(0.1)
+            await cache.stop()
+
+        asyncio.run(run())
+        assert len(loader.calls) > 1
+
+    def test_sync_path_and_lru_bound(self):
+        loader = CountingLoader()
+        cache = FeedCache(loader, sync_loader=loader.sync, max_entries=2)
+
+        cache.get_sync("Student", "hindi")
+        cache.get_sync("Student", "hindi")
+        cache.get_sync("Farmer", "hindi")
+        cache.get_sync("Homemaker", "hindi")
+
+        assert len(loader.calls) == 3
+        assert cache.stats()["entries"] == 2
+
+    def test_sync_stale_served_while_revalidating(self):
+        loader = CountingLoader()
+
+        def slow_sync(user_need_state, language):
+            time.sleep(0.1)
+            return loader._feed(user_need_state, language)
+
+        cache = FeedCache(loader, sync_loader=slow_sync, fresh_seconds=0.01, max_stale_seconds=60)
+        first = cache.get_sync("Student", "hindi")
+        time.sleep(0.02)
+
+        start = time.perf_counter()
+        stale = cache.get_sync("Student", "hindi")
+        cache.get_sync("Student", "hindi")
+        elapsed = time.perf_counter() - start
+        time.sleep(0.2)
+
+        assert stale == first
+        assert elapsed < 0.05
+        assert len(loader.calls) == 2
+        assert cache.get_sync("Student", "hindi")[0]["upstream_id"] == "2"
+
+    def test_ids_assigned_on_store_and_entries_not_shared(self):
+        loader = CountingLoader(items=[{"title": "Mandi prices"}])
+        cache = FeedCache(loader, sync_loader=loader.sync)
+
+        first = cache.get_sync("Farmer", "hindi")
+        first[0]["title"] = "changed by caller"
+        second = cache.get_sync("Farmer", "hindi")
+
+        assert first[0]["id"] and second[0]["id"] == first[0]["id"]
+        assert second[0]["title"] == "Mandi prices"
+        assert cache.find_item(first[0]["id"])["title"] == "Mandi prices"
+        assert "id" not in loader.items[0]
+
+    def test_ids_unique_across_personas(self):
+        loader = CountingLoader(items=[{"id": "news_1", "title": "Same upstream id"}])
+        cache = FeedCache(loader, sync_loader=loader.sync)
+
+        farmer = cache.get_sync("Farmer", "hindi")[0]
+        student = cache.get_sync("Student", "english")[0]
+
+        assert farmer["upstream_id"] == student["upstream_id"] == "news_1"
+        assert farmer["id"] != student["id"]
+        assert cache.find_item(farmer["id"]) == farmer
+        assert cache.find_item(student["id"]) == student
+        assert cache.find_item("news_1") is None
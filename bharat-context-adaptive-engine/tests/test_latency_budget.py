@@ -0,0 +1,118 @@
+"""
+Test cases for latency-budgeted inference
+"""
+
+import asyncio
+import time
+from src.models import RawSignals, TimeOfDay
+from src.inference_engine import InferenceEngine
+from src.latency_budget import LatencyBudget, TIER_ENHANCED, TIER_LLM, TIER_WEB_CONTEXT, TIER_FEED
+from tests.test_async_inference import StubLLMService, _engine
+
+
+ESTIMATES = {TIER_ENHANCED: 0.01, TIER_LLM: 0.5, TIER_WEB_CONTEXT: 0.3, TIER_FEED: 0.2}
+ALL_TIERS = [TIER_ENHANCED, TIER_LLM, TIER_WEB_CONTEXT, TIER_FEED]
+
+
+class TestLatencyBudget:
+    """Test suite for LatencyBudget planning"""
+
+    def test_generous_budget_keeps_all_tiers(self):
+        assert LatencyBudget(5000).plan(ALL_TIERS, ESTIMATES) == []
+
+    def test_tiers_dropped_in_order(self):
+        # LLM alone (0.51s) fits, web context and feed do not matter
+        assert LatencyBudget(700).plan(ALL_TIERS, ESTIMATES) == []
+        assert LatencyBudget(400).plan(ALL_TIERS, ESTIMATES) == [TIER_FEED, TIER_WEB_CONTEXT, TIER_LLM]
+        assert LatencyBudget(1).plan(ALL_TIERS, ESTIMATES) == [TIER_FEED, TIER_WEB_CONTEXT, TIER_LLM, TIER_ENHANCED]
+
+    def test_remaining(self):
+        budget = LatencyBudget(50)
+        assert 0 < budget.remaining() <= 0.05
+        time.sleep(0.06)
+        assert budget.remaining() == 0.0
+
+
+class TestBudgetedInference:
+    """Test suite for EnhancedInferenceEngine.ainfer_with_explanation with a budget"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.signals = RawSignals(
+            business_apps=["khatabook"],
+            whatsapp_business_usage="yes",
+            time_of_day=TimeOfDay.EVENING,
+            hour_of_day=19
+        )
+
+    def test_no_budget_applies_all_tiers(self):
+        engine = _engine(StubLLMService(delay=0.0))
+
+        output = asyncio.run(engine.ainfer(self.signals))
+
+        assert output.applied_tiers == ["rules", "enhanced", "llm", "web_context", "feed"]
+        assert output.dropped_tiers == []
+
+    def test_slow_upstreams_cancelled_at_deadline(self, monkeypatch):
+        monkeypatch.setattr(
+            "src.inference_engine_enhanced.estimate_tiers",
+            lambda: {tier: 0.0 for tier in ALL_TIERS}
+        )
+        engine = _engine(StubLLMService(delay=0.5))
+
+        start = time.perf_counter()
+        result = asyncio.run(engine.ainfer_with_explanation(self.signals, LatencyBudget(100)))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.3
+        assert result.output.dropped_tiers == [TIER_LLM, TIER_WEB_CONTEXT, TIER_FEED]
+        assert result.output.applied_tiers == ["rules", TIER_ENHANCED]
+        assert result.output.feed == []
+        assert engine.get_explanation(result.inference_id) is result.explanation
+
+    def test_exhausted_budget_returns_pure_rules(self):
+        engine = _engine(StubLLMService(delay=0.5))
+
+        result = asyncio.run(engine.ainfer_with_explanation(self.signals, LatencyBudget(0.001)))
+        rules_output = InferenceEngine.infer(engine, self.signals)
+
+        assert result.output.applied_tiers == ["rules"]
+        assert result.output.user_need_state == rules_output.user_need_state
+        assert result.output.matched_rule == rules_output.matched_rule
+        assert engine.get_explanation(result.inference_id) is not None
+
+    def test_planned_tiers_part_of_coalescing_key(self, monkeypatch):
+        monkeypatch.setattr("src.inference_engine_enhanced.estimate_tiers", lambda: ESTIMATES)
+        engine = _engine(StubLLMService(delay=0.1))
+
+        async def run():
+            return await asyncio.gather(
+                engine.ainfer_with_explanation(self.signals, LatencyBudget(400)),
+                engine.ainfer_with_explanation(self.signals.model_copy())
+            )
+
+        budgeted, unbudgeted = asyncio.run(run())
+
+        assert engine.coalesced_requests == 0
+        assert budgeted.output.dropped_tiers == [TIER_FEED, TIER_WEB_CONTEXT, TIER_LLM]
+        assert unbudgeted.output.dropped_tiers == []
+
+    def test_follower_does_not_share_degraded_result(self, monkeypatch):
+        monkeypatch.setattr(
+            "src.inference_engine_enhanced.estimate_tiers",
+            lambda: {tier: 0.0 for tier in ALL_TIERS}
+        )
+        engine = _engine(StubLLMService(delay=0.3))
+
+        async def run():
+            return await asyncio.gather(
+                engine.ainfer_with_explanation(self.signals, LatencyBudget(100)),
+                engine.ainfer_with_explanation(self.signals.model_copy())
+            )
+
+        budgeted, unbudgeted = asyncio.run(run())
+
+        assert engine.coalesced_requests == 1
+        assert TIER_LLM in budgeted.output.dropped_tiers
+        assert unbudgeted.output.dropped_tiers == []
+        assert unbudgeted.explanation.coalesced_from is None
@@ -0,0 +1,94 @@
+"""
+Test cases for the LLM inference cache
+"""
+
+import time
+import pytest
+from datetime import datetime
+from src.models import RawSignals, TimeOfDay
+from src.llm_cache import TTLCache, LLMInferenceCache, signal_fingerprint
+
+
+class TestSignalFingerprint:
+    """Test canonical signal keys"""
+
+    def test_ignores_volatile_fields_and_list_order(self):
+        """Timestamps and app-list order do not change the key"""
+        first = RawSignals(
+            payment_apps_installed=["paytm", "phonepe"],
+            time_of_day=TimeOfDay.EVENING,
+            timestamp=datetime(2024, 1, 1)
+        )
+        second = RawSignals(
+            time_of_day="evening",
+            payment_apps_installed=["phonepe", "paytm"],
+            timestamp=datetime(2025, 6, 1)
+        )
+
+        assert signal_fingerprint(first, "v1") == signal_fingerprint(second, "v1")
+
+    def test_namespace_and_signals_change_key(self):
+        """Prompt version, model and signal values are part of the key"""
+        signals = RawSignals(system_language="hi")
+
+        assert signal_fingerprint(signals, "v1") != signal_fingerprint(signals, "v2")
+        assert signal_fingerprint(signals, "v1") != signal_fingerprint(RawSignals(system_language="ta"), "v1")
+
+    def test_sequence_fields_keep_order(self):
+        """screen_views is a navigation sequence, so different journeys get different keys"""
+        home_first = RawSignals(screen_views=["home", "chat"], business_apps=["khatabook", "okcredit"])
+        chat_first = RawSignals(screen_views=["chat", "home"], business_apps=["okcredit", "khatabook"])
+
+        assert signal_fingerprint(home_first, "v1") != signal_fingerprint(chat_first, "v1")
+        assert signal_fingerprint(home_first, "v1") == signal_fingerprint(
+            RawSignals(screen_views=["home", "chat"], business_apps=["okcredit", "khatabook"]), "v1"
+        )
+
+
+class TestTTLCache:
+    """Test the in-process tier"""
+
+    def test_lru_eviction(self):
+        """Least recently used entry is evicted first"""
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.evictions == 1
+
+    def test_ttl_expiry(self):
+        """Entries expire after the TTL"""
+        cache = TTLCache(max_entries=10, ttl_seconds=60)
+        cache.set("a", 1, stored_at=time.time() - 120)
+
+        assert cache.get("a") is None
+
+
+class TestLLMInferenceCache:
+    """Test the two-tier cache"""
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new cache on the same file serves earlier results"""
+        path = str(tmp_path / "llm.sqlite3")
+        LLMInferenceCache(disk_path=path).set("key", {"user_need_state": "Student"})
+
+        restarted = LLMInferenceCache(disk_path=path)
+
+        assert restarted.get("key") == {"user_need_state": "Student"}
+        assert restarted.disk_hits == 1
+
+    def test_returns_copies(self):
+        """Mutating a returned value does not change the cache"""
+        cache = LLMInferenceCache()
+        cache.set("key", {"recommended_actions": ["a"]})
+        cache.get("key")["recommended_actions"].append("b")
+
+        assert cache.get("key") == {"recommended_actions": ["a"]}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
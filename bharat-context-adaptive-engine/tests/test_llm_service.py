@@ -0,0 +1,108 @@
+"""
+Test cases for LLMService async clients
+"""
+
+import asyncio
+import json
+import httpx
+import pytest
+from src.llm_service import LLMService
+
+
+def _perplexity_response(content: str) -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+class TestLLMServiceAsync:
+    """Test suite for the pooled async client path"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.service = LLMService()
+        self.service.perplexity_key = "mock_key"
+        self.requests = []
+
+    def _mock_client(self, content: str) -> httpx.AsyncClient:
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return _perplexity_response(content)
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def test_startup_and_shutdown(self):
+        """Clients are created on startup and closed on shutdown"""
+        async def run():
+            await self.service.startup()
+            client = self.service.http_client
+            assert client is not None and not client.is_closed
+            await self.service.shutdown()
+            assert client.is_closed
+            assert self.service.http_client is None
+        asyncio.run(run())
+
+    def test_calls_share_pooled_client(self):
+        """Async Perplexity calls reuse the long-lived client"""
+        feed = [{"id": "1", "type": "news", "title": "GST update", "summary": "..."}]
+
+        async def run():
+            self.service.http_client = self._mock_client(f"```json\n{json.dumps(feed)}\n```")
+            first = await self.service.agenerate_feed_from_perplexity("Shop Owner", "hindi")
+            second = await self.service.aget_web_intelligence("query")
+            await self.service.shutdown()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first == feed
+        assert "GST update" in second
+        assert len(self.requests) == 2
+        assert self.requests[0].headers["Authorization"] == "Bearer mock_key"
+
+    def test_sync_calls_share_pooled_client(self):
+        """Sync Perplexity calls reuse one pooled client closed on shutdown"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return _perplexity_response("[]" if b"headlines" in request.content else "GST context")
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        self.service.sync_http_client = client
+
+        assert self.service.get_web_intelligence("query") == "GST context"
+        assert self.service.generate_feed_from_perplexity("Shop Owner", "hindi") == []
+        assert len(self.requests) == 2 and self.service.sync_http_client is client
+
+        asyncio.run(self.service.shutdown())
+        assert client.is_closed and self.service.sync_http_client is None
+
+    def test_missing_openrouter_key(self):
+        """Async reasoning without a key returns the configured-error result"""
+        self.service.openrouter_key = None
+
+        async def run():
+            result = await self.service.ainfer_user_profile_with_reasoning(signals=None)
+            await self.service.shutdown()
+            return result
+
+        result = asyncio.run(run())
+
+        assert result["error"] == "OpenRouter API Key not configured"
+
+    def test_base_urls_from_env(self, monkeypatch):
+        """Upstream URLs can be pointed at a local server"""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "mock_key")
+        monkeypatch.setenv("OPENROUTER_BASE_URL", "http://127.0.0.1:9000/api/v1")
+        monkeypatch.setenv("PERPLEXITY_URL", "http://127.0.0.1:9000/chat/completions")
+        service = LLMService()
+
+        async def run():
+            await service.startup()
+            base_url = str(service.async_openai_client.base_url)
+            await service.shutdown()
+            return base_url
+
+        assert str(service.openai_client.base_url).startswith("http://127.0.0.1:9000/api/v1")
+        assert asyncio.run(run()).startswith("http://127.0.0.1:9000/api/v1")
+        assert service.perplexity_url == "http://127.0.0.1:9000/chat/completions"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+"""
+Test cases for latency metrics
+"""
+
+import asyncio
+from src.metrics import MetricsRegistry, RollingHistogram, get_metrics, track_upstream, collect_upstream_calls, \
+    STAGE_SECONDS, UPSTREAM_SECONDS
+from src.models import RawSignals
+from src.inference_engine_enhanced import EnhancedInferenceEngine
+
+
+class TestMetrics:
+    """Test suite for MetricsRegistry"""
+
+    def test_rolling_quantiles(self):
+        histogram = RollingHistogram(window=100)
+        for value in range(1, 201):
+            histogram.observe(float(value))
+
+        quantiles = histogram.quantiles()
+        assert histogram.count == 200
+        assert quantiles[0.5] == 151.0   # window holds 101..200
+        assert quantiles[0.99] == 200.0
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.observe(STAGE_SECONDS, 0.25, stage="rule_scoring")
+        registry.observe(STAGE_SECONDS, 0.75, stage="rule_scoring")
+
+        text = registry.render_prometheus()
+        assert f"# TYPE {STAGE_SECONDS} summary" in text
+        assert f'{STAGE_SECONDS}{{stage="rule_scoring",quantile="0.5"}} 0.750000' in text
+        assert f'{STAGE_SECONDS}_count{{stage="rule_scoring"}} 2' in text
+        assert f'{STAGE_SECONDS}_sum{{stage="rule_scoring"}} 1.000000' in text
+
+    def test_track_upstream_collects_calls(self):
+        with collect_upstream_calls() as calls:
+            with track_upstream("perplexity", "feed"):
+                pass
+            try:
+                with track_upstream("openrouter", "reasoning"):
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+
+        assert [(c["call"], c["outcome"]) for c in calls] == [("feed", "ok"), ("reasoning", "error")]
+        assert get_metrics().quantile(UPSTREAM_SECONDS, 0.5, service="openrouter",
+                                      call="reasoning", outcome="error") is not None
+
+    def test_engine_records_stage_durations(self):
+        engine = EnhancedInferenceEngine(use_web_context=False)
+        signals = RawSignals(business_apps=["khatabook"], hour_of_day=19)
+
+        result = engine.infer_with_explanation(signals)
+        async_result = asyncio.run(engine.ainfer_with_explanation(signals))
+
+        for explanation in (result.explanation, async_result.explanation):
+            assert len(explanation.events) == 8
+            assert all(event.duration_ms is not None and event.duration_ms >= 0
+                       for event in explanation.events)
+        assert get_metrics().quantile(STAGE_SECONDS, 0.95, stage="rule_scoring") is not None
+        assert get_metrics().quantile(STAGE_SECONDS, 0.95, stage="feed_generation") is not None
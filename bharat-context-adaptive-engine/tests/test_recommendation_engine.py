@@ -0,0 +1,97 @@
+"""
+Test cases for the memoized recommendation table
+"""
+
+import json
+import itertools
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src import router_recommendations
+from src.models import InferenceOutput, UIMode, LanguagePreference
+from src.recommendation_engine import RecommendationEngine
+
+
+STATES = list(RecommendationEngine.CONTENT_TEMPLATES) + ["First-time AI Explorer"]
+ACTIONS = [["Ask a question", "Try voice", "Translate", "Write a message"], ["A", "B", "C"]]
+
+
+def _output(state, actions, ui_mode, language, confidence):
+    return InferenceOutput(
+        user_need_state=state,
+        confidence=confidence,
+        recommended_actions=actions,
+        ui_mode=ui_mode,
+        language_preference=language,
+        explanation="test"
+    )
+
+
+class TestRecommendationTable:
+    """Test suite for RecommendationEngine memoization"""
+
+    def test_matches_uncached_output(self):
+        engine = RecommendationEngine()
+        combinations = itertools.product(STATES, ACTIONS, UIMode, LanguagePreference, (3.5, 8.0), (0, 1, 7, 3))
+        for state, actions, ui_mode, language, confidence, day in combinations:
+            inference_output = _output(state, actions, ui_mode, language, confidence)
+            expected = engine._build_recommendations(inference_output, day)
+
+            assert engine.generate_recommendations(inference_output, day) == expected
+            assert json.loads(engine.generate_recommendations_json(inference_output, day)) == expected
+
+    def test_only_confidence_varies(self):
+        engine = RecommendationEngine()
+        low = _output(STATES[0], ACTIONS[0], UIMode.STANDARD, LanguagePreference.HINDI, 8.0)
+        high = _output(STATES[0], ACTIONS[0], UIMode.STANDARD, LanguagePreference.HINDI, 9.5)
+
+        first = engine.generate_recommendations(low, day=1)
+        second = engine.generate_recommendations(high, day=1)
+        assert (first["confidence"], second["confidence"]) == (8.0, 9.5)
+        assert first["content"] == second["content"]
+        assert engine.stats()["misses"] == 1
+
+    def test_returned_recommendations_are_copies(self):
+        engine = RecommendationEngine()
+        output = _output(STATES[0], ACTIONS[0], UIMode.STANDARD, LanguagePreference.HINDI, 8.0)
+        expected = engine.generate_recommendations_json(output, day=1)
+
+        first = engine.generate_recommendations(output, day=1)
+        first["content"].clear()
+        second = engine.generate_recommendations(output, day=1)
+
+        assert second["content"]
+        assert engine.generate_recommendations_json(output, day=1) == expected
+        assert engine.stats()["hits"] == 3
+
+    def test_warm_and_bounded(self):
+        engine = RecommendationEngine(max_entries=8)
+        entries = engine.warm([(state, ACTIONS[0], UIMode.LITE) for state in STATES])
+        assert entries == 8
+        assert engine.stats()["misses"] > 8
+
+        warmed = RecommendationEngine()
+        warmed.warm([(STATES[0], ACTIONS[0], UIMode.LITE)])
+        misses = warmed.stats()["misses"]
+        warmed.generate_recommendations(_output(STATES[0], ACTIONS[1], UIMode.LITE, LanguagePreference.MIXED, 1.0), day=0)
+        assert warmed.stats()["misses"] == misses
+
+    def test_endpoint_splices_table(self):
+        router_recommendations.warm_recommendations()
+        app = FastAPI()
+        app.include_router(router_recommendations.router)
+        client = TestClient(app)
+
+        response = client.post("/v1/recommendations/all-days?enhanced=false",
+                               json={"signals": {"system_language": "hi", "hour_of_day": 20}})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["success"] is True
+        assert body["recommendations"]["day_0"]["confidence"] == body["inference"]["confidence"]
+        assert set(body["recommendations"]) == {"day_0", "day_1", "day_7"}
+
+        response = client.post("/v1/recommendations/generate?enhanced=false&day=7", json={"signals": {}})
+        body = response.json()
+        assert body["day"] == 7
+        assert body["recommendations"]["outcome"] == "Day-7 Retention & Growth"
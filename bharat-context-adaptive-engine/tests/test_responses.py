@@ -0,0 +1,72 @@
+"""
+Test cases for fast JSON responses
+"""
+
+import json
+from datetime import datetime
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from src import responses
+from src.models import InferenceOutput, InferenceResponse, FeedItem, UIMode, LanguagePreference
+from src.responses import FastJSONResponse, dumps
+
+
+def _response():
+    feed = [FeedItem(id=str(i), type="tip", title=f"टिप {i}", summary="GST", tags=["gst"]) for i in range(5)]
+    return InferenceResponse(
+        success=True,
+        data=InferenceOutput(
+            user_need_state="Hindi-first User",
+            confidence=8.25,
+            recommended_actions=["a", "b", "c"],
+            ui_mode=UIMode.VOICE_FIRST,
+            language_preference=LanguagePreference.HINDI,
+            explanation="हिंदी",
+            feed=feed,
+            inference_timestamp=datetime(2024, 1, 2, 3, 4, 5, 678)
+        ),
+        processing_time_ms=1.5
+    )
+
+
+class TestFastJSON:
+    """Test suite for dumps and FastJSONResponse"""
+
+    def test_model_matches_fastapi_encoding(self):
+        response = _response()
+        assert json.loads(dumps(response)) == jsonable_encoder(response)
+
+    def test_dict_with_models_and_numpy(self, monkeypatch):
+        content = {
+            "output": _response().data,
+            "when": datetime(2024, 1, 2),
+            "mode": UIMode.LITE,
+            "scores": np.array([0.5, 1.0]),
+            "count": np.int64(3)
+        }
+        expected = jsonable_encoder({**content, "scores": [0.5, 1.0], "count": 3})
+        assert json.loads(dumps(content)) == expected
+
+        monkeypatch.setattr(responses, "ORJSON_AVAILABLE", False)
+        assert json.loads(dumps(content)) == expected
+
+    def test_infer_endpoint(self):
+        from src.router_inference import router
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+
+        response = client.post("/v1/infer?enhanced=false", json={"signals": {"system_language": "hi"}})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        body = response.json()
+        assert body["success"] is True
+        assert InferenceOutput.model_validate(body["data"]).ui_mode in UIMode
+
+        schema = app.openapi()["paths"]["/v1/infer"]["post"]["responses"]["200"]
+        assert schema["content"]["application/json"]["schema"]["$ref"].endswith("/InferenceResponse")
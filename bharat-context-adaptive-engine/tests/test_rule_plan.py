@@ -0,0 +1,66 @@
+"""
+Test cases for compiled rule conditions and the rule execution plan
+"""
+
+import pytest
+
+from src.models import RawSignals, DeviceClass, NetworkType, TimeOfDay
+from src.inference_engine import InferenceEngine, RuleCondition
+
+
+class TestCompiledConditions:
+    """Test suite for RuleCondition predicates"""
+
+    def test_in_operator_with_enum_and_list_values(self):
+        """Test in/not_in against str enums and unhashable list signals"""
+        condition = RuleCondition({
+            "signal": "time_of_day",
+            "operator": "in",
+            "value": ["morning", "evening"],
+            "weight": 1.0
+        })
+        assert condition.evaluate(TimeOfDay.MORNING) == (True, 1.0)
+        assert condition.evaluate(["morning"]) == (False, 0.0)
+
+        condition = RuleCondition({
+            "signal": "time_of_day",
+            "operator": "not_in",
+            "value": ["morning", "evening"],
+            "weight": 1.0
+        })
+        assert condition.evaluate(TimeOfDay.AFTERNOON) == (True, 1.0)
+        assert condition.evaluate(TimeOfDay.EVENING) == (False, 0.0)
+
+
+class TestRuleExecutionPlan:
+    """Test compiled rule plan scoring"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.engine = InferenceEngine()
+
+    @pytest.mark.parametrize("signals", [
+        RawSignals(
+            time_of_day=TimeOfDay.EVENING,
+            hour_of_day=19,
+            system_language="hi",
+            payment_apps_installed=["paytm", "phonepe"],
+            network_type=NetworkType.THREE_G,
+            device_class=DeviceClass.LOW_END
+        ),
+        RawSignals(),
+        RawSignals(first_action="voice", voice_button_tapped="yes", text_input_length="none"),
+    ])
+    def test_plan_matches_per_rule_scoring(self, signals):
+        """Compiled plan must score exactly like InferenceRule.score"""
+        plan_scores = self.engine.plan.score(signals)
+
+        assert len(plan_scores) == len(self.engine.rules)
+        for rule, score, matched_conditions, top_signals in plan_scores:
+            assert (score, matched_conditions, top_signals) == rule.score(signals)
+
+    def test_plan_indexes_every_condition(self):
+        """Every rule condition appears in the signal index"""
+        indexed = sum(len(entries) for entries in self.engine.plan.signal_index.values())
+
+        assert indexed == sum(len(rule.conditions) for rule in self.engine.rules)
@@ -0,0 +1,127 @@
+"""
+Test cases for rules hot reload
+"""
+
+import shutil
+import pytest
+import yaml
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src import rules_watcher
+from src.models import RawSignals
+from src import inference_engine, inference_engine_enhanced, batch_scoring
+from src.inference_engine import InferenceEngine, RuleSet, validate_rules_config
+from src.inference_engine_enhanced import EnhancedInferenceEngine
+from src.rules_watcher import RulesWatcher
+
+
+RULES_PATH = Path(__file__).parent.parent / "src" / "rules.yaml"
+
+
+@pytest.fixture
+def rules_file(tmp_path, monkeypatch):
+    """Copy of rules.yaml wired into fresh shared engines"""
+    path = tmp_path / "rules.yaml"
+    shutil.copy(RULES_PATH, path)
+    monkeypatch.setattr(inference_engine, "_engine_instance", InferenceEngine(path))
+    monkeypatch.setattr(inference_engine_enhanced, "_enhanced_engine_instance",
+                        EnhancedInferenceEngine(path, use_web_context=False))
+    monkeypatch.setattr(batch_scoring, "_batch_scorer_instance", None)
+    return path
+
+
+def _rename_first_state(path: Path, new_state: str) -> str:
+    config = yaml.safe_load(path.read_text(encoding="utf-8"))
+    old_state = config["rules"][0]["output"]["user_need_state"]
+    config["rules"][0]["output"]["user_need_state"] = new_state
+    path.write_text(yaml.safe_dump(config, allow_unicode=True), encoding="utf-8")
+    return old_state
+
+
+class TestRuleSet:
+    """Test suite for RuleSet loading and validation"""
+
+    def test_version_is_content_hash(self):
+        assert RuleSet.load(RULES_PATH).version == RuleSet.load(RULES_PATH).version
+        assert len(RuleSet.load(RULES_PATH).version) == 12
+
+    def test_validation_errors(self):
+        config = {"rules": [
+            {"name": "a", "conditions": [{"signal": "x", "operator": "roughly"}], "output": {}},
+            {"name": "a", "conditions": [], "output": {"user_need_state": "S"}}
+        ]}
+        with pytest.raises(ValueError) as excinfo:
+            validate_rules_config(config)
+        message = str(excinfo.value)
+        assert "unknown operator 'roughly'" in message
+        assert "duplicates rule name 'a'" in message
+        assert "non-empty conditions" in message
+
+
+class TestRulesWatcher:
+    """Test suite for RulesWatcher"""
+
+    def test_reload_swaps_engines(self, rules_file):
+        old_engine = inference_engine.get_inference_engine()
+        old_version = old_engine.ruleset_version
+        rule = old_engine.rules[0]
+        watcher = RulesWatcher(rules_file, poll_interval=0)
+
+        assert watcher.reload()["reloaded"] is False
+
+        _rename_first_state(rules_file, "Renamed State")
+        assert watcher.changed()
+        result = watcher.reload()
+
+        new_engine = inference_engine.get_inference_engine()
+        assert result["reloaded"] is True
+        assert new_engine is not old_engine
+        assert new_engine.ruleset_version == result["version"] != old_version
+        assert new_engine.rules[0].output["user_need_state"] == "Renamed State"
+        # The old engine keeps serving its own version
+        assert old_engine.ruleset_version == old_version
+        assert old_engine.rules[0] is rule
+
+        enhanced = inference_engine_enhanced.get_enhanced_inference_engine()
+        assert enhanced.ruleset_version == result["version"]
+        assert batch_scoring.get_batch_scorer().plan is new_engine.plan
+
+    def test_invalid_file_keeps_current_rules(self, rules_file):
+        engine = inference_engine.get_inference_engine()
+        watcher = RulesWatcher(rules_file, poll_interval=0)
+
+        rules_file.write_text("rules: []\n", encoding="utf-8")
+        result = watcher.reload()
+
+        assert result["reloaded"] is False
+        assert result["error"]
+        assert inference_engine.get_inference_engine() is engine
+        assert watcher.stats()["failures"] == 1
+
+    def test_outputs_carry_version(self, rules_file):
+        engine = inference_engine.get_inference_engine()
+        signals = RawSignals(business_apps=["khatabook"], hour_of_day=19)
+
+        assert engine.infer(signals).ruleset_version == engine.ruleset_version
+        assert batch_scoring.get_batch_scorer().infer([signals])[0].ruleset_version == engine.ruleset_version
+
+    def test_reload_endpoint_requires_token(self, rules_file, monkeypatch):
+        from src.router_inference import router
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+
+        monkeypatch.setattr(rules_watcher, "_rules_watcher_instance", RulesWatcher(rules_file, poll_interval=0))
+        assert client.post("/v1/rules/reload").status_code == 403
+
+        watcher = RulesWatcher(rules_file, poll_interval=0, reload_token="secret")
+        monkeypatch.setattr(rules_watcher, "_rules_watcher_instance", watcher)
+        assert client.post("/v1/rules/reload").status_code == 401
+        assert client.post("/v1/rules/reload", headers={"X-Rules-Reload-Token": "wrong"}).status_code == 401
+
+        _rename_first_state(rules_file, "Renamed State")
+        response = client.post("/v1/rules/reload", headers={"X-Rules-Reload-Token": "secret"})
+        assert response.status_code == 200
+        assert response.json()["reloaded"] is True
@@ -0,0 +1,116 @@
+"""
+Test cases for the shared signal pattern DAG
+"""
+
+import pytest
+
+from src.models import RawSignals
+from src.signal_patterns import PATTERNS, PREDICATES, PatternDAG, get_pattern_dag
+from src.web_intelligence import WebIntelligence
+from src.app_context import AppContext
+from src.llm_reasoning import LLMReasoning
+from src.inference_engine_enhanced import EnhancedInferenceEngine
+
+
+SHOP_OWNER = {
+    "time_of_day": "evening",
+    "hour_of_day": 19,
+    "system_language": "hi",
+    "state": "UP",
+    "business_apps": ["khatabook", "okcredit"],
+    "payment_apps_installed": ["paytm", "phonepe"],
+    "whatsapp_business_usage": "yes",
+    "otp_message_frequency": "high",
+    "banking_sms_presence": "yes",
+}
+
+
+class TestPatternDAG:
+    """Test suite for PatternDAG"""
+
+    def test_each_predicate_evaluated_at_most_once(self):
+        calls = {}
+
+        def counted(name, predicate):
+            def wrapper(signals):
+                calls[name] = calls.get(name, 0) + 1
+                return predicate(signals)
+            return wrapper
+
+        dag = PatternDAG({name: counted(name, p) for name, p in PREDICATES.items()})
+        match = dag.match(RawSignals(**SHOP_OWNER))
+
+        assert calls and max(calls.values()) == 1
+        assert "business_user_strong" in match
+        assert match.family("knowledge") == [
+            "indian_business_culture", "indian_digital_payment_adoption", "indian_language_preferences"
+        ]
+
+    def test_any_of_and_pattern_references(self):
+        dag = PatternDAG(
+            {"a": lambda s: s["a"], "b": lambda s: s["b"], "c": lambda s: s["c"]},
+            {
+                "a_or_b": {"family": None, "when": [("a", "b")]},
+                "both": {"family": "out", "when": ["a_or_b", "c"]},
+                "only_c": {"family": "out", "when": ["c"]},
+            }
+        )
+
+        assert dag.match({"a": False, "b": True, "c": True}).family("out") == ["both", "only_c"]
+        assert dag.match({"a": False, "b": False, "c": True}).family("out") == ["only_c"]
+
+    def test_unreached_predicates_not_evaluated(self):
+        calls = []
+
+        def predicate(name, value):
+            def evaluate(signals):
+                calls.append(name)
+                return value
+            return evaluate
+
+        dag = PatternDAG(
+            {"a": predicate("a", False), "b": predicate("b", True), "c": predicate("c", True)},
+            {
+                "a_and_c": {"family": "out", "when": ["a", "c"]},
+                "b_or_c": {"family": "out", "when": [("b", "c")]},
+                "a_or_b": {"family": "out", "when": [("a", "b")]},
+            }
+        )
+
+        assert dag.match({}).family("out") == ["b_or_c", "a_or_b"]
+        assert calls == ["a", "b"]
+
+    def test_compile_errors(self):
+        with pytest.raises(ValueError, match="later-declared"):
+            PatternDAG({"a": bool}, {"x": {"family": None, "when": ["y"]}, "y": {"family": None, "when": ["a"]}})
+        with pytest.raises(ValueError, match="Duplicate"):
+            PatternDAG({"a": bool}, {"a": {"family": None, "when": ["a"]}})
+
+    def test_every_family_pattern_has_output(self):
+        tables = {
+            "web": WebIntelligence.SIGNAL_PATTERNS,
+            "behaviour": AppContext.CHATGPT_CONTEXT,
+            "use_case": AppContext.INDIAN_USE_CASES,
+            "knowledge": LLMReasoning.WORLD_KNOWLEDGE,
+            "correlation": LLMReasoning.SIGNAL_CORRELATIONS,
+            "engine_correlation": EnhancedInferenceEngine.SIGNAL_CORRELATIONS,
+            "decision_factor": EnhancedInferenceEngine.DECISION_SIGNALS,
+        }
+
+        assert set(get_pattern_dag().families) == set(tables)
+        for name, spec in PATTERNS.items():
+            if spec["family"]:
+                assert name in tables[spec["family"]]
+
+    def test_engine_matches_once_per_request(self, monkeypatch):
+        engine = EnhancedInferenceEngine()
+        monkeypatch.setattr(engine.feed_cache, "get_sync", lambda state, language: [])
+        dag = get_pattern_dag()
+        calls = []
+        original = dag.match
+        monkeypatch.setattr(dag, "match", lambda signals: calls.append(signals) or original(signals))
+
+        result = engine.infer_with_explanation(RawSignals(**SHOP_OWNER))
+
+        assert len(calls) == 1
+        assert "Business apps present" in result.explanation.decision_factors
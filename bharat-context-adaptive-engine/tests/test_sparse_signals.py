@@ -0,0 +1,113 @@
+"""
+Test cases for the sparse signals container
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from src.models import RawSignals, DeviceClass
+from src.inference_engine import InferenceEngine
+from src.web_intelligence import WebIntelligence
+from src.app_context import AppContext
+from src.batch_scoring import BatchScorer
+from src.llm_cache import canonical_signals
+from src.sparse_signals import SparseSignals, SparseInferenceRequest, SignalValidationError
+
+
+EXAMPLE = Path(__file__).parent.parent / "examples" / "small_vendor_signals.json"
+
+PAYLOADS = [
+    json.loads(EXAMPLE.read_text())["signals"],
+    {"time_of_day": "morning", "hour_of_day": 7, "system_language": "hi",
+     "first_action": "voice", "festival_day": "diwali"},
+    {"device_class": "low_end", "network_type": "2g", "payment_apps_installed": ["paytm", "phonepe"],
+     "city_tier": "tier3", "unknown_signal": "ignored"},
+    {},
+]
+
+
+class TestSparseSignals:
+    """Test suite for SparseSignals"""
+
+    def test_only_present_fields_stored(self):
+        signals = SparseSignals.from_payload({"hour_of_day": 7, "device_class": "low_end", "extra": 1})
+
+        assert signals.model_fields_set == {"hour_of_day", "device_class"}
+        assert signals.device_class is DeviceClass.LOW_END
+        assert signals.hour_of_day == 7
+        assert signals.network_type is None
+        assert signals.signal_version == "1.0"
+        assert signals.timestamp is not None
+        with pytest.raises(AttributeError):
+            signals.not_a_signal
+
+    def test_categorical_values_interned(self):
+        first = SparseSignals.from_payload({"state": "".join(["Maha", "rashtra"])})
+        second = SparseSignals.from_payload({"state": "".join(["Mahara", "shtra"])})
+
+        assert first.state is second.state
+
+    def test_validation_errors_per_field(self):
+        with pytest.raises(SignalValidationError) as exc:
+            SparseSignals.from_payload({"hour_of_day": 30, "device_class": "bad", "state": "Bihar"})
+
+        locs = {error["loc"][0] for error in exc.value.errors}
+        assert locs == {"hour_of_day", "device_class"}
+
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    def test_dump_matches_raw_signals(self, payload):
+        raw = RawSignals(**payload)
+        sparse = SparseSignals.from_payload(payload)
+
+        assert sparse.model_fields_set == raw.model_fields_set - {"unknown_signal"}
+        assert canonical_signals(sparse) == canonical_signals(raw)
+
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    def test_consumers_match_raw_signals(self, payload, comparable):
+        raw = RawSignals(**payload)
+        sparse = SparseSignals.from_payload(payload)
+        engine = InferenceEngine()
+
+        assert comparable(engine.infer(sparse)) == comparable(engine.infer(raw))
+        assert [comparable(o) for o in BatchScorer(engine).infer([sparse])] == [comparable(engine.infer(raw))]
+        assert WebIntelligence().analyze_signals(sparse) == WebIntelligence().analyze_signals(raw)
+        assert AppContext().analyze_app_context(sparse) == AppContext().analyze_app_context(raw)
+
+    def test_round_trip_and_copy(self):
+        raw = RawSignals(hour_of_day=7, system_language="hi")
+        sparse = SparseSignals.from_raw_signals(raw)
+        copy = sparse.model_copy(update={"hour_of_day": 8})
+
+        assert sparse.to_raw_signals().hour_of_day == 7
+        assert copy.hour_of_day == 8
+        assert sparse.hour_of_day == 7
+        assert copy.model_fields_set == {"hour_of_day", "system_language"}
+
+    def test_request_model(self):
+        request = SparseInferenceRequest.model_validate({"signals": PAYLOADS[1], "user_id": "u1"})
+        assert isinstance(request.signals, SparseSignals)
+
+        with pytest.raises(ValidationError):
+            SparseInferenceRequest.model_validate({"signals": {"hour_of_day": "noon"}})
+
+        schema = SparseInferenceRequest.model_json_schema()
+        assert "hour_of_day" in json.dumps(schema["properties"]["signals"])
+
+    def test_infer_endpoint_rejects_invalid_signal(self):
+        from src.router_inference import router
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+
+        response = client.post("/v1/infer?enhanced=false", json={"signals": {"hour_of_day": 99}})
+        assert response.status_code == 422
+
+        response = client.post("/v1/infer?enhanced=false", json={"signals": PAYLOADS[1]})
+        assert response.status_code == 200
+        assert response.json()["success"] is True
@@ -0,0 +1,128 @@
+"""
+Test cases for upstream deadlines, retries, hedging and circuit breakers
+"""
+
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from src.llm_service import LLMService
+from src.metrics import get_metrics, UPSTREAM_RETRIES, UPSTREAM_HEDGED, UPSTREAM_SHORT_CIRCUITED
+from src.upstream import UpstreamClient, UpstreamPolicy, CircuitBreaker, CircuitOpenError, is_retryable
+
+
+def _client(**policy) -> UpstreamClient:
+    policy.setdefault("backoff_base", 0.001)
+    return UpstreamClient({"call": UpstreamPolicy(**policy)}, failure_threshold=2, reset_seconds=0.2)
+
+
+class Flaky:
+    """Attempt function failing the first failures times"""
+
+    def __init__(self, failures=0, error=None):
+        self.failures = failures
+        self.error = error or httpx.ConnectError("connection refused")
+        self.timeouts = []
+
+    def __call__(self, timeout):
+        self.timeouts.append(timeout)
+        if len(self.timeouts) <= self.failures:
+            raise self.error
+        return "ok"
+
+    async def acall(self, timeout):
+        return self(timeout)
+
+
+class TestUpstreamClient:
+    """Test suite for UpstreamClient"""
+
+    def test_retries_retryable_errors_within_deadline(self):
+        client = _client(deadline_seconds=5.0, max_attempts=3)
+        flaky = Flaky(failures=2)
+
+        assert client.call("svc-retry", "call", flaky) == "ok"
+        assert len(flaky.timeouts) == 3
+        assert flaky.timeouts[0] <= 5.0 and flaky.timeouts[2] < flaky.timeouts[0]
+        assert client.count(UPSTREAM_RETRIES, "svc-retry", "call") == 2
+        assert client.breaker("svc-retry").failures == 0
+
+    def test_non_retryable_errors_raise_at_once(self):
+        client = _client(max_attempts=3)
+        response = httpx.Response(401, request=httpx.Request("POST", "http://upstream"))
+        flaky = Flaky(failures=5, error=httpx.HTTPStatusError("unauthorized", request=response.request, response=response))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(client.acall("svc-fatal", "call", flaky.acall))
+        assert len(flaky.timeouts) == 1
+        assert not is_retryable(flaky.error) and is_retryable(httpx.ReadTimeout("slow"))
+
+    def test_deadline_bounds_all_attempts(self):
+        client = _client(deadline_seconds=0.1, max_attempts=5)
+
+        async def hang(timeout):
+            await asyncio.sleep(10)
+
+        start = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(client.acall("svc-deadline", "call", hang))
+        assert time.perf_counter() - start < 0.5
+
+    def test_hedged_request_wins(self):
+        client = _client(deadline_seconds=2.0, hedge=True, hedge_after=0.05)
+        started = []
+
+        async def attempt(timeout):
+            started.append(timeout)
+            await asyncio.sleep(1.0 if len(started) == 1 else 0.01)
+            return len(started)
+
+        start = time.perf_counter()
+        assert asyncio.run(client.acall("svc-hedge", "call", attempt)) == 2
+        assert time.perf_counter() - start < 0.5
+        assert client.count(UPSTREAM_HEDGED, "svc-hedge", "call") == 1
+
+    def test_breaker_opens_and_recovers(self):
+        client = _client(max_attempts=1)
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                client.call("svc-breaker", "call", Flaky(failures=1))
+
+        never = Flaky()
+        with pytest.raises(CircuitOpenError):
+            client.call("svc-breaker", "call", never)
+        assert never.timeouts == []
+        assert client.count(UPSTREAM_SHORT_CIRCUITED, "svc-breaker", "call") == 1
+        assert 'bharat_upstream_circuit_state{service="svc-breaker"} 2' in get_metrics().render_prometheus()
+
+        time.sleep(0.25)
+        assert client.breaker("svc-breaker").state == CircuitBreaker.HALF_OPEN
+        assert client.call("svc-breaker", "call", Flaky()) == "ok"
+        assert client.breaker("svc-breaker").state == CircuitBreaker.CLOSED
+
+
+class TestLLMServiceUpstream:
+    """Test suite for LLMService calls going through the upstream client"""
+
+    def test_open_breaker_falls_back_without_calling(self):
+        service = LLMService()
+        service.perplexity_key = "mock_key"
+        service.upstream = UpstreamClient(failure_threshold=1, reset_seconds=60)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(503, json={"error": "overloaded"})
+
+        async def run():
+            service.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            first = await service.agenerate_feed_from_perplexity("Shop Owner", "hindi")
+            second = await service.agenerate_feed_from_perplexity("Shop Owner", "hindi")
+            await service.shutdown()
+            return first, second
+
+        assert asyncio.run(run()) == ([], [])
+        assert len(requests) == service.upstream.policy("feed").max_attempts
+        assert service.upstream.stats()["perplexity"]["state"] == CircuitBreaker.OPEN
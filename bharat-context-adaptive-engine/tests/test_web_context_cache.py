@@ -0,0 +1,151 @@
+"""
+Test cases for the pattern-keyed web context cache
+"""
+
+import time
+import asyncio
+
+from src.models import RawSignals
+from src.inference_engine import InferenceEngine
+from src.inference_engine_enhanced import EnhancedInferenceEngine
+from src.llm_service import WEB_CONTEXT_UNAVAILABLE
+from src.web_context_cache import WebContextCache, web_context_key, likely_web_context_keys
+
+
+KEY = ("business_apps_present", "evening_activity_pattern")
+
+
+class CountingLoader:
+    """Stands in for LLMService.aget_web_intelligence, counting upstream calls"""
+
+    def __init__(self, answer="Shop owners reconcile khata in the evening.", delay=0.0):
+        self.answer = answer
+        self.delay = delay
+        self.keys = []
+
+    async def __call__(self, key):
+        self.keys.append(key)
+        await asyncio.sleep(self.delay)
+        return self.answer
+
+    def sync(self, key):
+        self.keys.append(key)
+        return self.answer
+
+
+class TestWebContextCache:
+    """Test suite for WebContextCache"""
+
+    def test_single_flight_miss_then_hit(self):
+        loader = CountingLoader(delay=0.05)
+        cache = WebContextCache(loader)
+
+        async def run():
+            return await asyncio.gather(*[cache.get(KEY) for _ in range(5)])
+
+        results = asyncio.run(run())
+
+        assert loader.keys == [KEY]
+        assert {info["status"] for _, info in results} == {"miss"}
+        web_context, info = cache.lookup(KEY)
+        assert web_context == loader.answer
+        assert info["status"] == "hit" and info["key"] == list(KEY) and info["age_seconds"] >= 0
+
+    def test_placeholders_are_not_cached(self):
+        loader = CountingLoader(answer=WEB_CONTEXT_UNAVAILABLE)
+        cache = WebContextCache(loader, loader.sync)
+
+        assert cache.get_sync(KEY)[0] == WEB_CONTEXT_UNAVAILABLE
+        assert cache.get_sync(KEY)[1]["status"] == "miss"
+        assert len(cache) == 0 and len(loader.keys) == 2
+
+    def test_stale_refresh_ttl_and_size_bounds(self):
+        loader = CountingLoader()
+        cache = WebContextCache(loader, loader.sync, fresh_seconds=60, ttl_seconds=120, max_entries=2)
+        cache.get_sync(KEY)
+        cache._entries[KEY].fetched_at = time.time() - 90
+
+        async def stale_lookup():
+            cached = cache.lookup(KEY)
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            return cached
+
+        _, info = asyncio.run(stale_lookup())
+        assert info["status"] == "stale_hit" and info["age_seconds"] >= 90
+        assert len(loader.keys) == 2 and cache.lookup(KEY)[1]["status"] == "hit"
+
+        cache._entries[KEY].fetched_at = time.time() - 300
+        assert cache.lookup(KEY) is None
+
+        for key in [("a",), ("b",), ("c",)]:
+            cache.get_sync(key)
+        assert len(cache) == 2 and cache.lookup(("a",)) is None
+
+    def test_sync_stale_hit_refreshes_in_background(self):
+        loader = CountingLoader()
+        cache = WebContextCache(loader, loader.sync, fresh_seconds=60, ttl_seconds=120)
+        cache.get_sync(KEY)
+        cache._entries[KEY].fetched_at = time.time() - 90
+
+        assert cache.get_sync(KEY)[1]["status"] == "stale_hit"
+        for _ in range(100):
+            if cache.lookup(KEY)[1]["status"] == "hit":
+                break
+            time.sleep(0.01)
+        assert len(loader.keys) == 2 and cache.lookup(KEY)[1]["status"] == "hit"
+
+    def test_preload_rule_personas(self):
+        loader = CountingLoader()
+        cache = WebContextCache(loader, preload_concurrency=2)
+        keys = likely_web_context_keys(InferenceEngine().rules)
+
+        assert keys and len(set(keys)) == len(keys)
+        assert asyncio.run(cache.preload(keys)) == len(keys)
+        assert asyncio.run(cache.preload(keys)) == 0
+        assert sorted(loader.keys) == sorted(keys)
+        assert cache.stats()["preloaded"] == len(keys)
+
+
+class TestEngineWebContextCache:
+    """Test suite for the engine serving web context from the cache"""
+
+    def setup_method(self):
+        self.signals = RawSignals(
+            business_apps=["khatabook"],
+            whatsapp_business_usage="yes",
+            time_of_day="evening",
+            hour_of_day=19
+        )
+
+    def _engine(self, loader):
+        engine = EnhancedInferenceEngine(use_web_context=True)
+        engine.feed_cache.get_sync = lambda state, language: []
+        engine.web_intelligence.web_context_cache = WebContextCache(loader, loader.sync)
+        return engine
+
+    def test_sync_pipeline_records_miss_then_hit(self):
+        loader = CountingLoader()
+        engine = self._engine(loader)
+
+        first = engine.infer_with_explanation(self.signals).explanation
+        second = engine.infer_with_explanation(self.signals).explanation
+
+        assert len(loader.keys) == 1
+        assert first.web_context_cache["status"] == "miss"
+        assert second.web_context_cache["status"] == "hit"
+        assert any(insight.startswith("Web Intelligence:") for insight in second.web_intelligence_insights)
+        assert "Web context cache: hit" in second.generate_human_readable()
+
+    def test_async_hit_skips_upstream(self):
+        loader = CountingLoader()
+        engine = self._engine(loader)
+        engine.llm_reasoning.ainfer_with_llm = lambda *args: asyncio.sleep(0, result={})
+        key = web_context_key(engine.web_intelligence.analyze_signals(self.signals)["detected_patterns"])
+        asyncio.run(engine.web_intelligence.web_context_cache.preload([key]))
+
+        result = asyncio.run(engine.ainfer_with_explanation(self.signals))
+
+        assert loader.keys == [key]
+        assert result.explanation.web_context_cache["status"] == "hit"
+        assert "web_context" in result.output.applied_tiers
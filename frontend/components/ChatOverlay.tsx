@@ -15,40 +15,113 @@ interface ChatOverlayProps {
   context?: string;
 }
 
+const CHAT_URL = 'http://127.0.0.1:8000/v1/chat';
+
+// The server keeps the chat history per session; after the first turn only
+// the new message and session_id are sent
+class SessionExpiredError extends Error {}
+
+interface ChatReply {
+  response: string;
+  sessionId?: string;
+}
+
+// Streams the reply over SSE so tokens render as they arrive (slow networks
+// otherwise wait for the whole completion). Resolves with the full reply.
+async function streamChat(
+  body: Record<string, unknown>,
+  onToken: (content: string) => void
+): Promise<ChatReply> {
+  const res = await fetch(CHAT_URL, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+    body: JSON.stringify({ ...body, stream: true })
+  });
+  if (res.status === 404 && body.session_id) throw new SessionExpiredError();
+  if (!res.ok || !res.body) throw new Error(`Chat request failed: ${res.status}`);
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary: number;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const event = block.match(/^event: (.*)$/m)?.[1];
+      const data = JSON.parse(block.match(/^data: (.*)$/m)?.[1] ?? '{}');
+      if (event === 'token') onToken(data.content);
+      else if (event === 'done') return { response: data.response, sessionId: data.session_id };
+      else if (event === 'error') throw new Error(data.error);
+    }
+  }
+  throw new Error('Chat stream ended early');
+}
+
 export default function ChatOverlay({ isOpen, onClose, initialQuery, context }: ChatOverlayProps) {
   const [messages, setMessages] = useState<Message[]>([]);
   const [input, setInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const sessionId = React.useRef<string | undefined>(undefined);
+
+  // Streams the assistant reply into a new message; the loading dots show
+  // until the first token arrives
+  const reply = async (history: Message[], failure: string) => {
+    let started = false;
+    const append = (content: string) => {
+      if (!started) {
+        started = true;
+        setIsLoading(false);
+        setMessages(prev => [...prev, { role: 'assistant', content }]);
+        return;
+      }
+      setMessages(prev => [
+        ...prev.slice(0, -1),
+        { role: 'assistant', content: prev[prev.length - 1].content + content }
+      ]);
+    };
+
+    const message = history[history.length - 1].content;
+    // A new (or expired) session is seeded with the earlier turns and context
+    const fresh = () => ({
+      message,
+      messages: history.slice(0, -1).map(m => ({ role: m.role, content: m.content })),
+      context: context || ""
+    });
+
+    try {
+      let result: ChatReply;
+      try {
+        result = await streamChat(
+          sessionId.current ? { session_id: sessionId.current, message } : fresh(),
+          append
+        );
+      } catch (err) {
+        if (!(err instanceof SessionExpiredError)) throw err;
+        result = await streamChat(fresh(), append);
+      }
+      sessionId.current = result.sessionId;
+    } catch (err) {
+      console.error(err);
+      if (!started) append(failure);
+    } finally {
+      setIsLoading(false);
+    }
+  };
 
   // Initialize chat with query if provided
   React.useEffect(() => {
     if (isOpen && initialQuery) {
       setMessages([{ role: 'user', content: initialQuery }]);
       setIsLoading(true);
+      sessionId.current = undefined;
       
       // Call the real backend chat API
-      fetch('http://127.0.0.1:8000/v1/chat', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          messages: [{ role: 'user', content: initialQuery }],
-          context: context || ""
-        })
-      })
-      .then(res => res.json())
-      .then(data => {
-        setIsLoading(false);
-        if (data.success) {
-          setMessages(prev => [...prev, { role: 'assistant', content: data.response }]);
-        } else {
-          setMessages(prev => [...prev, { role: 'assistant', content: "Sorry, I couldn't connect to the chat server." }]);
-        }
-      })
-      .catch(err => {
-        setIsLoading(false);
-        console.error(err);
-        setMessages(prev => [...prev, { role: 'assistant', content: "Network error occurred." }]);
-      });
+      reply([{ role: 'user', content: initialQuery }], "Sorry, I couldn't connect to the chat server.");
 
     } else if (isOpen && !messages.length) {
         setMessages([]);
@@ -66,28 +139,7 @@ export default function ChatOverlay({ isOpen, onClose, initialQuery, context }:
     setInput('');
     setIsLoading(true);
 
-    try {
-      const res = await fetch('http://127.0.0.1:8000/v1/chat', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          messages: updatedMessages.map(m => ({ role: m.role, content: m.content })), // Send full history
-          context: context || ""
-        })
-      });
-      
-      const data = await res.json();
-      setIsLoading(false);
-      
-      if (data.success) {
-        setMessages(prev => [...prev, { role: 'assistant', content: data.response }]);
-      } else {
-        setMessages(prev => [...prev, { role: 'assistant', content: "Error getting response." }]);
-      }
-    } catch (err) {
-      setIsLoading(false);
-      setMessages(prev => [...prev, { role: 'assistant', content: "Failed to send message." }]);
-    }
+    await reply(updatedMessages, "Failed to send message.");
   };
 
   return (